@@ -1,10 +1,16 @@
 import binascii
 from codecs import utf_8_decode
 from codecs import utf_8_encode
-from collections import namedtuple
+from collections import (
+    namedtuple,
+    OrderedDict,
+    )
 import hashlib
+import hmac
 import base64
+import os
 import re
+import threading
 import time as time_mod
 import warnings
 
@@ -549,6 +555,14 @@ class AuthTktAuthenticationPolicy(CallbackAuthenticationPolicy):
        Any hash algorithm supported by Python's ``hashlib.new()`` function
        can be used as the ``hashalg``.
 
+       Any such algorithm name may also be prefixed with ``hmac-`` (e.g.
+       ``hmac-sha512``) to sign tickets with a standard HMAC of the ticket
+       data instead of the ``mod_auth_tkt`` compatible double hash.  This
+       is both stronger and faster, as the keyed hash state is computed
+       only once, but the resulting cookies cannot be verified by
+       ``mod_auth_tkt``.  HMAC variants are available as of
+       :app:`Pyramid` 1.8.
+
        Cookies generated by different instances of AuthTktAuthenticationPolicy
        using different ``hashalg`` options are not compatible. Switching the
        ``hashalg`` will imply that all existing users with a valid cookie will
@@ -643,6 +657,11 @@ class AuthTicket(object):
     Once you provide all the arguments, use .cookie_value() to
     generate the appropriate authentication ticket.
 
+    ``hash_state`` is an optimization used by
+    :class:`pyramid.authentication.AuthTktCookieHelper`, which computes it
+    once from its ``secret`` and ``hashalg``; it is computed for the
+    ticket if it is not passed.
+
     Usage::
 
         token = AuthTicket('sharedsecret', 'username',
@@ -653,7 +672,7 @@ class AuthTicket(object):
 
     def __init__(self, secret, userid, ip, tokens=(), user_data='',
                  time=None, cookie_name='auth_tkt', secure=False,
-                 hashalg='md5'):
+                 hashalg='md5', hash_state=None):
         self.secret = secret
         self.userid = userid
         self.ip = ip
@@ -666,11 +685,14 @@ class AuthTicket(object):
         self.cookie_name = cookie_name
         self.secure = secure
         self.hashalg = hashalg
+        if hash_state is None:
+            hash_state = _ticket_hash_state(secret, hashalg)
+        self.hash_state = hash_state
 
     def digest(self):
         return calculate_digest(
             self.ip, self.time, self.secret, self.userid, self.tokens,
-            self.user_data, self.hashalg)
+            self.user_data, self.hashalg, self.hash_state)
 
     def cookie_value(self):
         v = '%s%08x%s!' % (self.digest(), int(self.time),
@@ -692,15 +714,20 @@ class BadTicket(Exception):
         Exception.__init__(self, msg)
 
 # this function licensed under the MIT license (stolen from Paste)
-def parse_ticket(secret, ticket, ip, hashalg='md5'):
+def parse_ticket(secret, ticket, ip, hashalg='md5', hash_state=None):
     """
     Parse the ticket, returning (timestamp, userid, tokens, user_data).
 
     If the ticket cannot be parsed, a ``BadTicket`` exception will be raised
     with an explanation.
+
+    ``hash_state`` is computed from ``secret`` and ``hashalg`` if it is not
+    passed (see :class:`pyramid.authentication.AuthTicket`).
     """
     ticket = native_(ticket).strip('"')
-    digest_size = hashlib.new(hashalg).digest_size * 2
+    if hash_state is None:
+        hash_state = _ticket_hash_state(secret, hashalg)
+    digest_size = hash_state[1].digest_size * 2
     digest = ticket[:digest_size]
     try:
         timestamp = int(ticket[digest_size:digest_size + 8], 16)
@@ -719,7 +746,8 @@ def parse_ticket(secret, ticket, ip, hashalg='md5'):
         user_data = data
 
     expected = calculate_digest(ip, timestamp, secret,
-                                userid, tokens, user_data, hashalg)
+                                userid, tokens, user_data, hashalg,
+                                hash_state)
 
     # Avoid timing attacks (see
     # http://seb.dbzteam.org/crypto/python-oauth-timing-hmac.pdf)
@@ -731,14 +759,29 @@ def parse_ticket(secret, ticket, ip, hashalg='md5'):
 
     return (timestamp, userid, tokens, user_data)
 
+def _ticket_hash_state(secret, hashalg):
+    """ Return the encoded ``secret`` along with a hash object for
+    ``hashalg`` which is copied for each digest rather than created from
+    scratch.  For the ``hmac-`` variants the hash object is already keyed
+    with ``secret``.  :class:`AuthTktCookieHelper` computes this once."""
+    secret = bytes_(secret, 'utf-8')
+    if hashalg.startswith('hmac-'):
+        name = hashalg[5:]
+        digestmod = getattr(hashlib, name, None)
+        if digestmod is None:
+            digestmod = lambda string=b'': hashlib.new(name, string)
+        return secret, hmac.new(secret, digestmod=digestmod)
+    return secret, hashlib.new(hashalg)
+
 # this function licensed under the MIT license (stolen from Paste)
 def calculate_digest(ip, timestamp, secret, userid, tokens, user_data,
-                     hashalg='md5'):
-    secret = bytes_(secret, 'utf-8')
+                     hashalg='md5', hash_state=None):
+    if hash_state is None:
+        hash_state = _ticket_hash_state(secret, hashalg)
+    secret, hash_state = hash_state
     userid = bytes_(userid, 'utf-8')
     tokens = bytes_(tokens, 'utf-8')
     user_data = bytes_(user_data, 'utf-8')
-    hash_obj = hashlib.new(hashalg)
 
     # Check to see if this is an IPv6 address
     if ':' in ip:
@@ -748,10 +791,16 @@ def calculate_digest(ip, timestamp, secret, userid, tokens, user_data,
         # encode_ip_timestamp not required, left in for backwards compatibility
         ip_timestamp = encode_ip_timestamp(ip, timestamp)
 
+    hash_obj = hash_state.copy()
+    if hashalg.startswith('hmac-'):
+        hash_obj.update(ip_timestamp + userid + b'\0' +
+                tokens + b'\0' + user_data)
+        return hash_obj.hexdigest()
+
     hash_obj.update(ip_timestamp + secret + userid + b'\0' +
             tokens + b'\0' + user_data)
     digest = hash_obj.hexdigest()
-    hash_obj2 = hashlib.new(hashalg)
+    hash_obj2 = hash_state.copy()
     hash_obj2.update(bytes_(digest) + secret)
     return hash_obj2.hexdigest()
 
@@ -819,6 +868,7 @@ class AuthTktCookieHelper(object):
         self.parent_domain = parent_domain
         self.domain = domain
         self.hashalg = hashalg
+        self.hash_state = _ticket_hash_state(secret, hashalg)
 
     def _get_cookies(self, request, value, max_age=None):
         cur_domain = request.domain
@@ -861,7 +911,8 @@ class AuthTktCookieHelper(object):
 
         try:
             timestamp, userid, tokens, user_data = self.parse_ticket(
-                self.secret, cookie, remote_addr, self.hashalg)
+                self.secret, cookie, remote_addr, self.hashalg,
+                hash_state=self.hash_state)
         except self.BadTicket:
             return None
 
@@ -986,7 +1037,8 @@ class AuthTktCookieHelper(object):
             user_data=user_data,
             cookie_name=self.cookie_name,
             secure=self.secure,
-            hashalg=self.hashalg
+            hashalg=self.hashalg,
+            hash_state=self.hash_state,
             )
 
         cookie_value = ticket.cookie_value()
@@ -1072,6 +1124,19 @@ class BasicAuthAuthenticationPolicy(CallbackAuthenticationPolicy):
         steps.  The output from debugging is useful for reporting to maillist
         or IRC channels when asking for support.
 
+    ``cache``
+
+        Default: ``None``.  An instance of
+        :class:`pyramid.authentication.BasicAuthCredentialCache`.  If
+        supplied, successful results of ``check`` are remembered for the
+        lifetime of the cache entries so that clients which send the same
+        credentials on every request do not pay for an expensive password
+        hash verification each time.  Note that ``check`` is then *not*
+        called for cached credentials, so it should not depend on anything
+        in the request other than the credentials themselves.
+
+        .. versionadded:: 1.8
+
     **Issuing a challenge**
 
     Regular browsers will not send username/password credentials unless they
@@ -1089,10 +1154,11 @@ class BasicAuthAuthenticationPolicy(CallbackAuthenticationPolicy):
             response.headers.update(forget(request))
             return response
     """
-    def __init__(self, check, realm='Realm', debug=False):
+    def __init__(self, check, realm='Realm', debug=False, cache=None):
         self.check = check
         self.realm = realm
         self.debug = debug
+        self.cache = cache
 
     def unauthenticated_userid(self, request):
         """ The userid parsed from the ``Authorization`` request header."""
@@ -1120,7 +1186,126 @@ class BasicAuthAuthenticationPolicy(CallbackAuthenticationPolicy):
         credentials = extract_http_basic_credentials(request)
         if credentials:
             username, password = credentials
-            return self.check(username, password, request)
+            cache = self.cache
+            if cache is not None:
+                groups = cache.get(username, password)
+                if groups is not None:
+                    return groups
+            groups = self.check(username, password, request)
+            if cache is not None and groups is not None:
+                cache.set(username, password, groups)
+            return groups
+
+
+class BasicAuthCredentialCache(object):
+    """ A cache of successful credential checks for use with
+    :class:`pyramid.authentication.BasicAuthAuthenticationPolicy`.
+
+    Entries are keyed by an HMAC of the username and password made with a
+    per-cache secret, so neither usernames nor passwords are kept in memory
+    in plaintext, and as the keys cannot be predicted without the secret,
+    the time a lookup takes reveals nothing about the cached credentials.
+    Failed checks are never cached.
+
+    Constructor Arguments
+
+    ``timeout``
+
+       Default: ``300``.  The number of seconds a successful check is
+       remembered.  Credentials are checked again via the policy's
+       ``check`` callback once their entry has expired.
+
+    ``max_size``
+
+       Default: ``1000``.  The maximum number of users remembered.  When it
+       is exceeded the least recently used entry is discarded.
+
+    ``secret``
+
+       Default: ``None``.  The key used to compute password HMACs.  If it is
+       ``None`` a random key is generated, which is usually what you want.
+
+    Use :meth:`invalidate` to forget a user whose password or principals
+    have changed before the entry would otherwise expire.
+
+    .. versionadded:: 1.8
+    """
+    now = None # for tests
+
+    def __init__(self, timeout=300, max_size=1000, secret=None):
+        if secret is None:
+            secret = os.urandom(32)
+        self.timeout = timeout
+        self.max_size = max_size
+        self.secret = bytes_(secret, 'utf-8')
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict() # key -> (user key, groups, expires)
+        self._users = {} # user key -> key
+        self._lock = threading.Lock()
+
+    def _now(self):
+        now = self.now
+        if now is None:
+            now = time_mod.time()
+        return now
+
+    def _keys(self, username, password):
+        # the key of the user's entries is itself the key of the HMAC
+        # which identifies their credentials, so that no username and
+        # password pair can produce the key of another
+        user_key = hmac.new(
+            self.secret, bytes_(username, 'utf-8'), hashlib.sha256).digest()
+        key = hmac.new(
+            user_key, bytes_(password, 'utf-8'), hashlib.sha256).digest()
+        return user_key, key
+
+    def get(self, username, password):
+        """ Return a copy of the principals cached for ``username`` if
+        ``password`` matches the cached credentials and the entry has not
+        expired, otherwise return ``None``."""
+        user_key, key = self._keys(username, password)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                user_key, groups, expires = entry
+                if expires <= self._now():
+                    self._remove(user_key)
+                else:
+                    del self._entries[key]
+                    self._entries[key] = entry
+                    self.hits += 1
+                    return list(groups)
+            self.misses += 1
+
+    def set(self, username, password, groups):
+        """ Remember that ``password`` is valid for ``username`` and that
+        the ``check`` callback returned ``groups`` for it."""
+        user_key, key = self._keys(username, password)
+        entry = (user_key, tuple(groups), self._now() + self.timeout)
+        with self._lock:
+            # a user has at most one entry, for the password last checked
+            self._remove(user_key)
+            self._entries[key] = entry
+            self._users[user_key] = key
+            while len(self._entries) > self.max_size:
+                old_entry = self._entries.popitem(last=False)[1]
+                del self._users[old_entry[0]]
+
+    def _remove(self, user_key):
+        key = self._users.pop(user_key, None)
+        if key is not None:
+            del self._entries[key]
+
+    def invalidate(self, username=None):
+        """ Forget the cached credentials of ``username``.  If ``username``
+        is ``None``, forget all cached credentials."""
+        with self._lock:
+            if username is None:
+                self._entries.clear()
+                self._users.clear()
+            else:
+                self._remove(self._keys(username, '')[0])
 
 
 class _SimpleSerializer(object):
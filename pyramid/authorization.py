@@ -114,33 +114,96 @@ class ACLAuthorizationPolicy(object):
 
         for location in reversed(list(lineage(context))):
             # NB: we're walking *up* the object graph from the root
-            try:
-                acl = location.__acl__
-            except AttributeError:
-                continue
-
-            allowed_here = set()
-            denied_here = set()
+            allowed = _apply_acl(allowed, location, permission)
 
-            if acl and callable(acl):
-                acl = acl()
-
-            for ace_action, ace_principal, ace_permissions in acl:
-                if not is_nonstr_iter(ace_permissions):
-                    ace_permissions = [ace_permissions]
-                if (ace_action == Allow) and (permission in ace_permissions):
-                    if ace_principal not in denied_here:
-                        allowed_here.add(ace_principal)
-                if (ace_action == Deny) and (permission in ace_permissions):
-                        denied_here.add(ace_principal)
-                        if ace_principal == Everyone:
-                            # clear the entire allowed set, as we've hit a
-                            # deny of Everyone ala (Deny, Everyone, ALL)
-                            allowed = set()
-                            break
-                        elif ace_principal in allowed:
-                            allowed.remove(ace_principal)
-
-            allowed.update(allowed_here)
+        return allowed
 
+    def walk_principals_allowed_by_permission(self, resource, permission,
+                                              children=None, inherited=None):
+        """ Return a generator of ``(resource, principals)`` tuples for
+        ``resource`` and every resource beneath it, where ``principals``
+        is the frozenset of principals that
+        :meth:`principals_allowed_by_permission` would return for that
+        resource.
+
+        This is meant for bulk work such as computing allowed principals
+        for every resource in a tree when building a search index.
+        Instead of walking each resource's :term:`lineage` back to the
+        root, the set computed for a parent is reused for its children,
+        so each ACL in the subtree is consulted only once.
+
+        ``children`` is a callable accepting a resource and returning an
+        iterable of its child resources.  If it is ``None``, the
+        ``values()`` method of each resource is used, and resources which
+        have no ``values`` method are treated as leaves.
+
+        ``inherited`` is the set of principals allowed on the parent of
+        ``resource``.  If it is ``None``, it is computed by walking the
+        lineage of ``resource.__parent__``.  Passing it explicitly allows
+        disjoint subtrees to be processed independently, e.g. by mapping
+        this method over subtree roots in a :mod:`multiprocessing` pool
+        after computing each root's inherited set once in the parent
+        process.
+
+        Resources are visited depth-first, parents before children."""
+        if children is None:
+            children = _resource_children
+        if inherited is None:
+            parent = getattr(resource, '__parent__', None)
+            if parent is None:
+                inherited = set()
+            else:
+                inherited = self.principals_allowed_by_permission(
+                    parent, permission)
+
+        stack = [(resource, frozenset(inherited))]
+        while stack:
+            location, parent_allowed = stack.pop()
+            allowed = _apply_acl(parent_allowed, location, permission)
+            if allowed is not parent_allowed:
+                allowed = frozenset(allowed)
+            yield location, allowed
+            kids = list(children(location))
+            kids.reverse()
+            stack.extend((kid, allowed) for kid in kids)
+
+def _resource_children(resource):
+    values = getattr(resource, 'values', None)
+    if values is None:
+        return ()
+    return values()
+
+def _apply_acl(allowed, location, permission):
+    """ Return the set of principals allowed at ``location`` given the set
+    ``allowed`` at its parent.  ``allowed`` is never mutated; it is
+    returned as-is when ``location`` has no ACL."""
+    try:
+        acl = location.__acl__
+    except AttributeError:
         return allowed
+
+    allowed = set(allowed)
+    allowed_here = set()
+    denied_here = set()
+
+    if acl and callable(acl):
+        acl = acl()
+
+    for ace_action, ace_principal, ace_permissions in acl:
+        if not is_nonstr_iter(ace_permissions):
+            ace_permissions = [ace_permissions]
+        if (ace_action == Allow) and (permission in ace_permissions):
+            if ace_principal not in denied_here:
+                allowed_here.add(ace_principal)
+        if (ace_action == Deny) and (permission in ace_permissions):
+            denied_here.add(ace_principal)
+            if ace_principal == Everyone:
+                # clear the entire allowed set, as we've hit a
+                # deny of Everyone ala (Deny, Everyone, ALL)
+                allowed = set()
+                break
+            elif ace_principal in allowed:
+                allowed.remove(ace_principal)
+
+    allowed.update(allowed_here)
+    return allowed
@@ -2,15 +2,23 @@ import os
 import pkg_resources
 import sys
 
+from repoze.lru import LRUCache
 from zope.interface import implementer
 
 from pyramid.interfaces import IPackageOverrides
 
 from pyramid.exceptions import ConfigurationError
+from pyramid.settings import asbool
 from pyramid.threadlocal import get_current_registry
 
 from pyramid.util import action_method
 
+def _dir_mtime(path):
+    try:
+        return os.stat(os.path.dirname(path)).st_mtime
+    except OSError:
+        return None
+
 class OverrideProvider(pkg_resources.DefaultProvider):
     def __init__(self, module):
         pkg_resources.DefaultProvider.__init__(self, module)
@@ -84,8 +92,28 @@ class OverrideProvider(pkg_resources.DefaultProvider):
 
 @implementer(IPackageOverrides)
 class PackageOverrides(object):
+    """ The asset overrides registered for a single package.
+
+    Which override source answers a given lookup of a resource name, along
+    with the filename, existence and directory-ness it reported, is
+    remembered in a bounded cache (including the fact that no override
+    answers it), so repeated lookups do not walk every override and hit the
+    filesystem or ``pkg_resources`` each time.  The cache is cleared
+    whenever an override is inserted.
+
+    When ``reload`` is true (the ``pyramid.reload_assets`` setting), cached
+    decisions are revalidated against the modification times of the
+    directories containing each candidate, so files which are added to or
+    removed from an override directory during development are noticed.
+
+    .. versionchanged:: 1.8
+       Lookups are cached.
+    """
+    resolve_cache_size = 1000
+    reload = False
+
     # pkg_resources arg in kw args below for testing
-    def __init__(self, package, pkg_resources=pkg_resources):
+    def __init__(self, package, pkg_resources=pkg_resources, reload=False):
         loader = self._real_loader = getattr(package, '__loader__', None)
         if isinstance(loader, self.__class__):
             self._real_loader = None
@@ -105,6 +133,19 @@ class PackageOverrides(object):
         pkg_resources.register_loader_type(self.__class__, OverrideProvider)
         self.overrides = []
         self.overridden_package_name = package.__name__
+        self.reload = reload
+
+    @property
+    def overrides(self):
+        return self._overrides
+
+    @overrides.setter
+    def overrides(self, overrides):
+        self._overrides = overrides
+        self._reset()
+
+    def _reset(self):
+        self._resolved = LRUCache(self.resolve_cache_size)
 
     def insert(self, path, source):
         if not path or path.endswith('/'):
@@ -112,6 +153,7 @@ class PackageOverrides(object):
         else:
             override = FileOverride(path, source)
         self.overrides.insert(0, override)
+        self._reset()
         return override
 
     def filtered_sources(self, resource_name):
@@ -120,40 +162,58 @@ class PackageOverrides(object):
             if o is not None:
                 yield o
 
-    def get_filename(self, resource_name):
+    def _stamp(self, resource_name):
+        stamp = []
         for source, path in self.filtered_sources(resource_name):
-            result = source.get_filename(path)
+            get_stamp = getattr(source, 'get_stamp', None)
+            stamp.append(get_stamp(path) if get_stamp is not None else None)
+        return tuple(stamp)
+
+    # lookups whose results can be remembered along with the source which
+    # produced them; streams, strings and listings are fetched every time
+    _cached_results = frozenset(('get_filename', 'exists', 'isdir'))
+
+    def _lookup(self, method, resource_name):
+        # Call ``method`` on the first override source which returns a
+        # non-None result for ``resource_name``, remembering which
+        # ``(source, path)`` that was (or that there was none).
+        key = (method, resource_name)
+        stamp = self._stamp(resource_name) if self.reload else None
+        entry = self._resolved.get(key)
+        if entry is not None and entry[3] == stamp:
+            source, path, result = entry[:3]
+            if source is None or result is not None:
+                return result
+            result = getattr(source, method)(path)
             if result is not None:
                 return result
-
-    def get_stream(self, resource_name):
+            # the asset disappeared underneath us; look it up again
         for source, path in self.filtered_sources(resource_name):
-            result = source.get_stream(path)
+            result = getattr(source, method)(path)
             if result is not None:
+                cached = result if method in self._cached_results else None
+                self._resolved.put(key, (source, path, cached, stamp))
                 return result
+        self._resolved.put(key, (None, None, None, stamp))
+
+    def get_filename(self, resource_name):
+        return self._lookup('get_filename', resource_name)
+
+    def get_stream(self, resource_name):
+        return self._lookup('get_stream', resource_name)
 
     def get_string(self, resource_name):
-        for source, path in self.filtered_sources(resource_name):
-            result = source.get_string(path)
-            if result is not None:
-                return result
+        return self._lookup('get_string', resource_name)
 
     def has_resource(self, resource_name):
-        for source, path in self.filtered_sources(resource_name):
-            if source.exists(path):
-                return True
+        if self._lookup('exists', resource_name):
+            return True
 
     def isdir(self, resource_name):
-        for source, path in self.filtered_sources(resource_name):
-            result = source.isdir(path)
-            if result is not None:
-                return result
+        return self._lookup('isdir', resource_name)
 
     def listdir(self, resource_name):
-        for source, path in self.filtered_sources(resource_name):
-            result = source.listdir(path)
-            if result is not None:
-                return result
+        return self._lookup('listdir', resource_name)
 
     @property
     def real_loader(self):
@@ -253,6 +313,18 @@ class PackageAssetSource(object):
         if pkg_resources.resource_exists(self.pkg_name, path):
             return pkg_resources.resource_listdir(self.pkg_name, path)
 
+    def get_stamp(self, resource_name):
+        """ Return the modification time of the directory which would
+        contain ``resource_name``, or ``None`` if the package does not live
+        on the filesystem."""
+        module = sys.modules.get(self.pkg_name)
+        filename = getattr(module, '__file__', None)
+        if filename is None:
+            return None
+        path = self.get_path(resource_name)
+        return _dir_mtime(
+            os.path.join(os.path.dirname(filename), *path.split('/')))
+
 
 class FSAssetSource(object):
     """
@@ -300,6 +372,11 @@ class FSAssetSource(object):
         if path is not None:
             return os.listdir(path)
 
+    def get_stamp(self, resource_name):
+        """ Return the modification time of the directory which would
+        contain ``resource_name``."""
+        return _dir_mtime(self.get_path(resource_name))
+
 
 class AssetsConfiguratorMixin(object):
     def _override(self, package, path, override_source,
@@ -308,6 +385,8 @@ class AssetsConfiguratorMixin(object):
         override = self.registry.queryUtility(IPackageOverrides, name=pkg_name)
         if override is None:
             override = PackageOverrides(package)
+            settings = self.get_settings() or {}
+            override.reload = asbool(settings.get('pyramid.reload_assets'))
             self.registry.registerUtility(override, IPackageOverrides,
                                           name=pkg_name)
         override.insert(path, override_source)
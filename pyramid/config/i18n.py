@@ -2,11 +2,14 @@ import os
 import sys
 
 from pyramid.interfaces import (
+    IDebugLogger,
     ILocaleNegotiator,
     ITranslationDirectories,
+    PHASE3_CONFIG,
     )
 
 from pyramid.exceptions import ConfigurationError
+from pyramid.i18n import preload_localizers
 from pyramid.path import package_path
 from pyramid.util import action_method
 
@@ -105,3 +108,57 @@ class I18NConfiguratorMixin(object):
 
         self.action(None, register, introspectables=introspectables)
 
+
+    @action_method
+    def preload_translations(self, locales=None, threads=1):
+        """ Load the translation catalogs of one or more locales when the
+        configuration is committed, rather than on the first request which
+        needs each of them.
+
+        ``locales`` is a sequence of :term:`locale name` values.  If it is
+        ``None`` (the default), every locale found in the translation
+        directories added via
+        :meth:`pyramid.config.Configurator.add_translation_dirs` is loaded.
+        If ``threads`` is greater than one, locales are loaded in a pool of
+        that many threads.
+
+        The time spent loading each domain of each locale is logged to the
+        debug logger at the ``INFO`` level and recorded under the
+        ``timings`` key of the ``translation preload`` introspectable.
+
+        Example:
+
+        .. code-block:: python
+
+           config.add_translation_dirs('myapp:locale')
+           config.preload_translations(['en', 'de', 'fr'], threads=4)
+
+        .. versionadded:: 1.8
+        """
+        if locales is not None:
+            locales = tuple(locales)
+        intr = self.introspectable('translation preloads', locales,
+                                   'translation preload',
+                                   'translation preload')
+        intr['locales'] = locales
+        intr['threads'] = threads
+
+        def register():
+            results = preload_localizers(self.registry, locales, threads)
+            intr['timings'] = results
+            logger = self.registry.queryUtility(IDebugLogger)
+            if logger is None:
+                return
+            for locale_name in sorted(results):
+                timings = results[locale_name]
+                logger.info(
+                    'preloaded translations for locale %r: %s' % (
+                        locale_name,
+                        ', '.join('%s (%.1f ms)' % (domain, seconds * 1000)
+                                  for domain, seconds
+                                  in sorted(timings.items()))
+                        or 'nothing to load'))
+
+        # after the translation directories have been registered (order 0)
+        self.action(None, register, order=PHASE3_CONFIG + 1,
+                    introspectables=(intr,))
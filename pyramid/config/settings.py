@@ -102,5 +102,7 @@ def Settings(d=None, _environ_=os.environ, **kw):
     S('prevent_http_cache', 'PYRAMID_PREVENT_HTTP_CACHE', asbool)
     S('prevent_cachebust', 'PYRAMID_PREVENT_CACHEBUST', asbool)
     S('csrf_trusted_origins', 'PYRAMID_CSRF_TRUSTED_ORIGINS', aslist, [])
+    S('mmap_translations', 'PYRAMID_MMAP_TRANSLATIONS', asbool)
+    S('localizer_cache_size', 'PYRAMID_LOCALIZER_CACHE_SIZE', int, 0)
 
     return d
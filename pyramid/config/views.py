@@ -11,6 +11,8 @@ from zope.interface import (
     )
 from zope.interface.interfaces import IInterface
 
+from repoze.lru import LRUCache
+
 from pyramid.interfaces import (
     IExceptionViewClassifier,
     IException,
@@ -20,6 +22,7 @@ from pyramid.interfaces import (
     IRequest,
     IResponse,
     IRouteRequest,
+    IRoutesMapper,
     ISecuredView,
     IStaticURLInfo,
     IView,
@@ -1753,6 +1756,19 @@ class ViewsConfiguratorMixin(object):
         viewing.  If ``permission`` is specified, the security checking will
         be performed against the default root factory ACL.
 
+        The ``cache_files``, ``cache_max_files``, ``cache_max_file_size``
+        and ``stat_interval`` keyword arguments are passed on to
+        :class:`pyramid.static.static_view` to configure its in-memory file
+        cache, the ``precompressed`` keyword argument is passed on to
+        enable serving precompressed (``.br`` and ``.gz``) variants of the
+        files, and the ``content_etag`` keyword argument is passed on to
+        enable ``ETag`` headers computed from the content of the files.  If
+        ``precompute_etags`` is ``True``, the content hashes of all the files
+        are computed when the configuration is committed (see
+        :meth:`pyramid.static.static_view.precompute_etags`).  Like
+        ``cache_max_age``, they have no effect when the ``name`` is a *url
+        prefix*.
+
         Any other keyword arguments sent to ``add_static_view`` are passed on
         to :meth:`pyramid.config.Configurator.add_route` (e.g. ``factory``,
         perhaps to define a custom factory with a custom ACL for this static
@@ -1927,36 +1943,137 @@ class ViewDeriverInfo(object):
     def settings(self):
         return self.registry.settings
 
+def _url_cache_key(spec, subpath, base, kw):
+    """ Return a hashable key for the URL generated by
+    :class:`StaticURLInfo` from the arguments, or ``None`` if the keyword
+    arguments ``kw`` cannot be hashed."""
+    items = []
+    for name in sorted(kw):
+        value = kw[name]
+        # the order of a query dict matters, so it is kept
+        if isinstance(value, dict):
+            value = (dict, tuple(value.items()))
+        elif isinstance(value, list):
+            value = (list, tuple(value))
+        items.append((name, value))
+    key = (spec, subpath, base, tuple(items))
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
 @implementer(IStaticURLInfo)
 class StaticURLInfo(object):
+    # keyword arguments of add_static_view passed to the static view
+    static_view_args = (
+        'cache_files',
+        'cache_max_files',
+        'cache_max_file_size',
+        'stat_interval',
+        'precompressed',
+        'content_etag',
+        )
+
+    # maximum number of generated URLs remembered
+    url_cache_size = 1000
+
     def __init__(self):
         self.registrations = []
         self.cache_busters = []
 
+    @property
+    def registrations(self):
+        return self._registrations
+
+    @registrations.setter
+    def registrations(self, registrations):
+        self._registrations = registrations
+        self._reset()
+
+    def _reset(self):
+        # (spec -> (order, url, spec, route_name, parsed url), spec lengths)
+        self._index = None
+        # route_name -> whether URLs generated by the route may be cached
+        self._cacheable_routes = {}
+        self._url_cache = LRUCache(self.url_cache_size)
+
+    def _match(self, path):
+        """ Return the first registration whose spec is a prefix of
+        ``path``, looking up each distinct spec length instead of trying
+        every registration."""
+        index = self._index
+        if index is None:
+            specs = {}
+            for order, (url, spec, route_name) in enumerate(
+                    self._registrations):
+                if spec not in specs:
+                    parsed = None if url is None else url_parse(url)
+                    specs[spec] = (order, url, spec, route_name, parsed)
+            lengths = sorted(set(len(spec) for spec in specs), reverse=True)
+            index = self._index = (specs, lengths)
+        specs, lengths = index
+        match = None
+        for length in lengths:
+            reg = specs.get(path[:length])
+            if reg is not None and (match is None or reg[0] < match[0]):
+                match = reg
+        return match
+
+    def _route_is_cacheable(self, request, route_name):
+        cacheable = self._cacheable_routes.get(route_name)
+        if cacheable is None:
+            # a pregenerator may generate different URLs for each request
+            mapper = request.registry.queryUtility(IRoutesMapper)
+            route = None
+            if mapper is not None:
+                route = mapper.get_route(route_name)
+            cacheable = route is not None and route.pregenerator is None
+            self._cacheable_routes[route_name] = cacheable
+        return cacheable
+
     def generate(self, path, request, **kw):
-        for (url, spec, route_name) in self.registrations:
-            if path.startswith(spec):
-                subpath = path[len(spec):]
-                if WIN: # pragma: no cover
-                    subpath = subpath.replace('\\', '/') # windows
-                if self.cache_busters:
-                    subpath, kw = self._bust_asset_path(
-                        request, spec, subpath, kw)
-                if url is None:
-                    kw['subpath'] = subpath
-                    return request.route_url(route_name, **kw)
-                else:
-                    app_url, scheme, host, port, qs, anchor = \
-                        parse_url_overrides(kw)
-                    parsed = url_parse(url)
-                    if not parsed.scheme:
-                        url = urlparse.urlunparse(parsed._replace(
-                            scheme=request.environ['wsgi.url_scheme']))
-                    subpath = url_quote(subpath)
-                    result = urljoin(url, subpath)
-                    return result + qs + anchor
-
-        raise ValueError('No static URL definition matching %s' % path)
+        reg = self._match(path)
+        if reg is None:
+            raise ValueError('No static URL definition matching %s' % path)
+        order, url, spec, route_name, parsed = reg
+        subpath = path[len(spec):]
+        if WIN: # pragma: no cover
+            subpath = subpath.replace('\\', '/') # windows
+        if self.cache_busters:
+            subpath, kw = self._bust_asset_path(request, spec, subpath, kw)
+
+        # the generated URL only depends on the application URL (or the
+        # scheme of the request for a scheme-relative URL) and on the
+        # arguments, which include any cache busting token
+        if url is None:
+            if not self._route_is_cacheable(request, route_name):
+                kw['subpath'] = subpath
+                return request.route_url(route_name, **kw)
+            base = request.application_url
+        elif not parsed.scheme:
+            base = request.environ['wsgi.url_scheme']
+        else:
+            base = None
+        key = _url_cache_key(spec, subpath, base, kw)
+        if key is not None:
+            result = self._url_cache.get(key)
+            if result is not None:
+                return result
+
+        if url is None:
+            kw['subpath'] = subpath
+            result = request.route_url(route_name, **kw)
+        else:
+            app_url, scheme, host, port, qs, anchor = \
+                parse_url_overrides(kw)
+            if base is not None:
+                url = urlparse.urlunparse(parsed._replace(scheme=base))
+            subpath = url_quote(subpath)
+            result = urljoin(url, subpath) + qs + anchor
+        if key is not None:
+            self._url_cache.put(key, result)
+        return result
 
     def add(self, config, name, spec, **extra):
         # This feature only allows for the serving of a directory and
@@ -1990,10 +2107,18 @@ class StaticURLInfo(object):
             # it's a view name
             url = None
             cache_max_age = extra.pop('cache_max_age', None)
+            view_kw = {}
+            for arg in self.static_view_args:
+                if arg in extra:
+                    view_kw[arg] = extra.pop(arg)
+
+            precompute_etags = extra.pop('precompute_etags', False)
 
             # create a view
             view = static_view(spec, cache_max_age=cache_max_age,
-                               use_subpath=True)
+                               use_subpath=True, **view_kw)
+            if precompute_etags:
+                config.action(None, callable=view.precompute_etags)
 
             # Mutate extra to allow factory, etc to be passed through here.
             # Treat permission specially because we'd like to default to
@@ -2035,6 +2160,7 @@ class StaticURLInfo(object):
 
             # url, spec, route_name
             registrations.append((url, spec, route_name))
+            self._reset()
 
         intr = config.introspectable('static views',
                                      name,
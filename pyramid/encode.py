@@ -1,3 +1,7 @@
+import re
+
+from repoze.lru import LRUCache
+
 from pyramid.compat import (
     text_type,
     binary_type,
@@ -6,6 +10,17 @@ from pyramid.compat import (
     url_quote_plus as _quote_plus,
     )
 
+# the characters quote_plus never escapes (whether "~" is among them
+# depends on the Python version); strings made only of these need no work
+_quote_plus_safe = ''.join(
+    c for c in map(chr, range(128)) if _quote_plus(c) == c)
+_is_quote_plus_safe = re.compile(
+    '[%s]*\\Z' % re.escape(_quote_plus_safe)).match
+
+# query string keys (e.g. pagination and filter parameters) repeat on every
+# link of a page, so their quoted forms are remembered
+_key_cache = LRUCache(1000)
+
 def url_quote(val, safe=''): # bw compat api
     cls = val.__class__
     if cls is text_type:
@@ -41,33 +56,110 @@ def urlencode(query, doseq=True):
     .. versionchanged:: 1.5
        In a key/value pair, if the value is ``None`` then it will be
        dropped from the resulting output.
+
+    .. versionchanged:: 1.8
+       A :class:`pyramid.url.QueryFragment` may be passed as ``query``,
+       or in place of a key/value pair.
     """
     try:
         # presumed to be a dictionary
         query = query.items()
     except AttributeError:
-        pass
+        if query.__class__ is QueryFragment:
+            return query.encoded
 
-    result = ''
+    result = []
+    append = result.append
     prefix = ''
 
-    for (k, v) in query:
-        k = quote_plus(k)
+    for item in query:
+        if item.__class__ is QueryFragment:
+            if item.encoded:
+                append(prefix)
+                append(item.encoded)
+                prefix = '&'
+            continue
+
+        k, v = item
+        k = _quote_key(k)
 
         if is_nonstr_iter(v):
             for x in v:
-                x = quote_plus(x)
-                result += '%s%s=%s' % (prefix, k, x)
+                append(prefix)
+                append(k)
+                append('=')
+                append(_quote_value(x))
                 prefix = '&'
         elif v is None:
-            result += '%s%s=' % (prefix, k)
+            append(prefix)
+            append(k)
+            append('=')
         else:
-            v = quote_plus(v)
-            result += '%s%s=%s' % (prefix, k, v)
+            append(prefix)
+            append(k)
+            append('=')
+            append(_quote_value(v))
 
         prefix = '&'
 
-    return result
+    return ''.join(result)
+
+def _quote_value(v):
+    cls = v.__class__
+    if cls is str:
+        if _is_quote_plus_safe(v) is not None:
+            return v
+    elif cls is int:
+        return str(v)
+    return quote_plus(v)
+
+def _quote_key(k):
+    # keyed on the class too, as e.g. 1 and True are equal but quote
+    # differently
+    key = (k.__class__, k)
+    try:
+        quoted = _key_cache.get(key)
+    except TypeError: # unhashable
+        return quote_plus(k)
+    if quoted is None:
+        quoted = _quote_value(k)
+        _key_cache.put(key, quoted)
+    return quoted
+
+class QueryFragment(object):
+    """ A query string fragment encoded ahead of time by
+    :func:`pyramid.url.urlencode` from ``query`` (a dictionary or a
+    sequence of two-tuples), for parameters shared by many generated URLs.
+
+    A fragment may be used in place of a two-tuple in a sequence passed to
+    :func:`pyramid.url.urlencode` (and so as part of the ``_query``
+    argument of :meth:`pyramid.request.Request.route_url` or the ``query``
+    argument of :meth:`pyramid.request.Request.resource_url`), or as the
+    whole query:
+
+    .. code-block:: python
+
+       shared = QueryFragment({'sort': 'name', 'filter': 'open issues'})
+       for page in pages:
+           request.route_url('issues', _query=[('page', page), shared])
+
+    .. versionadded:: 1.8
+    """
+    __slots__ = ('encoded',)
+
+    def __init__(self, query):
+        self.encoded = urlencode(query)
+
+    def __str__(self):
+        return self.encoded
+
+    def __bool__(self):
+        return bool(self.encoded)
+
+    __nonzero__ = __bool__ # py2
+
+    def __repr__(self):
+        return '<QueryFragment %r>' % (self.encoded,)
 
 # bw compat api (dnr)
 def quote_plus(val, safe=''):
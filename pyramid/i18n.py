@@ -1,5 +1,13 @@
 import gettext
+import mmap
 import os
+import struct
+import threading
+import time
+
+from multiprocessing.pool import ThreadPool
+
+from repoze.lru import LRUCache
 
 from translationstring import (
     Translator,
@@ -8,7 +16,13 @@ from translationstring import (
     TranslationStringFactory, # API
     )
 
-from pyramid.compat import PY2
+from pyramid.compat import (
+    PY2,
+    binary_type,
+    integer_types,
+    text_,
+    text_type,
+    )
 from pyramid.decorator import reify
 
 from pyramid.interfaces import (
@@ -17,6 +31,7 @@ from pyramid.interfaces import (
     ILocaleNegotiator,
     )
 
+from pyramid.settings import asbool
 from pyramid.threadlocal import get_current_registry
 
 TranslationString = TranslationString  # PyFlakes
@@ -29,12 +44,24 @@ class Localizer(object):
     the current request's locale name.  A
     :class:`pyramid.i18n.Localizer` object is created using the
     :func:`pyramid.i18n.get_localizer` function.
+
+    If ``cache_size`` is greater than zero, the results of
+    :meth:`translate` and :meth:`pluralize`, interpolation included, are
+    kept in an LRU cache of that many entries.  A result is only cached
+    when every value of the interpolation mapping is a string, an integer,
+    a boolean or ``None``; results involving any other value (in
+    particular an unhashable one) are computed on every call.  See
+    :meth:`cache_info`.
+
+    .. versionchanged:: 1.8
+       Added the ``cache_size`` argument.
     """
-    def __init__(self, locale_name, translations):
+    def __init__(self, locale_name, translations, cache_size=0):
         self.locale_name = locale_name
         self.translations = translations
         self.pluralizer = None
         self.translator = None
+        self._cache = LRUCache(cache_size) if cache_size > 0 else None
 
     def translate(self, tstring, domain=None, mapping=None):
         """
@@ -68,6 +95,21 @@ class Localizer(object):
         """
         if self.translator is None:
             self.translator = Translator(self.translations)
+        cache = self._cache
+        if cache is not None:
+            frozen = _freeze_mapping(mapping)
+            tfrozen = _freeze_mapping(getattr(tstring, 'mapping', None))
+            if frozen is not None and tfrozen is not None:
+                key = ('translate', tstring, getattr(tstring, 'domain', None),
+                       getattr(tstring, 'default', None),
+                       getattr(tstring, 'context', None), tfrozen,
+                       domain, frozen)
+                result = cache.get(key, _marker)
+                if result is _marker:
+                    result = self.translator(tstring, domain=domain,
+                                             mapping=mapping)
+                    cache.put(key, result)
+                return result
         return self.translator(tstring, domain=domain, mapping=mapping)
 
     def pluralize(self, singular, plural, n, domain=None, mapping=None):
@@ -111,9 +153,59 @@ class Localizer(object):
         """
         if self.pluralizer is None:
             self.pluralizer = Pluralizer(self.translations)
+        cache = self._cache
+        if cache is not None and n.__class__ in integer_types:
+            frozen = _freeze_mapping(mapping)
+            if frozen is not None:
+                # translation string metadata is ignored, so key on the text
+                key = ('pluralize', text_type(singular), text_type(plural),
+                       n, domain, frozen)
+                result = cache.get(key, _marker)
+                if result is _marker:
+                    result = self.pluralizer(singular, plural, n,
+                                             domain=domain, mapping=mapping)
+                    cache.put(key, result)
+                return result
         return self.pluralizer(singular, plural, n, domain=domain,
                                mapping=mapping)
 
+    def cache_info(self):
+        """ Return a dictionary describing the translation result cache,
+        with the keys ``size`` (the maximum number of entries),
+        ``entries``, ``lookups``, ``hits``, ``misses`` and ``evictions``,
+        or ``None`` if this localizer has no cache.
+
+        .. versionadded:: 1.8
+        """
+        cache = self._cache
+        if cache is None:
+            return None
+        return {
+            'size': cache.size,
+            'entries': len(cache.data),
+            'lookups': cache.lookups,
+            'hits': cache.hits,
+            'misses': cache.misses,
+            'evictions': cache.evictions,
+            }
+
+# the types of interpolation mapping values which may be part of a cache
+# key: for these, equal values of the same type are rendered identically
+_cacheable_types = frozenset(
+    (text_type, binary_type, bool, type(None)) + integer_types)
+
+def _freeze_mapping(mapping):
+    """ Return a hashable equivalent of the interpolation ``mapping``, or
+    ``None`` if results interpolated with it must not be cached."""
+    if not mapping:
+        return ()
+    items = []
+    for name, value in mapping.items():
+        if value.__class__ not in _cacheable_types:
+            return None
+        items.append((name, value.__class__, value))
+    return frozenset(items)
+
 
 def default_locale_negotiator(request):
     """ The default :term:`locale negotiator`.  Returns a locale name
@@ -141,6 +233,116 @@ def default_locale_negotiator(request):
             locale_name = request.cookies.get(name)
     return locale_name
 
+_marker = object()
+
+class AcceptLanguageLocaleNegotiator(object):
+    """ A :term:`locale negotiator` which never looks at the request body.
+
+    Unlike :func:`pyramid.i18n.default_locale_negotiator`, which consults
+    ``request.params`` and therefore parses the body of ``POST`` requests
+    (possibly spooling a large upload to disk) just to look for a locale,
+    this negotiator only looks at:
+
+    - the ``_LOCALE_`` attribute of the request object, if it is not
+      ``None``;
+
+    - the ``request.GET['_LOCALE_']`` (query string) value;
+
+    - the ``request.cookies['_LOCALE_']`` value;
+
+    - the ``Accept-Language`` header, matched against
+      ``available_locales``.
+
+    ``available_locales`` is a sequence of :term:`locale name` values
+    (e.g. ``['en', 'de', 'pt_BR']``) the application can serve.  A
+    language range in the ``Accept-Language`` header matches a locale
+    name case-insensitively, treating ``-`` and ``_`` alike; if a range
+    has no exact match, its more generic prefixes are tried (``de-CH``
+    falls back to ``de``).  Ranges are considered in order of quality;
+    ranges with a quality of zero and the ``*`` wildcard are ignored.  If
+    ``available_locales`` is empty the header is not consulted at all.
+
+    The result of matching is memoized per header value in an LRU cache
+    holding at most ``cache_size`` entries, so the header is only parsed
+    once for each distinct value a client sends.
+
+    The negotiator returns ``None`` if no locale could be determined,
+    in which case the :term:`default locale name` is used.
+
+    Use it by passing an instance as the ``locale_negotiator`` argument
+    of the :class:`~pyramid.config.Configurator` or to
+    :meth:`pyramid.config.Configurator.set_locale_negotiator`.
+
+    .. versionadded:: 1.8
+    """
+    name = '_LOCALE_'
+
+    def __init__(self, available_locales=(), cache_size=1000):
+        self.available_locales = tuple(available_locales)
+        self._locales = {}
+        for locale_name in self.available_locales:
+            key = self._normalize(locale_name)
+            self._locales.setdefault(key, locale_name)
+        self._cache = LRUCache(cache_size)
+
+    def __call__(self, request):
+        name = self.name
+        locale_name = getattr(request, name, None)
+        if locale_name is None:
+            locale_name = request.GET.get(name)
+            if locale_name is None:
+                locale_name = request.cookies.get(name)
+                if locale_name is None and self._locales:
+                    header = request.headers.get('Accept-Language')
+                    if header:
+                        locale_name = self.match(header)
+        return locale_name
+
+    def match(self, header):
+        """ Return the locale name from ``available_locales`` which best
+        matches the ``Accept-Language`` header value ``header``, or
+        ``None``."""
+        locale_name = self._cache.get(header, _marker)
+        if locale_name is _marker:
+            locale_name = self._match(header)
+            self._cache.put(header, locale_name)
+        return locale_name
+
+    def _match(self, header):
+        locales = self._locales
+        for language_range in self._parse(header):
+            parts = language_range.split('_')
+            while parts:
+                locale_name = locales.get('_'.join(parts))
+                if locale_name is not None:
+                    return locale_name
+                parts.pop()
+        return None
+
+    @staticmethod
+    def _normalize(value):
+        return value.strip().replace('-', '_').lower()
+
+    def _parse(self, header):
+        ranges = []
+        for position, item in enumerate(header.split(',')):
+            params = item.split(';')
+            language_range = self._normalize(params[0])
+            if not language_range or language_range == '*':
+                continue
+            quality = 1.0
+            for param in params[1:]:
+                key, sep, value = param.partition('=')
+                if key.strip().lower() == 'q':
+                    try:
+                        quality = float(value)
+                    except ValueError:
+                        quality = 0.0
+            if quality > 0:
+                ranges.append((-quality, position, language_range))
+        ranges.sort()
+        return [language_range for _, _, language_range in ranges]
+
 def negotiate_locale_name(request):
     """ Negotiate and return the :term:`locale name` associated with
     the current request."""
@@ -166,12 +368,36 @@ def get_locale_name(request):
     """
     return request.locale_name
 
-def make_localizer(current_locale_name, translation_directories):
+def make_localizer(current_locale_name, translation_directories,
+                   mapped=False, cache_size=0):
     """ Create a :class:`pyramid.i18n.Localizer` object
     corresponding to the provided locale name from the 
-    translations found in the list of translation directories."""
-    translations = Translations()
-    translations._catalog = {}
+    translations found in the list of translation directories.
+
+    If ``mapped`` is true, the message catalogs are loaded as
+    :class:`pyramid.i18n.MappedTranslations` objects, which memory-map
+    the ``.mo`` files and decode messages on demand, instead of as
+    :class:`pyramid.i18n.Translations` objects.
+
+    ``cache_size`` is passed to the :class:`pyramid.i18n.Localizer`.
+
+    .. versionchanged:: 1.8
+       Added the ``mapped`` and ``cache_size`` arguments.
+    """
+    return _make_localizer(current_locale_name, translation_directories,
+                           mapped=mapped, cache_size=cache_size)
+
+def _make_localizer(current_locale_name, translation_directories,
+                    timings=None, mapped=False, cache_size=0):
+    # if ``timings`` is a dict, the seconds spent loading each domain are
+    # added to it, keyed by domain name
+    if mapped:
+        factory = MappedTranslations
+        translations = factory()
+    else:
+        factory = Translations
+        translations = factory()
+        translations._catalog = {}
 
     locales_to_try = []
     if '_' in current_locale_name:
@@ -201,13 +427,107 @@ def make_localizer(current_locale_name, translation_directories):
                 mopath = os.path.realpath(os.path.join(messages_dir,
                                                        mofile))
                 if mofile.endswith('.mo') and os.path.isfile(mopath):
+                    start = time.time()
                     with open(mopath, 'rb') as mofp:
                         domain = mofile[:-3]
-                        dtrans = Translations(mofp, domain)
+                        dtrans = factory(mofp, domain)
                         translations.add(dtrans)
+                    if timings is not None:
+                        elapsed = time.time() - start
+                        timings[domain] = timings.get(domain, 0) + elapsed
 
     return Localizer(locale_name=current_locale_name,
-                          translations=translations)
+                          translations=translations,
+                          cache_size=cache_size)
+
+# one lock per locale name currently being built, guarded by _locks_lock
+_locks_lock = threading.Lock()
+_localizer_locks = {}
+
+def _get_or_make_localizer(registry, locale_name, timings=None):
+    """ Return the localizer registered for ``locale_name``, building and
+    registering it first if necessary.  Concurrent callers asking for the
+    same locale wait for a single build instead of each parsing the
+    catalogs."""
+    localizer = registry.queryUtility(ILocalizer, name=locale_name)
+    if localizer is not None:
+        return localizer
+
+    with _locks_lock:
+        lock = _localizer_locks.setdefault(locale_name, threading.Lock())
+    try:
+        with lock:
+            localizer = registry.queryUtility(ILocalizer, name=locale_name)
+            if localizer is None:
+                tdirs = registry.queryUtility(ITranslationDirectories,
+                                              default=[])
+                settings = registry.settings or {}
+                mapped = asbool(settings.get('pyramid.mmap_translations'))
+                cache_size = int(
+                    settings.get('pyramid.localizer_cache_size') or 0)
+                localizer = _make_localizer(locale_name, tdirs, timings,
+                                            mapped=mapped,
+                                            cache_size=cache_size)
+                registry.registerUtility(localizer, ILocalizer,
+                                         name=locale_name)
+    finally:
+        with _locks_lock:
+            if _localizer_locks.get(locale_name) is lock:
+                del _localizer_locks[locale_name]
+    return localizer
+
+def find_translation_locales(translation_directories):
+    """ Return a sorted list of the :term:`locale name` values for which
+    at least one of the ``translation_directories`` contains an
+    ``LC_MESSAGES`` directory.
+
+    .. versionadded:: 1.8
+    """
+    locales = set()
+    for tdir in translation_directories:
+        for lname in os.listdir(tdir):
+            messages_dir = os.path.join(tdir, lname, 'LC_MESSAGES')
+            if os.path.isdir(os.path.realpath(messages_dir)):
+                locales.add(lname)
+    return sorted(locales)
+
+def preload_localizers(registry, locales=None, threads=1):
+    """ Build and register the :class:`pyramid.i18n.Localizer` for each
+    :term:`locale name` in ``locales`` so that requests do not have to.
+    If ``locales`` is ``None``, every locale found in the registered
+    :term:`translation directory` paths is loaded (see
+    :func:`pyramid.i18n.find_translation_locales`).  Localizers which are
+    already registered are left alone.
+
+    If ``threads`` is greater than one, the locales are loaded by a pool
+    of that many threads.
+
+    Returns a dictionary mapping each locale name to a dictionary of
+    ``{domain: seconds}`` load times.  Locales which were already loaded
+    map to an empty dictionary.
+
+    .. versionadded:: 1.8
+    """
+    if locales is None:
+        tdirs = registry.queryUtility(ITranslationDirectories, default=[])
+        locales = find_translation_locales(tdirs)
+
+    def load(locale_name):
+        timings = {}
+        _get_or_make_localizer(registry, locale_name, timings)
+        return locale_name, timings
+
+    locales = list(locales)
+    if threads > 1 and len(locales) > 1:
+        pool = ThreadPool(min(threads, len(locales)))
+        try:
+            results = pool.map(load, locales)
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        results = [load(locale_name) for locale_name in locales]
+    return dict(results)
 
 def get_localizer(request):
     """
@@ -360,24 +680,321 @@ class Translations(gettext.GNUTranslations, object):
             return self._domains.get(domain, self).ngettext(
                 singular, plural, num)
 
-class LocalizerRequestMixin(object):
-    @reify
-    def localizer(self):
-        """ Convenience property to return a localizer """
-        registry = self.registry
+def _hashpjw(key):
+    # the string hash GNU msgfmt uses to build the hash table of a .mo file
+    hval = 0
+    for c in bytearray(key):
+        hval = (hval << 4) + c
+        g = hval & 0xf0000000
+        if g:
+            hval ^= g >> 24
+            hval ^= g
+    return hval & 0xffffffff
+
+def _mmap_untracked(fileno):
+    # A mapping normally keeps a duplicate of the file descriptor open
+    # for as long as it lives, which with many locales and domains
+    # exhausts the descriptors of a process.  ``trackfd=False`` (Python
+    # 3.13+ on Unix) maps the file without one; elsewhere read the file
+    # into memory instead, which still spares decoding every message.
+    try:
+        return mmap.mmap(fileno, 0, access=mmap.ACCESS_READ, trackfd=False)
+    except TypeError:
+        return None
+
+class _MappedCatalog(object):
+    """ A read-only view of a single ``.mo`` file which looks messages up
+    in place rather than decoding the whole file up front."""
+
+    LE_MAGIC = gettext.GNUTranslations.LE_MAGIC
+    BE_MAGIC = gettext.GNUTranslations.BE_MAGIC
+
+    def __init__(self, fileobj):
+        filename = getattr(fileobj, 'name', '')
+        buf = None
+        try:
+            fileno = fileobj.fileno()
+        except (AttributeError, IOError, ValueError):
+            pass
+        else:
+            if os.fstat(fileno).st_size:
+                buf = _mmap_untracked(fileno)
+        if buf is None:
+            buf = fileobj.read()
+        self._buf = buf
+        self.plural = lambda n: int(n != 1) # germanic plural by default
+        self.charset = 'ascii'
+        self.info = {}
+
+        if len(buf) < 28:
+            raise IOError(0, 'Bad magic number', filename)
+        magic = struct.unpack_from('<I', buf, 0)[0]
+        if magic == self.LE_MAGIC:
+            order = '<'
+        elif magic == self.BE_MAGIC:
+            order = '>'
+        else:
+            raise IOError(0, 'Bad magic number', filename)
+        (version, self._count, self._originals, self._translations,
+         self._hash_size, self._hash_offset) = struct.unpack_from(
+             order + '6I', buf, 4)
+        if version >> 16 not in gettext.GNUTranslations.VERSIONS:
+            raise IOError(0, 'Bad version number ' + str(version >> 16),
+                          filename)
+        end = self._translations + self._count * 8
+        if self._hash_size:
+            end = max(end, self._hash_offset + self._hash_size * 4)
+        if max(end, self._originals + self._count * 8) > len(buf):
+            raise IOError(0, 'File is corrupt', filename)
+        self._entry = struct.Struct(order + 'II')
+        self._slot = struct.Struct(order + 'I')
+        self._filename = filename
+
+        if self._count and not self._original(0):
+            self._parse_metadata(self._translation(0))
+
+    def _parse_metadata(self, header):
+        # the same rules GNUTranslations applies to the catalog description
+        lastk = None
+        for b_item in header.split(b'\n'):
+            item = b_item.decode().strip()
+            if not item:
+                continue
+            if item.startswith('#-#-#-#-#') and item.endswith('#-#-#-#-#'):
+                continue
+            k = v = None
+            if ':' in item:
+                k, v = item.split(':', 1)
+                k = k.strip().lower()
+                v = v.strip()
+                self.info[k] = v
+                lastk = k
+            elif lastk:
+                self.info[lastk] += '\n' + item
+            if k == 'content-type':
+                self.charset = v.split('charset=')[1]
+            elif k == 'plural-forms':
+                v = v.split(';')
+                plural = v[1].split('plural=')[1]
+                self.plural = gettext.c2py(plural)
+
+    def _string(self, table, index):
+        length, offset = self._entry.unpack_from(self._buf, table + index * 8)
+        if offset + length > len(self._buf):
+            raise IOError(0, 'File is corrupt', self._filename)
+        return self._buf[offset:offset + length]
+
+    def _original(self, index):
+        # only the singular part of a plural message id is significant
+        return self._string(self._originals, index).split(b'\0', 1)[0]
+
+    def _translation(self, index):
+        return self._string(self._translations, index)
+
+    def _index(self, key):
+        """ Return the index of the message whose (singular) id is the
+        byte string ``key``, or ``None``."""
+        size = self._hash_size
+        if size > 2:
+            hval = _hashpjw(key)
+            idx = hval % size
+            incr = 1 + (hval % (size - 2))
+            for _ in range(size):
+                nstr = self._slot.unpack_from(
+                    self._buf, self._hash_offset + idx * 4)[0]
+                if nstr == 0:
+                    return None
+                nstr -= 1
+                # entries past the static table are system dependent strings
+                if nstr < self._count and self._original(nstr) == key:
+                    return nstr
+                if idx >= size - incr:
+                    idx -= size - incr
+                else:
+                    idx += incr
+            return None
+        # no hash table (e.g. written by Babel or msgfmt.py): the message
+        # ids are sorted, so bisect them
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            original = self._original(mid)
+            if original < key:
+                lo = mid + 1
+            elif original > key:
+                hi = mid
+            else:
+                return mid
+        return None
+
+    def find(self, message):
+        """ Return ``(forms, plural)`` for ``message``, where ``forms`` is
+        a tuple of the decoded translations and ``plural`` is the plural
+        function of the catalog if the message has plural forms or
+        ``None`` if it does not.  Return ``None`` if the message is not in
+        the catalog."""
+        charset = self.charset
+        try:
+            key = message.encode(charset)
+        except UnicodeError:
+            return None
+        index = self._index(key)
+        if index is None:
+            return None
+        original = self._string(self._originals, index)
+        tmsg = self._translation(index)
+        if b'\0' in original:
+            forms = tuple(text_(x, charset) for x in tmsg.split(b'\0'))
+            return forms, self.plural
+        return (text_(tmsg, charset),), None
+
+class MappedTranslations(Translations):
+    """ A memory-mapped alternative to :class:`pyramid.i18n.Translations`.
+
+    Rather than decoding every message of a ``.mo`` file into a
+    dictionary when it is loaded, the file is memory-mapped and each
+    message is looked up (using the hash table of the file when it has
+    one) and decoded the first time it is asked for.  The most recently
+    used ``cache_size`` decoded messages are kept in an LRU cache.  The
+    pages of a mapped file are shared by every process which maps it,
+    so an application running many worker processes with many locales
+    and domains needs much less memory than with
+    :class:`~pyramid.i18n.Translations`.  No file descriptor is kept open
+    for a mapping, so files are only mapped on Python 3.13+ on UNIX;
+    elsewhere they are read into memory (undecoded) instead.
+
+    Catalogs are merged and organized into domains exactly like those
+    of :class:`~pyramid.i18n.Translations`; only other
+    :class:`MappedTranslations` objects may be added to or merged into
+    a :class:`MappedTranslations` object.
+
+    Pass ``mapped=True`` to :func:`pyramid.i18n.make_localizer`, or set
+    the ``pyramid.mmap_translations`` setting, to use this class.
+
+    .. versionadded:: 1.8
+    """
 
-        current_locale_name = self.locale_name
-        localizer = registry.queryUtility(ILocalizer, name=current_locale_name)
+    # the message id of a message in a context (gettext.GNUTranslations
+    # only defines it on Python 3.8+)
+    CONTEXT = '%s\x04%s'
+
+    def __init__(self, fileobj=None, domain=Translations.DEFAULT_DOMAIN,
+                 cache_size=256):
+        Translations.__init__(self, domain=domain)
+        self._catalogs = []
+        self._cache = LRUCache(cache_size)
+        if fileobj is not None:
+            catalog = _MappedCatalog(fileobj)
+            self._catalogs.append(catalog)
+            self._info = catalog.info
+            self._charset = catalog.charset
+            self.plural = catalog.plural
+            self.files.append(catalog._filename)
 
-        if localizer is None:
-            # no localizer utility registered yet
-            tdirs = registry.queryUtility(ITranslationDirectories, default=[])
-            localizer = make_localizer(current_locale_name, tdirs)
+    def merge(self, translations):
+        """Merge the given translations into the catalog.
 
-            registry.registerUtility(localizer, ILocalizer,
-                                     name=current_locale_name)
+        Message translations in the specified catalog override any messages
+        with the same identifier in the existing catalog.
 
-        return localizer
+        :param translations: the `MappedTranslations` instance with the
+                             messages to merge
+        :return: the `MappedTranslations` instance (``self``) so that
+                 `merge` calls can be easily chained
+        :rtype: `MappedTranslations`
+        """
+        if isinstance(translations, MappedTranslations):
+            self._catalogs[:0] = translations._catalogs
+            self.files.extend(translations.files)
+            self._cache.clear()
+        return self
+
+    def _find(self, message):
+        result = self._cache.get(message, _marker)
+        if result is _marker:
+            result = None
+            for catalog in self._catalogs:
+                result = catalog.find(message)
+                if result is not None:
+                    break
+            self._cache.put(message, result)
+        return result
+
+    def _singular(self, message):
+        result = self._find(message)
+        if result is not None:
+            forms, plural = result
+            # a message with plural forms translates to its singular form
+            index = 0 if plural is None else plural(1)
+            if index < len(forms):
+                return forms[index]
+        return None
+
+    def _plural(self, msgid1, n):
+        result = self._find(msgid1)
+        if result is not None and result[1] is not None:
+            forms, plural = result
+            index = plural(n)
+            if index < len(forms):
+                return forms[index]
+        return None
+
+    def ugettext(self, message):
+        tmsg = self._singular(message)
+        if tmsg is not None:
+            return tmsg
+        if self._fallback:
+            if PY2:
+                return self._fallback.ugettext(message)
+            return self._fallback.gettext(message)
+        return message
+
+    def ungettext(self, msgid1, msgid2, n):
+        tmsg = self._plural(msgid1, n)
+        if tmsg is not None:
+            return tmsg
+        if self._fallback:
+            if PY2:
+                return self._fallback.ungettext(msgid1, msgid2, n)
+            return self._fallback.ngettext(msgid1, msgid2, n)
+        if n == 1:
+            return msgid1
+        return msgid2
+
+    def pgettext(self, context, message):
+        tmsg = self._singular(self.CONTEXT % (context, message))
+        if tmsg is not None:
+            return tmsg
+        if self._fallback:
+            return self._fallback.pgettext(context, message)
+        return message
+
+    def npgettext(self, context, msgid1, msgid2, n):
+        tmsg = self._plural(self.CONTEXT % (context, msgid1), n)
+        if tmsg is not None:
+            return tmsg
+        if self._fallback:
+            return self._fallback.npgettext(context, msgid1, msgid2, n)
+        if n == 1:
+            return msgid1
+        return msgid2
+
+    if PY2:
+        def gettext(self, message):
+            return self.ugettext(message).encode(self._charset or 'ascii')
+
+        def ngettext(self, msgid1, msgid2, n):
+            return self.ungettext(msgid1, msgid2, n).encode(
+                self._charset or 'ascii')
+    else:
+        gettext = ugettext
+        ngettext = ungettext
+
+class LocalizerRequestMixin(object):
+    @reify
+    def localizer(self):
+        """ Convenience property to return a localizer """
+        return _get_or_make_localizer(self.registry, self.locale_name)
 
     @reify
     def locale_name(self):
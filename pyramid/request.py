@@ -236,6 +236,19 @@ class Request(
     def json_body(self):
         return json.loads(text_(self.body, self.charset))
 
+    @property
+    def application_url(self):
+        """
+        The URL including SCRIPT_NAME (no PATH_INFO or query string)
+        """
+        # computed once per request (and again if the environ changes) as
+        # every generated URL needs it
+        urls = self._app_url_memo()
+        url = urls.get(None)
+        if url is None:
+            url = urls[None] = BaseRequest.application_url.fget(self)
+        return url
+
 
 def route_request_iface(name, bases=()):
     # zope.interface treats the __name__ as the __doc__ and changes __name__
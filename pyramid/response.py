@@ -1,12 +1,13 @@
+import hashlib
 import mimetypes
-from os.path import (
-    getmtime,
-    getsize,
-    )
+import mmap
+import os
 
+from repoze.lru import LRUCache
 import venusian
 
 from webob import Response as _Response
+from webob.response import AppIterRange
 from zope.interface import implementer
 from pyramid.interfaces import IResponse, IResponseFactory
 
@@ -50,9 +51,30 @@ class FileResponse(Response):
     It's generally safe to leave this set to ``None`` if you're serving a
     binary file.  This argument will be ignored if you also leave
     ``content-type`` as ``None``.
+
+    The file is served by the ``wsgi.file_wrapper`` of the web server if
+    it provides one, and by a :class:`pyramid.response.FileIter` otherwise,
+    or a :class:`pyramid.response.ZeroCopyFileIter` if ``zero_copy`` is
+    ``True`` (see its documentation for the caveats of doing so).
+
+    Requests for a byte range of the file (via the ``Range`` header) are
+    served by seeking to the start of the range, rather than by reading and
+    discarding the preceding bytes.
+
+    If ``content_etag`` is ``True``, the response has a strong ``ETag``
+    header computed from a hash of the contents of the file.  The hash is
+    computed once for each path, size and modification time, and then
+    remembered for the life of the process.  If ``request`` has an
+    ``If-None-Match`` header matching the ``ETag``, the response is a
+    ``304 Not Modified`` response and the file is not opened at all.
+
+    .. versionchanged:: 1.8
+       Byte ranges are served by seeking within the file.  Added the
+       ``content_etag`` and ``zero_copy`` arguments.
     """
     def __init__(self, path, request=None, cache_max_age=None,
-                 content_type=None, content_encoding=None):
+                 content_type=None, content_encoding=None,
+                 content_etag=False, zero_copy=False):
         if content_type is None:
             content_type, content_encoding = _guess_type(path)
         super(FileResponse, self).__init__(
@@ -60,21 +82,89 @@ class FileResponse(Response):
             content_type=content_type,
             content_encoding=content_encoding
         )
-        self.last_modified = getmtime(path)
-        content_length = getsize(path)
-        f = open(path, 'rb')
-        app_iter = None
+        st = os.stat(path)
+        self.last_modified = st.st_mtime
+        content_length = st.st_size
+        if cache_max_age is not None:
+            self.cache_expires = cache_max_age
+        if content_etag:
+            self.etag = _content_hash(path, st)
+            if (
+                request is not None and
+                request.method in ('GET', 'HEAD') and
+                self.etag in request.if_none_match
+            ):
+                self.status = '304 Not Modified'
+                self._file = self._file_iter = None
+                return
+        self._file = open(path, 'rb')
+        self._file_wrapper = None
         if request is not None:
-            environ = request.environ
-            if 'wsgi.file_wrapper' in environ:
-                app_iter = environ['wsgi.file_wrapper'](f, _BLOCK_SIZE)
-        if app_iter is None:
-            app_iter = FileIter(f, _BLOCK_SIZE)
-        self.app_iter = app_iter
+            self._file_wrapper = request.environ.get('wsgi.file_wrapper')
+        self.app_iter = self._file_iter = _file_app_iter(
+            self._file, request, content_length, zero_copy)
         # assignment of content_length must come after assignment of app_iter
         self.content_length = content_length
-        if cache_max_age is not None:
-            self.cache_expires = cache_max_age
+
+    def app_iter_range(self, start, stop):
+        if self._app_iter is not self._file_iter:
+            # the body has been replaced since the response was created
+            return super(FileResponse, self).app_iter_range(start, stop)
+        if self._file_wrapper is not None:
+            f = _FileRange(self._file, start, stop)
+            return self._file_wrapper(f, _BLOCK_SIZE)
+        return self._file_iter.app_iter_range(start, stop)
+
+# path -> ((size, mtime), hash) for the files hashed by _content_hash
+_content_hashes = LRUCache(10000)
+
+def _content_hash(path, st=None):
+    """ Return a hex digest of the contents of the file at ``path``.  The
+    digest is remembered and only computed again when the size or
+    modification time reported by ``st`` (an ``os.stat`` result for
+    ``path``, which is computed if not passed) changes."""
+    if st is None:
+        st = os.stat(path)
+    key = (st.st_size, st.st_mtime)
+    cached = _content_hashes.get(path)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    h = hashlib.sha1()
+    with open(path, 'rb') as f:
+        while True:
+            block = f.read(_BLOCK_SIZE)
+            if not block:
+                break
+            h.update(block)
+    digest = h.hexdigest()
+    _content_hashes.put(path, (key, digest))
+    return digest
+
+def _reserve_content_hashes(paths):
+    """ Make sure that the cache used by :func:`_content_hash` can hold
+    the hashes of all of ``paths`` along with those it already holds, so
+    that hashing a whole directory up front does not evict the hashes it
+    has just computed."""
+    global _content_hashes
+    cache = _content_hashes
+    needed = len(set(cache.data).union(paths))
+    if needed > cache.size:
+        bigger = LRUCache(needed)
+        for path, (pos, value) in list(cache.data.items()):
+            bigger.put(path, value)
+        _content_hashes = bigger
+
+def _file_app_iter(f, request=None, size=None, zero_copy=False):
+    """ Return an app_iter for the open file ``f`` of ``size`` bytes,
+    using the server's ``wsgi.file_wrapper`` if ``request`` provides one,
+    or a :class:`ZeroCopyFileIter` if ``zero_copy`` is true."""
+    if request is not None:
+        environ = request.environ
+        if 'wsgi.file_wrapper' in environ:
+            return environ['wsgi.file_wrapper'](f, _BLOCK_SIZE)
+    if zero_copy:
+        return ZeroCopyFileIter(f, _BLOCK_SIZE, stop=size)
+    return FileIter(f, _BLOCK_SIZE)
 
 class FileIter(object):
     """ A fixed-block-size iterator for use as a WSGI app_iter.
@@ -83,6 +173,9 @@ class FileIter(object):
     method that takes a size hint).
 
     ``block_size`` is an optional block size for iteration.
+
+    If ``file`` has a ``seek`` method, a byte range of the file is served by
+    seeking to the start of the range (see :meth:`app_iter_range`).
     """
     def __init__(self, file, block_size=_BLOCK_SIZE):
         self.file = file
@@ -102,6 +195,162 @@ class FileIter(object):
     def close(self):
         self.file.close()
 
+    def app_iter_range(self, start, stop):
+        """ Return an iterator over the ``start:stop`` byte range of the
+        file (``stop`` may be ``None`` to read to the end of the file).
+        This is used by WebOb when serving ``Range`` requests.
+
+        .. versionadded:: 1.8
+        """
+        if not hasattr(self.file, 'seek'):
+            return AppIterRange(self, start, stop)
+        return self.__class__(
+            _FileRange(self.file, start, stop), self.block_size)
+
+class ZeroCopyFileIter(FileIter):
+    """ A :class:`pyramid.response.FileIter` for a file on disk which
+    avoids copying the file through Python where it can.
+
+    ``file`` is a Python file object opened in binary mode with a
+    ``fileno`` method.
+
+    ``block_size`` is an optional block size for iteration.
+
+    ``start`` and ``stop`` optionally restrict the iterator to that byte
+    range of the file; ``stop`` defaults to the size of the file.
+
+    A web server which knows about this class may send the file straight
+    from the kernel instead of iterating over it, e.g. with
+    ``os.sendfile(sock.fileno(), app_iter.fileno(), app_iter.offset,
+    app_iter.count)``.  It must still call ``close`` afterwards.
+
+    Otherwise, when the range being served is at least ``mmap_threshold``
+    bytes (default 1MB), blocks are sliced from a memory mapping of the file
+    rather than read from it, saving a ``read`` system call per block.  The file is mapped in windows of ``mmap_window``
+    bytes (default 16MB) so that memory usage stays bounded for large files.
+    Files which cannot be mapped are read like :class:`FileIter` does.
+
+    .. warning::
+
+       A process reading a memory mapped file which is truncated by another
+       process is killed with ``SIGBUS``.  Replace static files on disk
+       (e.g. by renaming a new file over them) rather than rewriting them
+       while they may be served.
+
+    .. versionadded:: 1.8
+    """
+    mmap_threshold = 1024 * 1024
+    mmap_window = 16 * 1024 * 1024
+
+    def __init__(self, file, block_size=_BLOCK_SIZE, start=0, stop=None):
+        super(ZeroCopyFileIter, self).__init__(file, block_size)
+        if stop is None:
+            stop = os.fstat(file.fileno()).st_size
+        self.offset = start
+        self.count = max(stop - start, 0)
+        self._pos = start
+        self._stop = stop
+        self._mmap = None
+        self._mmap_start = 0
+        self._use_mmap = self.count >= self.mmap_threshold
+        self._seeked = False
+
+    def fileno(self):
+        return self.file.fileno()
+
+    def next(self):
+        pos, stop = self._pos, self._stop
+        if pos >= stop:
+            raise StopIteration
+        end = min(pos + self.block_size, stop)
+        if self._use_mmap:
+            val = self._read_mapped(pos, end)
+        else:
+            if not self._seeked:
+                self.file.seek(pos)
+                self._seeked = True
+            val = self.file.read(end - pos)
+        if not val:
+            raise StopIteration
+        self._pos = pos + len(val)
+        return val
+
+    __next__ = next # py3
+
+    def _read_mapped(self, pos, end):
+        m = self._mmap
+        start = self._mmap_start
+        if m is None or pos < start or end > start + len(m):
+            self._unmap()
+            # mappings must start at a multiple of the allocation granularity
+            start = pos - pos % mmap.ALLOCATIONGRANULARITY
+            length = max(self.mmap_window, end - start)
+            try:
+                size = os.fstat(self.file.fileno()).st_size
+                m = mmap.mmap(self.file.fileno(), min(length, size - start),
+                              access=mmap.ACCESS_READ, offset=start)
+            except (ValueError, EnvironmentError):
+                # e.g. not a regular file or truncated since opened
+                self._use_mmap = False
+                self.file.seek(pos)
+                self._seeked = True
+                return self.file.read(end - pos)
+            self._mmap = m
+            self._mmap_start = start
+        return m[pos - start:end - start]
+
+    def _unmap(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def close(self):
+        self._unmap()
+        self.file.close()
+
+    def app_iter_range(self, start, stop):
+        """ Return a :class:`ZeroCopyFileIter` for the ``start:stop`` byte
+        range of this iterator's range of the file."""
+        start = self.offset + start
+        if stop is None:
+            stop = self._stop
+        else:
+            stop = min(self.offset + stop, self._stop)
+        return self.__class__(self.file, self.block_size, start, stop)
+
+class _FileRange(object):
+    """ A read-only file-like object giving access to the ``start:stop``
+    byte range of the open file ``file``.  Seeking and ``fileno`` are
+    passed through to ``file``, so a ``wsgi.file_wrapper`` which sends
+    ``Content-Length`` bytes from the current position of the file
+    descriptor still works, while a wrapper which reads until the end of the
+    file stops at ``stop``."""
+    def __init__(self, file, start, stop):
+        file.seek(start)
+        self.file = file
+        self.stop = stop
+        if hasattr(file, 'fileno'):
+            self.fileno = file.fileno
+
+    def read(self, size=-1):
+        if self.stop is None:
+            return self.file.read(size)
+        remaining = self.stop - self.file.tell()
+        if size is None or size < 0 or size > remaining:
+            size = remaining
+        if size <= 0:
+            return b''
+        return self.file.read(size)
+
+    def seek(self, offset, whence=0):
+        return self.file.seek(offset, whence)
+
+    def tell(self):
+        return self.file.tell()
+
+    def close(self):
+        self.file.close()
+
 
 class response_adapter(object):
     """ Decorator activated via a :term:`scan` which treats the function
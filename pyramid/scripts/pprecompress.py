@@ -0,0 +1,207 @@
+import gzip
+import multiprocessing
+import optparse
+import os
+import sys
+import textwrap
+
+from io import BytesIO
+
+from pyramid.response import _guess_type
+
+try:
+    import brotli
+except ImportError: # pragma: no cover
+    brotli = None
+
+def main(argv=sys.argv, quiet=False):
+    command = PPrecompressCommand(argv, quiet)
+    return command.run()
+
+def gzip_compress(data):
+    buf = BytesIO()
+    # a fixed mtime keeps the output reproducible across builds
+    f = gzip.GzipFile(filename='', mode='wb', compresslevel=9,
+                      fileobj=buf, mtime=0)
+    try:
+        f.write(data)
+    finally:
+        f.close()
+    return buf.getvalue()
+
+def brotli_compress(data):
+    return brotli.compress(data)
+
+# encoding name -> (sidecar suffix, compression function)
+compressors = {
+    'gzip': ('.gz', gzip_compress),
+    'br': ('.br', brotli_compress),
+    }
+
+# content types other than text/* which are worth compressing
+compressible_types = set([
+    'application/javascript',
+    'application/json',
+    'application/manifest+json',
+    'application/wasm',
+    'application/x-javascript',
+    'application/xml',
+    'image/svg+xml',
+    'image/x-icon',
+    'image/vnd.microsoft.icon',
+    ])
+
+def is_compressible(path):
+    """ Return ``True`` if ``path`` looks like a file that compresses
+    well."""
+    if path.endswith(('.gz', '.br')):
+        return False
+    content_type, content_encoding = _guess_type(path)
+    if content_encoding is not None:
+        return False
+    return (content_type.startswith('text/') or
+            content_type in compressible_types)
+
+def compress_file(task):
+    """ Write the precompressed variants of a file.  ``task`` is a tuple of
+    ``(path, encodings, force)``.  Returns a list of ``(sidecar_path,
+    original_size, compressed_size)`` tuples, where ``sidecar_path`` is
+    ``None`` if the variant was not worth keeping."""
+    path, encodings, force = task
+    mtime = os.path.getmtime(path)
+    data = None
+    results = []
+    for encoding in encodings:
+        suffix, compress = compressors[encoding]
+        sidecar_path = path + suffix
+        if (not force and os.path.exists(sidecar_path) and
+                os.path.getmtime(sidecar_path) >= mtime):
+            continue
+        if data is None:
+            with open(path, 'rb') as f:
+                data = f.read()
+        compressed = compress(data)
+        if len(compressed) >= len(data):
+            # never serve a "compressed" variant larger than the original
+            if os.path.exists(sidecar_path):
+                os.remove(sidecar_path)
+            results.append((None, len(data), len(compressed)))
+            continue
+        with open(sidecar_path, 'wb') as f:
+            f.write(compressed)
+        results.append((sidecar_path, len(data), len(compressed)))
+    return results
+
+class PPrecompressCommand(object):
+    usage = '%prog [options] directory [directory ...]'
+    description = """\
+    Create precompressed variants of the static assets in one or more
+    directories, for use by a static view created with the "precompressed"
+    option.  For every compressible file (e.g. "app.js") a gzip-compressed
+    "app.js.gz" and, if the "brotli" package is installed, a
+    brotli-compressed "app.js.br" are written next to it.  Files are
+    compressed in parallel; existing variants which are newer than their
+    file are left alone unless --force is given.
+
+    Example: "pprecompress myapp/static".
+
+    """
+    parser = optparse.OptionParser(
+        usage,
+        description=textwrap.dedent(description),
+        )
+    parser.add_option('-e', '--encoding',
+                      dest='encodings',
+                      action='append',
+                      choices=sorted(compressors),
+                      help=('Encoding to precompress with (gzip or br); may '
+                            'be given more than once. Defaults to gzip, and '
+                            'br when the brotli package is installed.'))
+    parser.add_option('-j', '--jobs',
+                      dest='jobs',
+                      type='int',
+                      default=0,
+                      help=('Number of files to compress in parallel. '
+                            'Defaults to the number of CPUs.'))
+    parser.add_option('-m', '--min-size',
+                      dest='min_size',
+                      type='int',
+                      default=256,
+                      help=('Skip files smaller than this many bytes. '
+                            'Defaults to 256.'))
+    parser.add_option('-f', '--force',
+                      dest='force',
+                      action='store_true',
+                      default=False,
+                      help='Recompress files even if their variants are '
+                           'up to date.')
+
+    def __init__(self, argv, quiet=False):
+        self.quiet = quiet
+        self.options, self.args = self.parser.parse_args(argv[1:])
+
+    def out(self, msg): # pragma: no cover
+        if not self.quiet:
+            print(msg)
+
+    def find_files(self, directory):
+        min_size = self.options.min_size
+        for dirpath, dirnames, filenames in os.walk(directory):
+            dirnames.sort()
+            for filename in sorted(filenames):
+                path = os.path.join(dirpath, filename)
+                if (is_compressible(path) and
+                        os.path.getsize(path) >= min_size):
+                    yield path
+
+    def run(self):
+        if not self.args:
+            self.out('Requires at least one directory argument')
+            return 2
+        encodings = self.options.encodings
+        if not encodings:
+            encodings = ['gzip']
+            if brotli is not None:
+                encodings.insert(0, 'br')
+        elif 'br' in encodings and brotli is None:
+            self.out('The "br" encoding requires the brotli package')
+            return 2
+        for directory in self.args:
+            if not os.path.isdir(directory):
+                self.out('%s is not a directory' % directory)
+                return 2
+
+        force = self.options.force
+        tasks = [
+            (path, encodings, force)
+            for directory in self.args
+            for path in self.find_files(directory)
+            ]
+
+        jobs = self.options.jobs or multiprocessing.cpu_count()
+        if jobs > 1 and len(tasks) > 1:
+            pool = multiprocessing.Pool(min(jobs, len(tasks)))
+            try:
+                results = pool.map(compress_file, tasks, chunksize=4)
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            results = [compress_file(task) for task in tasks]
+
+        written = original_total = compressed_total = 0
+        for result in results:
+            for sidecar_path, original_size, compressed_size in result:
+                if sidecar_path is None:
+                    continue
+                written += 1
+                original_total += original_size
+                compressed_total += compressed_size
+                self.out('%s (%d -> %d bytes)' % (
+                    sidecar_path, original_size, compressed_size))
+        self.out('Wrote %d precompressed files (%d -> %d bytes)' % (
+            written, original_total, compressed_total))
+        return 0
+
+if __name__ == '__main__': # pragma: no cover
+    sys.exit(main() or 0)
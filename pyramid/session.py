@@ -1,9 +1,14 @@
 import base64
 import binascii
+from collections import OrderedDict
 import hashlib
 import hmac
 import os
+import re
+import struct
+import threading
 import time
+import zlib
 
 from zope.deprecation import deprecated
 from zope.interface import implementer
@@ -274,6 +279,71 @@ class PickleSerializer(object):
         """Accept a Python object and return bytes."""
         return pickle.dumps(appstruct, self.protocol)
 
+class CompressedSerializer(object):
+    """ A serializer which wraps another serializer and compresses its
+    output with :mod:`zlib` when it is larger than ``threshold`` bytes.
+    Small payloads are stored uncompressed as compression would only make
+    them larger.  A single leading byte records which form was used.
+
+    ``serializer`` is the wrapped serializer; it defaults to a
+    :class:`pyramid.session.PickleSerializer`, which produces a compact
+    binary encoding.  ``level`` is the :mod:`zlib` compression level.
+
+    Combined with :func:`pyramid.session.SignedCookieSessionFactory`
+    (see its ``compress`` argument) this allows considerably more session
+    data to fit within the size limit of a cookie and reduces the bandwidth
+    used by the cookie on every request.
+
+    .. versionadded:: 1.8
+    """
+    _raw = b'\x00'
+    _compressed = b'\x01'
+
+    def __init__(self, serializer=None, threshold=128, level=6):
+        if serializer is None:
+            serializer = PickleSerializer()
+        self.serializer = serializer
+        self.threshold = threshold
+        self.level = level
+
+    def loads(self, bstruct):
+        """Accept bytes and return a Python object."""
+        flag, payload = bstruct[:1], bstruct[1:]
+        if flag == self._compressed:
+            try:
+                payload = zlib.decompress(payload)
+            except zlib.error as e:
+                raise ValueError('Badly formed compressed data: %s' % e)
+        elif flag != self._raw:
+            raise ValueError('Unknown serialization format')
+        return self.serializer.loads(payload)
+
+    def dumps(self, appstruct):
+        """Accept a Python object and return bytes."""
+        payload = self.serializer.dumps(appstruct)
+        if len(payload) > self.threshold:
+            compressed = zlib.compress(payload, self.level)
+            if len(compressed) < len(payload):
+                return self._compressed + compressed
+        return self._raw + payload
+
+class _HMACSignedSerializer(SignedSerializer):
+    """ A :class:`webob.cookies.SignedSerializer` which signs with the
+    :mod:`hashlib` constructor for ``hashalg`` rather than with a lambda
+    wrapping :func:`hashlib.new`, which lets :func:`hmac.new` use the
+    OpenSSL HMAC implementation instead of keying a pure Python one for
+    each cookie.  Everything else, and so the signatures it produces, is
+    left to its base class."""
+    def __init__(self, secret, salt, hashalg='sha512', serializer=None):
+        SignedSerializer.__init__(
+            self, secret, salt, hashalg=hashalg, serializer=serializer)
+        digestmod = getattr(hashlib, hashalg, None)
+        if digestmod is not None:
+            self.digestmod = digestmod
+
+def _state_digest(cookieval):
+    return hashlib.sha1(bytes_(cookieval)).digest()
+
 def BaseCookieSessionFactory(
     serializer,
     cookie_name='session',
@@ -285,6 +355,7 @@ def BaseCookieSessionFactory(
     timeout=1200,
     reissue_time=0,
     set_on_exception=True,
+    skip_unchanged=False,
     ):
     """
     .. versionadded:: 1.5
@@ -362,6 +433,26 @@ def BaseCookieSessionFactory(
       If ``True``, set a session cookie even if an exception occurs
       while rendering a view. Default: ``True``.
 
+    ``skip_unchanged``
+      If ``True``, a digest of the session cookie received with the request
+      is compared with the session's state when the response is generated.
+      The cookie is only sent again if the session's contents changed or
+      ``reissue_time`` has passed since the cookie was last issued, even if
+      the session was marked as changed.  This avoids needlessly sending
+      ``Set-Cookie`` headers, which also makes responses easier to cache.
+      The number of writes skipped is available as the session's
+      ``skipped_writes`` attribute.  As a reissue is due on nearly every
+      request when ``reissue_time`` is ``0``, a larger ``reissue_time``
+      should be used to get the most out of this option.  A cookie which
+      is sent again before a reissue is due keeps the timestamps it was
+      received with, so that ``timeout`` counts from the last reissue
+      rather than from the last change.  If ``reissue_time`` is ``None``
+      and ``timeout`` is not, every write is a reissue and no write is
+      skipped.
+      Default: ``False``.
+
+      .. versionadded:: 1.8
+
     .. versionadded: 1.5a3
     """
 
@@ -379,10 +470,18 @@ def BaseCookieSessionFactory(
         _cookie_on_exception = set_on_exception
         _timeout = timeout if timeout is None else int(timeout)
         _reissue_time = reissue_time if reissue_time is None else int(reissue_time)
+        _skip_unchanged = skip_unchanged
 
         # dirty flag
         _dirty = False
 
+        # digest and timestamps of the cookie received with the request
+        _cookie_digest = None
+        _cookie_times = None
+
+        # number of cookie writes avoided by ``skip_unchanged``
+        skipped_writes = 0
+
         def __init__(self, request):
             self.request = request
             now = time.time()
@@ -407,6 +506,9 @@ def BaseCookieSessionFactory(
                     created = float(cval)
                     state = sval
                     new = False
+                    if self._skip_unchanged:
+                        self._cookie_digest = _state_digest(cookieval)
+                        self._cookie_times = (rval, cval)
                 except (TypeError, ValueError):
                     # value failed to unpack properly or renewed was not
                     # a numeric type so we'll fail deserialization here
@@ -417,6 +519,7 @@ def BaseCookieSessionFactory(
                     # expire the session because it was not renewed
                     # before the timeout threshold
                     state = {}
+                    self._cookie_digest = self._cookie_times = None
 
             self.created = created
             self.accessed = renewed
@@ -493,14 +596,32 @@ def BaseCookieSessionFactory(
             return token
 
         # non-API methods
+        def _reissue_due(self):
+            reissue_time = self._reissue_time
+            if reissue_time is None:
+                # only a write renews the cookie, which keeps it from
+                # timing out
+                return self._timeout is not None
+            return self.accessed - self.renewed > reissue_time
+
         def _set_cookie(self, response):
             if not self._cookie_on_exception:
                 exception = getattr(self.request, 'exception', None)
                 if exception is not None: # dont set a cookie during exceptions
                     return False
-            cookieval = native_(serializer.dumps(
-                (self.accessed, self.created, dict(self))
-                ))
+            times = (self.accessed, self.created)
+            if self._cookie_times is not None and not self._reissue_due():
+                # keep the timestamps of the cookie received with the
+                # request, so that an unchanged session serializes to the
+                # very same cookie
+                times = self._cookie_times
+            cookieval = native_(serializer.dumps(times + (dict(self),)))
+            if (
+                self._cookie_digest is not None and
+                _state_digest(cookieval) == self._cookie_digest
+            ):
+                self.skipped_writes += 1
+                return False
             if len(cookieval) > 4064:
                 raise ValueError(
                     'Cookie value is too long to store (%s bytes)' %
@@ -644,6 +765,8 @@ def SignedCookieSessionFactory(
     hashalg='sha512',
     salt='pyramid.session.',
     serializer=None,
+    compress=False,
+    skip_unchanged=False,
     ):
     """
     .. versionadded:: 1.5
@@ -735,12 +858,32 @@ def SignedCookieSessionFactory(
       should be raised for malformed inputs.  If a serializer is not passed,
       the :class:`pyramid.session.PickleSerializer` serializer will be used.
 
+    ``compress``
+      If ``True``, wrap the serializer in a
+      :class:`pyramid.session.CompressedSerializer` so that larger sessions
+      are compressed before being signed.  Cookies written with and without
+      compression are not compatible with each other, so changing this
+      setting will discard existing sessions.  Default: ``False``.
+
+      .. versionadded:: 1.8
+
+    ``skip_unchanged``
+      If ``True``, the session cookie is only sent again if the session's
+      contents changed or ``reissue_time`` has passed since it was last
+      issued.  See :func:`pyramid.session.BaseCookieSessionFactory` for
+      details.  Default: ``False``.
+
+      .. versionadded:: 1.8
+
     .. versionadded: 1.5a3
     """
     if serializer is None:
         serializer = PickleSerializer()
 
-    signed_serializer = SignedSerializer(
+    if compress:
+        serializer = CompressedSerializer(serializer)
+
+    signed_serializer = _HMACSignedSerializer(
         secret,
         salt,
         hashalg,
@@ -758,4 +901,490 @@ def SignedCookieSessionFactory(
         timeout=timeout,
         reissue_time=reissue_time,
         set_on_exception=set_on_exception,
+        skip_unchanged=skip_unchanged,
     )
+
+def manage_loaded(wrapped):
+    """ Decorator which causes the state of a server-side session to be
+    loaded from storage before the wrapped method is called."""
+    def loaded(session, *arg, **kw):
+        if not session._loaded:
+            session._load()
+        return wrapped(session, *arg, **kw)
+    loaded.__doc__ = wrapped.__doc__
+    return loaded
+
+_session_id_re = re.compile(r'^[0-9a-f]{64}$')
+
+def ServerSideSessionFactory(
+    storage,
+    cookie_name='session',
+    max_age=None,
+    path='/',
+    domain=None,
+    secure=False,
+    httponly=False,
+    set_on_exception=True,
+    timeout=1200,
+    reissue_time=120,
+    serializer=None,
+    ):
+    """
+    .. versionadded:: 1.8
+
+    Configure a :term:`session factory` which will provide sessions whose
+    data is kept on the server.  The session cookie contains only a random
+    256-bit session id, so sessions are not limited in size and their data
+    is never sent to the client.
+
+    Session data is loaded from ``storage`` the first time the session is
+    used during a request rather than when it is created, so requests that
+    never touch the session never hit the storage.  Data is written back
+    only if the session was modified or ``reissue_time`` has passed since
+    it was last written, and the cookie is only sent when a new session id
+    has been issued or when ``max_age`` requires it to be refreshed.
+
+    The return value of this function is a :term:`session factory`, which
+    may be provided as the ``session_factory`` argument of a
+    :class:`pyramid.config.Configurator` constructor, or used as the
+    ``session_factory`` argument of the
+    :meth:`pyramid.config.Configurator.set_session_factory` method.
+
+    Parameters:
+
+    ``storage``
+      An object with three methods.  ``load(session_id)`` returns the bytes
+      stored for ``session_id`` or ``None`` if there are none or they have
+      expired.  ``save(session_id, bstruct, timeout)`` stores the bytes
+      ``bstruct`` for ``session_id``; if ``timeout`` is not ``None`` the data
+      may be discarded once ``timeout`` seconds have passed.
+      ``delete(session_id)`` discards any data stored for ``session_id``.
+      :class:`pyramid.session.MemorySessionStorage`,
+      :class:`pyramid.session.DBMSessionStorage` and
+      :class:`pyramid.session.SQLiteSessionStorage` are provided.
+
+    ``cookie_name``
+      The name of the cookie used for sessioning. Default: ``'session'``.
+
+    ``max_age``
+      The maximum age of the cookie used for sessioning (in seconds).
+      Default: ``None`` (browser scope).
+
+    ``path``
+      The path used for the session cookie. Default: ``'/'``.
+
+    ``domain``
+      The domain used for the session cookie.  Default: ``None`` (no domain).
+
+    ``secure``
+      The 'secure' flag of the session cookie. Default: ``False``.
+
+    ``httponly``
+      Hide the cookie from Javascript by setting the 'HttpOnly' flag of the
+      session cookie. Default: ``False``.
+
+    ``set_on_exception``
+      If ``True``, save the session and set a session cookie even if an
+      exception occurs while rendering a view. Default: ``True``.
+
+    ``timeout``
+      A number of seconds of inactivity before a session times out. If
+      ``None`` then the session never expires. Default: ``1200``.
+
+    ``reissue_time``
+      The number of seconds that must pass before an unmodified session is
+      written back to storage as the result of a request which accesses it,
+      extending its lifetime.  If this value is ``0``, the session will be
+      written on every request accessing it.  If ``None`` then the session's
+      lifetime will never be extended.  Default: ``120``.
+
+    ``serializer``
+      An object with two methods: ``loads`` and ``dumps``.  The ``loads``
+      method should accept bytes and return a Python object.  The ``dumps``
+      method should accept a Python object and return bytes.  A ``ValueError``
+      should be raised for malformed inputs.  If a serializer is not passed,
+      the :class:`pyramid.session.PickleSerializer` serializer will be used.
+    """
+    if serializer is None:
+        serializer = PickleSerializer()
+
+    @implementer(ISession)
+    class ServerSideSession(dict):
+        """ Dictionary-like session object backed by server-side storage """
+
+        # configuration parameters
+        _cookie_name = cookie_name
+        _cookie_max_age = max_age if max_age is None else int(max_age)
+        _cookie_path = path
+        _cookie_domain = domain
+        _cookie_secure = secure
+        _cookie_httponly = httponly
+        _cookie_on_exception = set_on_exception
+        _timeout = timeout if timeout is None else int(timeout)
+        _reissue_time = reissue_time if reissue_time is None else int(reissue_time)
+        _storage = storage
+
+        # dirty flag
+        _dirty = False
+
+        # lazy loading state
+        _loaded = False
+        _new = True
+        _created = None
+        _renewed = None
+
+        def __init__(self, request):
+            self.request = request
+            session_id = request.cookies.get(self._cookie_name)
+            if session_id is not None:
+                if not _session_id_re.match(session_id):
+                    session_id = None
+            self.session_id = session_id
+            self.accessed = None
+            dict.__init__(self)
+
+        def _load(self):
+            self._loaded = True
+            now = time.time()
+            self._created = self._renewed = now
+            self._new = True
+            if self.accessed is None:
+                self.accessed = now
+            session_id = self.session_id
+            if session_id is None:
+                return
+            bstruct = self._storage.load(session_id)
+            value = None
+            if bstruct is not None:
+                try:
+                    value = serializer.loads(bstruct)
+                except ValueError:
+                    value = None
+            if value is not None:
+                try:
+                    rval, cval, sval = value
+                    renewed = float(rval)
+                    created = float(cval)
+                except (TypeError, ValueError):
+                    value = None
+            if value is not None and self._timeout is not None:
+                if now - renewed > self._timeout:
+                    value = None
+            if value is None:
+                # never reuse an id we did not find, to avoid fixation
+                self.session_id = None
+                return
+            self._created = created
+            self._renewed = renewed
+            self._new = False
+            if self.accessed is None:
+                self.accessed = renewed
+            dict.update(self, sval)
+
+        @property
+        def new(self):
+            if not self._loaded:
+                self._load()
+            return self._new
+
+        @property
+        def created(self):
+            if not self._loaded:
+                self._load()
+            return self._created
+
+        @property
+        def renewed(self):
+            if not self._loaded:
+                self._load()
+            return self._renewed
+
+        # ISession methods
+        def changed(self):
+            if not self._dirty:
+                self._dirty = True
+                def save_session_callback(request, response):
+                    self._save(response)
+                    self.request = None # explicitly break cycle for gc
+                self.request.add_response_callback(save_session_callback)
+
+        def invalidate(self):
+            if not self._loaded:
+                self._load()
+            if self.session_id is not None:
+                self._storage.delete(self.session_id)
+                self.session_id = None
+            self._new = True
+            self._created = self._renewed = time.time()
+            self.clear()
+
+        # non-modifying dictionary methods
+        get = manage_accessed(manage_loaded(dict.get))
+        __getitem__ = manage_accessed(manage_loaded(dict.__getitem__))
+        items = manage_accessed(manage_loaded(dict.items))
+        values = manage_accessed(manage_loaded(dict.values))
+        keys = manage_accessed(manage_loaded(dict.keys))
+        __contains__ = manage_accessed(manage_loaded(dict.__contains__))
+        __len__ = manage_accessed(manage_loaded(dict.__len__))
+        __iter__ = manage_accessed(manage_loaded(dict.__iter__))
+        copy = manage_accessed(manage_loaded(dict.copy))
+        __eq__ = manage_loaded(dict.__eq__)
+        __ne__ = manage_loaded(dict.__ne__)
+        __repr__ = manage_loaded(dict.__repr__)
+
+        if PY2:
+            iteritems = manage_accessed(manage_loaded(dict.iteritems))
+            itervalues = manage_accessed(manage_loaded(dict.itervalues))
+            iterkeys = manage_accessed(manage_loaded(dict.iterkeys))
+            has_key = manage_accessed(manage_loaded(dict.has_key))
+
+        # modifying dictionary methods
+        clear = manage_changed(manage_loaded(dict.clear))
+        update = manage_changed(manage_loaded(dict.update))
+        setdefault = manage_changed(manage_loaded(dict.setdefault))
+        pop = manage_changed(manage_loaded(dict.pop))
+        popitem = manage_changed(manage_loaded(dict.popitem))
+        __setitem__ = manage_changed(manage_loaded(dict.__setitem__))
+        __delitem__ = manage_changed(manage_loaded(dict.__delitem__))
+
+        # flash API methods
+        @manage_changed
+        def flash(self, msg, queue='', allow_duplicate=True):
+            storage = self.setdefault('_f_' + queue, [])
+            if allow_duplicate or (msg not in storage):
+                storage.append(msg)
+
+        @manage_changed
+        def pop_flash(self, queue=''):
+            storage = self.pop('_f_' + queue, [])
+            return storage
+
+        @manage_accessed
+        def peek_flash(self, queue=''):
+            storage = self.get('_f_' + queue, [])
+            return storage
+
+        # CSRF API methods
+        @manage_changed
+        def new_csrf_token(self):
+            token = text_(binascii.hexlify(os.urandom(20)))
+            self['_csrft_'] = token
+            return token
+
+        @manage_accessed
+        def get_csrf_token(self):
+            token = self.get('_csrft_', None)
+            if token is None:
+                token = self.new_csrf_token()
+            return token
+
+        # non-API methods
+        def _save(self, response):
+            if not self._cookie_on_exception:
+                exception = getattr(self.request, 'exception', None)
+                if exception is not None: # dont save during exceptions
+                    return False
+            if not self._loaded:
+                self._load()
+            session_id = self.session_id
+            if session_id is None:
+                if not dict.__len__(self):
+                    # nothing worth storing; drop any stale cookie
+                    if self._cookie_name in self.request.cookies:
+                        response.delete_cookie(
+                            self._cookie_name,
+                            path=self._cookie_path,
+                            domain=self._cookie_domain,
+                            )
+                    return False
+                session_id = self.session_id = text_(
+                    binascii.hexlify(os.urandom(32)))
+                set_cookie = True
+            else:
+                set_cookie = self._cookie_max_age is not None
+            bstruct = serializer.dumps((self.accessed, self.created, dict(self)))
+            self._storage.save(session_id, bstruct, self._timeout)
+            if set_cookie:
+                response.set_cookie(
+                    self._cookie_name,
+                    value=session_id,
+                    max_age=self._cookie_max_age,
+                    path=self._cookie_path,
+                    domain=self._cookie_domain,
+                    secure=self._cookie_secure,
+                    httponly=self._cookie_httponly,
+                    )
+            return True
+
+    return ServerSideSession
+
+class MemorySessionStorage(object):
+    """ A storage for :func:`pyramid.session.ServerSideSessionFactory` which
+    keeps session data in a dictionary in the current process.
+
+    At most ``max_size`` sessions are kept; when this is exceeded the least
+    recently used session is discarded.  Data is lost when the process
+    exits and is not shared between processes, so this storage is mainly
+    useful for development, testing and single-process deployments.
+
+    .. versionadded:: 1.8
+    """
+    def __init__(self, max_size=10000):
+        self.max_size = max_size
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def load(self, session_id):
+        with self._lock:
+            entry = self._data.pop(session_id, None)
+            if entry is None:
+                return None
+            expires, bstruct = entry
+            if expires is not None and expires < time.time():
+                return None
+            self._data[session_id] = entry
+            return bstruct
+
+    def save(self, session_id, bstruct, timeout):
+        expires = None if timeout is None else time.time() + timeout
+        with self._lock:
+            self._data.pop(session_id, None)
+            self._data[session_id] = (expires, bstruct)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def delete(self, session_id):
+        with self._lock:
+            self._data.pop(session_id, None)
+
+def _pack_expires(bstruct, timeout):
+    expires = 0 if timeout is None else int(time.time() + timeout)
+    return struct.pack('!Q', expires) + bstruct
+
+def _unpack_expires(packed):
+    if packed is None or len(packed) < 8:
+        return None
+    expires, = struct.unpack('!Q', packed[:8])
+    if expires and expires < time.time():
+        return None
+    return packed[8:]
+
+class DBMSessionStorage(object):
+    """ A storage for :func:`pyramid.session.ServerSideSessionFactory` which
+    keeps session data in a :mod:`dbm` database file at ``filename``.  The
+    database is shared by every thread using this storage; processes should
+    not share the same file unless the underlying dbm implementation
+    supports it.
+
+    Expired sessions are ignored when loaded but remain in the file until
+    :meth:`purge` is called.
+
+    .. versionadded:: 1.8
+    """
+    def __init__(self, filename):
+        # imported here so that pyramid.session works without dbm support
+        if PY2: # pragma: no cover
+            import anydbm as dbm
+        else:
+            import dbm
+        self.filename = filename
+        self._db = dbm.open(filename, 'c')
+        self._lock = threading.Lock()
+
+    def load(self, session_id):
+        key = bytes_(session_id)
+        with self._lock:
+            try:
+                packed = self._db[key]
+            except KeyError:
+                return None
+        return _unpack_expires(packed)
+
+    def save(self, session_id, bstruct, timeout):
+        packed = _pack_expires(bstruct, timeout)
+        with self._lock:
+            self._db[bytes_(session_id)] = packed
+
+    def delete(self, session_id):
+        with self._lock:
+            try:
+                del self._db[bytes_(session_id)]
+            except KeyError:
+                pass
+
+    def purge(self):
+        """ Remove every expired session from the database."""
+        with self._lock:
+            for key in list(self._db.keys()):
+                if _unpack_expires(self._db[key]) is None:
+                    del self._db[key]
+
+    def close(self):
+        """ Close the database file."""
+        with self._lock:
+            self._db.close()
+
+class SQLiteSessionStorage(object):
+    """ A storage for :func:`pyramid.session.ServerSideSessionFactory` which
+    keeps session data in the table ``table`` of the SQLite database at
+    ``filename``.  The table is created if it does not exist.  The database
+    may be shared by several processes.
+
+    Expired sessions are ignored when loaded but remain in the table until
+    :meth:`purge` is called.
+
+    .. versionadded:: 1.8
+    """
+    def __init__(self, filename, table='pyramid_sessions'):
+        if not re.match(r'^[A-Za-z_][A-Za-z0-9_]*$', table):
+            raise ValueError('Invalid table name %r' % (table,))
+        # imported here so that pyramid.session works without sqlite3
+        import sqlite3
+        self.filename = filename
+        self.table = table
+        self._binary = sqlite3.Binary
+        self._conn = sqlite3.connect(filename, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS %s ('
+                'id TEXT PRIMARY KEY, expires REAL, data BLOB)' % table)
+            self._conn.commit()
+
+    def load(self, session_id):
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT data FROM %s WHERE id = ? AND '
+                '(expires IS NULL OR expires >= ?)' % self.table,
+                (session_id, time.time())).fetchone()
+        if row is None:
+            return None
+        return bytes(row[0])
+
+    def save(self, session_id, bstruct, timeout):
+        expires = None if timeout is None else time.time() + timeout
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO %s (id, expires, data) '
+                'VALUES (?, ?, ?)' % self.table,
+                (session_id, expires, self._binary(bstruct)))
+            self._conn.commit()
+
+    def delete(self, session_id):
+        with self._lock:
+            self._conn.execute(
+                'DELETE FROM %s WHERE id = ?' % self.table, (session_id,))
+            self._conn.commit()
+
+    def purge(self):
+        """ Remove every expired session from the table."""
+        with self._lock:
+            self._conn.execute(
+                'DELETE FROM %s WHERE expires < ?' % self.table,
+                (time.time(),))
+            self._conn.commit()
+
+    def close(self):
+        """ Close the database connection."""
+        with self._lock:
+            self._conn.close()
@@ -1,6 +1,13 @@
 # -*- coding: utf-8 -*-
+import hashlib
 import json
+import logging
 import os
+import stat
+import threading
+import time
+
+from multiprocessing.pool import ThreadPool
 
 from os.path import (
     getmtime,
@@ -17,7 +24,10 @@ from pkg_resources import (
     resource_isdir,
     )
 
-from repoze.lru import lru_cache
+from repoze.lru import (
+    LRUCache,
+    lru_cache,
+    )
 
 from pyramid.asset import (
     abspath_from_asset_spec,
@@ -34,14 +44,19 @@ from pyramid.httpexceptions import (
 from pyramid.path import caller_package
 
 from pyramid.response import (
+    _content_hash,
+    _reserve_content_hashes,
     _guess_type,
     FileResponse,
+    Response,
 )
 
 from pyramid.traversal import traversal_path_info
 
 slash = text_('/')
 
+logger = logging.getLogger(__name__)
+
 class static_view(object):
     """ An instance of this class is a callable which can act as a
     :app:`Pyramid` :term:`view callable`; this view will serve
@@ -77,6 +92,42 @@ class static_view(object):
     the static application will consider request.environ[``PATH_INFO``] as
     ``PATH_INFO`` input. By default, this is ``False``.
 
+    ``cache_files`` enables an in-memory cache of the files served.  When it
+    is ``True``, the location, content type, size, modification time and
+    ``ETag`` of each file are remembered so that later requests for the same
+    path do not need to resolve and inspect the file again, and files no
+    larger than ``cache_max_file_size`` bytes (default 64KB) are kept in
+    memory entirely.  At most ``cache_max_files`` files (default 1000) are
+    remembered.  A cached file is checked for changes at most once every
+    ``stat_interval`` seconds (default 1); use ``None`` to never check, e.g.
+    for immutable deployments.  By default, this is ``False``.
+
+    ``precompressed`` enables serving precompressed variants of files.
+    When it is ``True``, a request for ``foo.js`` whose ``Accept-Encoding``
+    header allows it is answered with the contents of a ``foo.js.br``
+    (``br`` encoding) or ``foo.js.gz`` (``gzip`` encoding) file found next
+    to ``foo.js``, along with the matching ``Content-Encoding`` header.  A
+    sequence of encoding names (e.g. ``('gzip',)``) may be passed instead to
+    limit the variants looked for, in order of preference.  Responses for
+    files which have such variants carry a ``Vary: Accept-Encoding`` header.
+    Which variants exist is remembered per file, so variants added after a
+    file was first served are not noticed until the file itself changes
+    (when ``cache_files`` is used) or the process is restarted.  The
+    variants may be created with the ``pprecompress`` command.  By default,
+    this is ``False``.
+
+    ``content_etag`` makes the view send a strong ``ETag`` header computed
+    from a hash of the content of each file, instead of relying on its
+    modification time only.  Hashes are computed once per file and
+    modification time for the whole process (see
+    :class:`pyramid.response.FileResponse`), and may be computed ahead of
+    time with :meth:`precompute_etags`.  By default, this is ``False``.
+
+    .. versionchanged:: 1.8
+       Added the ``cache_files``, ``cache_max_files``,
+       ``cache_max_file_size``, ``stat_interval``, ``precompressed`` and
+       ``content_etag`` arguments.
+
     .. note::
 
        If the ``root_dir`` is relative to a :term:`package`, or is a
@@ -88,7 +139,9 @@ class static_view(object):
     """
 
     def __init__(self, root_dir, cache_max_age=3600, package_name=None,
-                 use_subpath=False, index='index.html'):
+                 use_subpath=False, index='index.html', cache_files=False,
+                 cache_max_files=1000, cache_max_file_size=65536,
+                 stat_interval=1, precompressed=False, content_etag=False):
         # package_name is for bw compat; it is preferred to pass in a
         # package-relative path as root_dir
         # (e.g. ``anotherpackage:foo/static``).
@@ -101,6 +154,22 @@ class static_view(object):
         self.docroot = docroot
         self.norm_docroot = normcase(normpath(docroot))
         self.index = index
+        self.file_cache = None
+        if cache_files:
+            self.file_cache = LRUCache(cache_max_files)
+        self.cache_max_file_size = cache_max_file_size
+        self.stat_interval = stat_interval
+        if precompressed is True:
+            precompressed = tuple(x[0] for x in _precompressed_suffixes)
+        self.precompressed = tuple(precompressed or ())
+        for encoding in self.precompressed:
+            if encoding not in dict(_precompressed_suffixes):
+                raise ValueError(
+                    'Unknown precompressed encoding %r' % (encoding,))
+        self.sidecar_cache = None
+        if self.precompressed and not cache_files:
+            self.sidecar_cache = LRUCache(cache_max_files)
+        self.content_etag = content_etag
 
     def __call__(self, context, request):
         if self.use_subpath:
@@ -112,34 +181,166 @@ class static_view(object):
         if path is None:
             raise HTTPNotFound('Out of bounds: %s' % request.url)
 
+        if self.file_cache is not None:
+            return self._cached_response(path, request)
+
+        filepath, is_dir = self._resolve(path)
+        if is_dir and not request.path_url.endswith('/'):
+            self.add_slash_redirect(request)
+        if filepath is None:
+            raise HTTPNotFound(request.url)
+
+        content_type, _ = _guess_type(filepath)
+        if self.precompressed:
+            sidecars = self.sidecar_cache.get(filepath)
+            if sidecars is None:
+                sidecars = self._find_sidecars(filepath)
+                self.sidecar_cache.put(filepath, sidecars)
+            if sidecars:
+                response = None
+                sidecar = _select_sidecar(request, sidecars)
+                if sidecar is not None:
+                    content_encoding, sidecar_path = sidecar
+                    try:
+                        response = FileResponse(
+                            sidecar_path, request, self.cache_max_age,
+                            content_type, content_encoding=content_encoding,
+                            content_etag=self.content_etag)
+                    except (IOError, OSError):
+                        # the variant has gone away since it was found;
+                        # look for variants afresh next time
+                        self.sidecar_cache.invalidate(filepath)
+                if response is None:
+                    # the encoding guessed from e.g. "foo.tar.gz" describes
+                    # the file itself, not a transfer encoding
+                    response = FileResponse(
+                        filepath, request, self.cache_max_age,
+                        content_type, content_encoding=None,
+                        content_etag=self.content_etag)
+                response.vary = ('Accept-Encoding',)
+                return response
+        return FileResponse(
+            filepath, request, self.cache_max_age,
+            content_type, content_encoding=None,
+            content_etag=self.content_etag)
+
+    def precompute_etags(self, threads=4):
+        """ Compute the content hash used as the ``ETag`` of every file in
+        the directory served by this view (see the ``content_etag``
+        argument), using a pool of ``threads`` threads, so that the first
+        requests for each file do not have to.  Return the number of files
+        hashed.  The process-wide cache of content hashes is enlarged if
+        it cannot hold all of them.
+
+        .. versionadded:: 1.8
+        """
+        if self.package_name:
+            root = resource_filename(self.package_name, self.docroot)
+        else:
+            root = self.norm_docroot
+        paths = [
+            join(dirpath, filename)
+            for dirpath, dirnames, filenames in os.walk(root)
+            for filename in filenames
+            ]
+        _reserve_content_hashes(paths)
+        pool = ThreadPool(threads)
+        try:
+            pool.map(_content_hash, paths)
+        finally:
+            pool.close()
+            pool.join()
+        return len(paths)
+
+    def _find_sidecars(self, filepath):
+        """ Return a tuple of ``(encoding, sidecar_path)`` pairs for the
+        precompressed variants of ``filepath`` which exist on disk."""
+        suffixes = dict(_precompressed_suffixes)
+        sidecars = []
+        for encoding in self.precompressed:
+            sidecar_path = filepath + suffixes[encoding]
+            if exists(sidecar_path):
+                sidecars.append((encoding, sidecar_path))
+        return tuple(sidecars)
+
+    def _resolve(self, path):
+        """ Return ``(filepath, is_dir)`` for the secured ``path``, where
+        ``filepath`` is ``None`` if there is no file to serve and ``is_dir``
+        indicates that ``path`` named a directory and ``filepath`` is its
+        index file."""
         if self.package_name: # package resource
             resource_path = '%s/%s' % (self.docroot.rstrip('/'), path)
-            if resource_isdir(self.package_name, resource_path):
-                if not request.path_url.endswith('/'):
-                    self.add_slash_redirect(request)
+            is_dir = resource_isdir(self.package_name, resource_path)
+            if is_dir:
                 resource_path = '%s/%s' % (
                     resource_path.rstrip('/'), self.index
                 )
 
             if not resource_exists(self.package_name, resource_path):
-                raise HTTPNotFound(request.url)
+                return None, is_dir
             filepath = resource_filename(self.package_name, resource_path)
 
         else: # filesystem file
 
             # os.path.normpath converts / to \ on windows
             filepath = normcase(normpath(join(self.norm_docroot, path)))
-            if isdir(filepath):
-                if not request.path_url.endswith('/'):
-                    self.add_slash_redirect(request)
+            is_dir = isdir(filepath)
+            if is_dir:
                 filepath = join(filepath, self.index)
             if not exists(filepath):
+                return None, is_dir
+
+        return filepath, is_dir
+
+    def _cached_response(self, path, request):
+        cache = self.file_cache
+        now = time.time()
+        entry = cache.get(path)
+        if entry is not None:
+            stat_interval = self.stat_interval
+            if (
+                stat_interval is not None and
+                now - entry.checked > stat_interval and
+                not entry.revalidate(now)
+            ):
+                cache.invalidate(path)
+                entry = None
+        if entry is None:
+            filepath, is_dir = self._resolve(path)
+            if is_dir and not request.path_url.endswith('/'):
+                self.add_slash_redirect(request)
+            if filepath is None:
                 raise HTTPNotFound(request.url)
-
-        content_type, content_encoding = _guess_type(filepath)
-        return FileResponse(
-            filepath, request, self.cache_max_age,
-            content_type, content_encoding=None)
+            entry = _CachedFile(
+                filepath, is_dir, self.cache_max_file_size, now,
+                content_etag=self.content_etag)
+            if self.precompressed:
+                entry.sidecars = tuple(
+                    (encoding, _CachedFile(
+                        sidecar_path, is_dir, self.cache_max_file_size, now,
+                        content_type=entry.content_type,
+                        content_encoding=encoding,
+                        content_etag=self.content_etag))
+                    for encoding, sidecar_path
+                    in self._find_sidecars(filepath)
+                )
+            cache.put(path, entry)
+        elif entry.is_dir and not request.path_url.endswith('/'):
+            self.add_slash_redirect(request)
+        if entry.sidecars:
+            response = None
+            sidecar = _select_sidecar(request, entry.sidecars)
+            if sidecar is not None:
+                try:
+                    response = sidecar[1].response(
+                        request, self.cache_max_age)
+                except (IOError, OSError):
+                    cache.invalidate(path)
+            if response is None:
+                response = entry.response(request, self.cache_max_age)
+            response.vary = ('Accept-Encoding',)
+            return response
+        return entry.response(request, self.cache_max_age)
 
     def add_slash_redirect(self, request):
         url = request.path_url + '/'
@@ -148,6 +349,114 @@ class static_view(object):
             url = url + '?' + qs
         raise HTTPMovedPermanently(url)
 
+class _CachedFile(object):
+    """ What :class:`static_view` remembers about a file it has served."""
+    sidecars = ()
+
+    def __init__(self, filepath, is_dir, max_file_size, now,
+                 content_type=None, content_encoding=None,
+                 content_etag=False):
+        self.filepath = filepath
+        self.is_dir = is_dir
+        if content_type is None:
+            content_type = _guess_type(filepath)[0]
+        self.content_type = content_type
+        self.content_encoding = content_encoding
+        with open(filepath, 'rb') as f:
+            st = os.fstat(f.fileno())
+            self.size = st.st_size
+            self.mtime = st.st_mtime
+            self.body = None
+            if self.size <= max_file_size:
+                self.body = f.read()
+                self.size = len(self.body)
+        self.content_etag = content_etag
+        if not content_etag:
+            self.etag = '%x-%x' % (int(self.mtime * 1000000), self.size)
+        elif self.body is not None:
+            self.etag = hashlib.sha1(self.body).hexdigest()
+        else:
+            self.etag = _content_hash(filepath, st)
+        self.checked = now
+
+    def revalidate(self, now):
+        """ Return ``True`` if the file is unchanged since it was cached."""
+        try:
+            st = os.stat(self.filepath)
+        except OSError:
+            return False
+        if st.st_mtime != self.mtime or st.st_size != self.size:
+            return False
+        for encoding, sidecar in self.sidecars:
+            if not sidecar.revalidate(now):
+                return False
+        self.checked = now
+        return True
+
+    def response(self, request, cache_max_age):
+        if self.body is not None:
+            response = Response(
+                body=self.body,
+                conditional_response=True,
+                content_type=self.content_type,
+                content_encoding=self.content_encoding,
+            )
+        else:
+            response = FileResponse(
+                self.filepath, request, None,
+                self.content_type, self.content_encoding,
+                content_etag=self.content_etag)
+        response.last_modified = self.mtime
+        response.etag = self.etag
+        if cache_max_age is not None:
+            response.cache_expires = cache_max_age
+        return response
+
+# content-codings static_view can serve precompressed variants of a file
+# with, in default order of preference, and the suffix of each variant
+_precompressed_suffixes = (
+    ('br', '.br'),
+    ('gzip', '.gz'),
+    )
+
+def _parse_accept_encoding(value):
+    """ Return a dict mapping each content-coding in the ``Accept-Encoding``
+    header ``value`` to its quality value."""
+    accepted = {}
+    for item in value.split(','):
+        params = item.split(';')
+        coding = params[0].strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params[1:]:
+            name, _, q = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    quality = float(q)
+                except ValueError:
+                    quality = 0.0
+        accepted[coding] = quality
+    return accepted
+
+def _select_sidecar(request, sidecars):
+    """ Return the item of ``sidecars``, a sequence of ``(encoding, value)``
+    pairs in order of preference, which is most acceptable to ``request``,
+    or ``None`` if the client did not ask for any of the encodings."""
+    header = request.headers.get('Accept-Encoding')
+    if not header:
+        return None
+    accepted = _parse_accept_encoding(header)
+    default = accepted.get('*', 0)
+    best = None
+    best_quality = 0
+    for sidecar in sidecars:
+        quality = accepted.get(sidecar[0], default)
+        if quality > best_quality:
+            best = sidecar
+            best_quality = quality
+    return best
+
 _seps = set(['/', os.sep])
 def _contains_slash(item):
     for sep in _seps:
@@ -186,12 +495,15 @@ class QueryStringCacheBuster(object):
 
     def __call__(self, request, subpath, kw):
         token = self.tokenize(request, subpath, kw)
+        self._add_token(kw, token)
+        return subpath, kw
+
+    def _add_token(self, kw, token):
         query = kw.setdefault('_query', {})
         if isinstance(query, dict):
             query[self.param] = token
         else:
             kw['_query'] = tuple(query) + ((self.param, token),)
-        return subpath, kw
 
 class QueryStringConstantCacheBuster(QueryStringCacheBuster):
     """
@@ -213,6 +525,110 @@ class QueryStringConstantCacheBuster(QueryStringCacheBuster):
     def tokenize(self, request, subpath, kw):
         return self._token
 
+class ContentHashCacheBuster(QueryStringCacheBuster):
+    """
+    An implementation of :class:`~pyramid.interfaces.ICacheBuster` which adds
+    a token derived from a hash of the content of each asset to the query
+    string of its URL, so that the URL of an asset changes exactly when its
+    content does.
+
+    The ``spec`` is an absolute path or an :term:`asset specification`
+    pointing to the directory of assets this cache buster is used for; it
+    is usually the same as the one passed to
+    :meth:`~pyramid.config.Configurator.add_cache_buster`.  When the cache
+    buster is created, every file in the directory is hashed using a pool of
+    ``threads`` threads, and the tokens are kept in memory, so generating a
+    URL does not touch the filesystem.  Assets outside of the directory
+    (e.g. overridden assets) are hashed the first time a URL is generated
+    for them, and then remembered too.  URLs for assets which do not exist
+    are left unchanged.
+
+    The optional ``param`` argument determines the name of the parameter added
+    to the query string and defaults to ``'x'``.
+
+    If ``reload`` is ``True``, the modification time of an asset is checked
+    when generating its URL, at most once every ``check_interval`` seconds
+    (default 1) per asset, and the asset is hashed again if it changed. This
+    is meant for development.
+
+    .. versionadded:: 1.8
+    """
+    token_length = 16
+
+    def __init__(self, spec, param='x', reload=False, check_interval=1,
+                 threads=4):
+        super(ContentHashCacheBuster, self).__init__(param=param)
+        package_name = caller_package().__name__
+        self.root = abspath_from_asset_spec(spec, package_name)
+        pname, subpath = resolve_asset_spec(spec, package_name)
+        if pname is None:
+            # an absolute path; StaticURLInfo joins these with os.sep
+            self.prefix = subpath.rstrip(os.sep) + os.sep
+        else:
+            subpath = subpath.rstrip('/')
+            self.prefix = '%s:%s' % (pname, subpath + '/' if subpath else '')
+        self.reload = reload
+        self.check_interval = check_interval
+        self._tokens = self._build_index(threads)
+
+    def _build_index(self, threads):
+        specs = []
+        paths = []
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            for filename in filenames:
+                path = join(dirpath, filename)
+                relpath = os.path.relpath(path, self.root)
+                specs.append(self.prefix + relpath.replace(os.sep, '/'))
+                paths.append(path)
+        pool = ThreadPool(threads)
+        try:
+            entries = pool.map(self._hash, paths)
+        finally:
+            pool.close()
+            pool.join()
+        return dict(zip(specs, entries))
+
+    def _hash(self, path, now=None):
+        """ Return a ``(token, path, mtime, checked)`` tuple for the file at
+        ``path``, where ``token`` is ``None`` if it is not a file."""
+        if now is None:
+            now = time.time()
+        try:
+            st = os.stat(path)
+        except OSError:
+            return (None, path, None, now)
+        if not stat.S_ISREG(st.st_mode):
+            return (None, path, None, now)
+        token = _content_hash(path, st)[:self.token_length]
+        return (token, path, st.st_mtime, now)
+
+    def tokenize(self, request, subpath, kw):
+        rawspec = kw.get('rawspec', self.prefix + subpath)
+        entry = self._tokens.get(rawspec)
+        if entry is None:
+            entry = self._hash(abspath_from_asset_spec(rawspec))
+            self._tokens[rawspec] = entry
+        elif self.reload:
+            token, path, mtime, checked = entry
+            now = time.time()
+            if now - checked >= self.check_interval:
+                try:
+                    current_mtime = os.stat(path).st_mtime
+                except OSError:
+                    current_mtime = None
+                if current_mtime != mtime:
+                    entry = self._hash(path, now)
+                else:
+                    entry = (token, path, mtime, now)
+                self._tokens[rawspec] = entry
+        return entry[0]
+
+    def __call__(self, request, subpath, kw):
+        token = self.tokenize(request, subpath, kw)
+        if token is not None:
+            self._add_token(kw, token)
+        return subpath, kw
+
 class ManifestCacheBuster(object):
     """
     An implementation of :class:`~pyramid.interfaces.ICacheBuster` which
@@ -248,22 +664,35 @@ class ManifestCacheBuster(object):
 
     If ``reload`` is ``True`` then the manifest file will be reloaded when
     changed. It is not recommended to leave this enabled in production.
+    When reloading, the manifest file is checked for changes at most once
+    every ``check_interval`` seconds (by default on every use).  The
+    manifest is only parsed by one thread at a time when it changed, and
+    other threads keep using the previous one until it is replaced.
 
     If the manifest file cannot be found on disk it will be treated as
-    an empty mapping unless ``reload`` is ``False``.
+    an empty mapping unless ``reload`` is ``False``, and a warning is
+    logged.
 
     .. versionadded:: 1.6
+
+    .. versionchanged:: 1.8
+       Added the ``check_interval`` argument.
     """
     exists = staticmethod(exists) # testing
     getmtime = staticmethod(getmtime) # testing
+    now = staticmethod(time.time) # testing
 
-    def __init__(self, manifest_spec, reload=False):
+    def __init__(self, manifest_spec, reload=False, check_interval=0):
         package_name = caller_package().__name__
         self.manifest_path = abspath_from_asset_spec(
             manifest_spec, package_name)
         self.reload = reload
+        self.check_interval = check_interval
 
-        self._mtime = None
+        # (mtime, manifest, time of the last check), replaced as a whole
+        # so that readers always see a consistent triple
+        self._state = (None, {}, None)
+        self._lock = threading.Lock()
         if not reload:
             self._manifest = self.get_manifest()
 
@@ -286,14 +715,31 @@ class ManifestCacheBuster(object):
     @property
     def manifest(self):
         """ The current manifest dictionary."""
-        if self.reload:
-            if not self.exists(self.manifest_path):
-                return {}
-            mtime = self.getmtime(self.manifest_path)
-            if self._mtime is None or mtime > self._mtime:
-                self._manifest = self.get_manifest()
-                self._mtime = mtime
-        return self._manifest
+        if not self.reload:
+            return self._manifest
+        mtime, manifest, checked = self._state
+        now = self.now()
+        if checked is not None and now - checked < self.check_interval:
+            return manifest
+        if not self.exists(self.manifest_path):
+            if mtime is not None or checked is None:
+                logger.warning(
+                    'Cache busting manifest %s not found; asset URLs will '
+                    'not be cache busted until it exists', self.manifest_path)
+            self._state = (None, {}, now)
+            return {}
+        new_mtime = self.getmtime(self.manifest_path)
+        if mtime is None or new_mtime > mtime:
+            with self._lock:
+                mtime, manifest, checked = self._state
+                # another thread may have loaded it while we waited
+                if mtime is None or new_mtime > mtime:
+                    manifest = self.get_manifest()
+                    mtime = new_mtime
+                self._state = (mtime, manifest, now)
+        else:
+            self._state = (mtime, manifest, now)
+        return manifest
 
     def __call__(self, request, subpath, kw):
         subpath = self.manifest.get(subpath, subpath)
@@ -638,6 +638,26 @@ class TestAuthTktCookieHelper(unittest.TestCase):
         self.assertEqual(environ['REMOTE_USER_DATA'],'')
         self.assertEqual(environ['AUTH_TYPE'],'cookie')
 
+    def test_hash_state_computed_once(self):
+        from pyramid.authentication import _ticket_hash_state
+        helper = self._makeOne('secret', hashalg='hmac-sha256')
+        expected = _ticket_hash_state('secret', 'hmac-sha256')
+        self.assertEqual(helper.hash_state[0], expected[0])
+        self.assertEqual(helper.hash_state[1].digest(), expected[1].digest())
+        helper.identify(self._makeRequest('ticket'))
+        self.assertTrue(helper.auth_tkt.hash_state is helper.hash_state)
+
+    def test_remember_passes_hash_state(self):
+        helper = self._makeOne('secret')
+        tickets = []
+        AuthTicket = helper.AuthTicket
+        def dummy_ticket(*arg, **kw):
+            tickets.append(AuthTicket(*arg, **kw))
+            return tickets[-1]
+        helper.AuthTicket = dummy_ticket
+        helper.remember(self._makeRequest(), 'userid')
+        self.assertTrue(tickets[0].hash_state is helper.hash_state)
+
     def test_identify_good_cookie_include_ipv6(self):
         helper = self._makeOne('secret', include_ip=True)
         request = self._makeRequest('ticket', ipv6=True)
@@ -1235,6 +1255,37 @@ class TestAuthTicket(unittest.TestCase):
         self.assertEqual(result, 'd025b601a0f12ca6d008aa35ff3a22b7d8f3d1c1456c8'\
                                  '5becf8760cd7a2fa4910000000auserid!')
 
+    def test_digest_hmac_sha256(self):
+        ticket = self._makeOne('secret', 'userid', '0.0.0.0', time=10,
+                               tokens=('a', 'b'), hashalg='hmac-sha256')
+        result = ticket.digest()
+        self.assertEqual(result, 'df2b53dd0c94605acd12d40c9d2080ffac8e7c2df7e'\
+                                 '9b399cc12c5c20b965fe0')
+
+    def test_digest_hmac_by_name(self):
+        ticket = self._makeOne('secret', 'userid', '0.0.0.0', time=10,
+                               tokens=('a', 'b'), hashalg='hmac-SHA256')
+        result = ticket.digest()
+        self.assertEqual(result, 'df2b53dd0c94605acd12d40c9d2080ffac8e7c2df7e'\
+                                 '9b399cc12c5c20b965fe0')
+
+    def test_hash_state_reused(self):
+        ticket = self._makeOne('secret', 'userid', '0.0.0.0', time=10,
+                               tokens=('a', 'b'), hashalg='hmac-sha256')
+        other = self._makeOne('secret', 'userid', '0.0.0.0', time=10,
+                              tokens=('a', 'b'), hashalg='hmac-sha256',
+                              hash_state=ticket.hash_state)
+        self.assertTrue(other.hash_state is ticket.hash_state)
+        self.assertEqual(other.digest(), ticket.digest())
+        self.assertEqual(other.digest(), ticket.digest())
+
+    def test_digest_hmac_differs_by_secret(self):
+        ticket1 = self._makeOne('secret', 'userid', '0.0.0.0', time=10,
+                                hashalg='hmac-sha256')
+        ticket2 = self._makeOne('other', 'userid', '0.0.0.0', time=10,
+                                hashalg='hmac-sha256')
+        self.assertNotEqual(ticket1.digest(), ticket2.digest())
+
 class TestBadTicket(unittest.TestCase):
     def _makeOne(self, msg, expected=None):
         from pyramid.authentication import BadTicket
@@ -1290,6 +1341,40 @@ class Test_parse_ticket(unittest.TestCase):
         result = self._callFUT('secret', ticket, '2001:db8::1', 'sha256')
         self.assertEqual(result, (10, 'userid', [''], ''))
 
+    def test_correct_hmac_sha256(self):
+        ticket = text_('df2b53dd0c94605acd12d40c9d2080ffac8e7c2df7e9b399cc12c5'
+                       'c20b965fe00000000auserid!a,b!')
+        result = self._callFUT('secret', ticket, '0.0.0.0', 'hmac-sha256')
+        self.assertEqual(result, (10, 'userid', ['a', 'b'], ''))
+
+    def test_correct_hmac_sha512_ipv6(self):
+        ticket = text_('2038fa6b014007160761a6ad3311dc49828d8a8854b17e2a0bd674'
+                       '67d9578bf783353c05e3a3065db385cc866dc902462681c5307f8b'
+                       '4f03575e0e6946ee9ec40000000auserid!')
+        result = self._callFUT('secret', ticket, '2001:db8::1', 'hmac-sha512')
+        self.assertEqual(result, (10, 'userid', [''], ''))
+
+    def test_hmac_digest_sig_incorrect(self):
+        ticket = text_('df2b53dd0c94605acd12d40c9d2080ffac8e7c2df7e9b399cc12c5'
+                       'c20b965fe00000000auserid!a,b!')
+        self._assertRaisesBadTicket('other', ticket, '0.0.0.0', 'hmac-sha256')
+
+    def test_hash_state_passed(self):
+        from pyramid.authentication import parse_ticket
+        from pyramid.authentication import _ticket_hash_state
+        ticket = text_('df2b53dd0c94605acd12d40c9d2080ffac8e7c2df7e9b399cc12c5'
+                       'c20b965fe00000000auserid!a,b!')
+        hash_state = _ticket_hash_state('secret', 'hmac-sha256')
+        result = parse_ticket('secret', ticket, '0.0.0.0', 'hmac-sha256',
+                              hash_state=hash_state)
+        self.assertEqual(result, (10, 'userid', ['a', 'b'], ''))
+
+    def test_legacy_digest_not_accepted_as_hmac(self):
+        ticket = text_('b3e7156db4f8abde4439c4a6499a0668f9e7ffd7fa27b798400ecd'
+                       'ade8d76c530000000auserid!')
+        self._assertRaisesBadTicket(
+            'secret', ticket, '198.51.100.1', 'hmac-sha256')
+
 class TestSessionAuthenticationPolicy(unittest.TestCase):
     def _getTargetClass(self):
         from pyramid.authentication import SessionAuthenticationPolicy
@@ -1462,6 +1547,40 @@ class TestBasicAuthAuthenticationPolicy(unittest.TestCase):
         self.assertEqual(policy.authenticated_userid(request),
                          b'm\xc3\xb6rk\xc3\xb6'.decode('utf-8'))
 
+    def test_authenticated_userid_cached(self):
+        import base64
+        from pyramid.authentication import BasicAuthCredentialCache
+        request = testing.DummyRequest()
+        request.headers['Authorization'] = 'Basic %s' % base64.b64encode(
+            bytes_('chrisr:password')).decode('ascii')
+        calls = []
+        def check(username, password, request):
+            calls.append((username, password))
+            return ['group:editors']
+        cache = BasicAuthCredentialCache()
+        policy = self._getTargetClass()(check, cache=cache)
+        self.assertEqual(policy.authenticated_userid(request), 'chrisr')
+        self.assertEqual(policy.effective_principals(request),
+                         ['system.Everyone', 'system.Authenticated',
+                          'chrisr', 'group:editors'])
+        self.assertEqual(calls, [('chrisr', 'password')])
+        self.assertEqual(cache.hits, 1)
+
+    def test_authenticated_userid_cached_failure_not_cached(self):
+        import base64
+        from pyramid.authentication import BasicAuthCredentialCache
+        request = testing.DummyRequest()
+        request.headers['Authorization'] = 'Basic %s' % base64.b64encode(
+            bytes_('chrisr:password')).decode('ascii')
+        calls = []
+        def check(username, password, request):
+            calls.append((username, password))
+        policy = self._getTargetClass()(
+            check, cache=BasicAuthCredentialCache())
+        self.assertEqual(policy.authenticated_userid(request), None)
+        self.assertEqual(policy.authenticated_userid(request), None)
+        self.assertEqual(len(calls), 2)
+
     def test_unauthenticated_userid_invalid_payload(self):
         import base64
         request = testing.DummyRequest()
@@ -1480,6 +1599,99 @@ class TestBasicAuthAuthenticationPolicy(unittest.TestCase):
             ('WWW-Authenticate', 'Basic realm="SomeRealm"')])
 
 
+class TestBasicAuthCredentialCache(unittest.TestCase):
+    def _makeOne(self, **kw):
+        from pyramid.authentication import BasicAuthCredentialCache
+        return BasicAuthCredentialCache(**kw)
+
+    def test_get_miss(self):
+        cache = self._makeOne()
+        self.assertEqual(cache.get('chrisr', 'password'), None)
+        self.assertEqual(cache.misses, 1)
+
+    def test_set_get(self):
+        cache = self._makeOne()
+        cache.set('chrisr', 'password', ['group:editors'])
+        self.assertEqual(cache.get('chrisr', 'password'), ['group:editors'])
+        self.assertEqual(cache.hits, 1)
+
+    def test_get_returns_copy(self):
+        cache = self._makeOne()
+        cache.set('chrisr', 'password', [])
+        cache.get('chrisr', 'password').append('group:admins')
+        self.assertEqual(cache.get('chrisr', 'password'), [])
+
+    def test_get_wrong_password(self):
+        cache = self._makeOne()
+        cache.set('chrisr', 'password', [])
+        self.assertEqual(cache.get('chrisr', 'wrong'), None)
+        self.assertEqual(cache.get('chrisr', 'password'), [])
+
+    def test_does_not_store_credentials(self):
+        cache = self._makeOne(secret='seekrit')
+        cache.set('chrisr', 'password', ['group:editors'])
+        stored = repr((cache._entries, cache._users))
+        self.assertFalse('chrisr' in stored)
+        self.assertFalse('password' in stored)
+
+    def test_keyed_on_username_and_password(self):
+        cache = self._makeOne()
+        self.assertNotEqual(cache._keys('ab', 'c')[1],
+                            cache._keys('a', 'bc')[1])
+        self.assertEqual(cache._keys('a', 'b')[0], cache._keys('a', 'c')[0])
+
+    def test_secret_isolates_caches(self):
+        cache1 = self._makeOne()
+        cache2 = self._makeOne()
+        self.assertNotEqual(cache1._keys('chrisr', 'password'),
+                            cache2._keys('chrisr', 'password'))
+
+    def test_set_replaces_user_entry(self):
+        cache = self._makeOne()
+        cache.set('chrisr', 'old', [])
+        cache.set('chrisr', 'new', ['group:editors'])
+        self.assertEqual(len(cache._entries), 1)
+        self.assertEqual(cache.get('chrisr', 'old'), None)
+        self.assertEqual(cache.get('chrisr', 'new'), ['group:editors'])
+
+    def test_get_expired(self):
+        cache = self._makeOne(timeout=10)
+        cache.now = 100
+        cache.set('chrisr', 'password', [])
+        cache.now = 110
+        self.assertEqual(cache.get('chrisr', 'password'), None)
+        self.assertEqual(len(cache._entries), 0)
+        self.assertEqual(len(cache._users), 0)
+
+    def test_max_size(self):
+        cache = self._makeOne(max_size=2)
+        cache.set('a', 'password', [])
+        cache.set('b', 'password', [])
+        cache.get('a', 'password')
+        cache.set('c', 'password', [])
+        self.assertEqual(cache.get('b', 'password'), None)
+        self.assertEqual(cache.get('a', 'password'), [])
+        self.assertEqual(cache.get('c', 'password'), [])
+        self.assertEqual(len(cache._users), 2)
+
+    def test_invalidate_username(self):
+        cache = self._makeOne()
+        cache.set('a', 'password', [])
+        cache.set('b', 'password', [])
+        cache.invalidate('a')
+        cache.invalidate('nobody')
+        self.assertEqual(cache.get('a', 'password'), None)
+        self.assertEqual(cache.get('b', 'password'), [])
+
+    def test_invalidate_all(self):
+        cache = self._makeOne()
+        cache.set('a', 'password', [])
+        cache.set('b', 'password', [])
+        cache.invalidate()
+        self.assertEqual(cache.get('a', 'password'), None)
+        self.assertEqual(cache.get('b', 'password'), None)
+
+
 class TestExtractHTTPBasicCredentials(unittest.TestCase):
     def _get_func(self):
         from pyramid.authentication import extract_http_basic_credentials
@@ -1617,20 +1829,24 @@ class DummyAuthTktModule(object):
         self.user_data = user_data
         self.parse_raise = parse_raise
         self.hashalg = hashalg
-        def parse_ticket(secret, value, remote_addr, hashalg):
+        def parse_ticket(secret, value, remote_addr, hashalg,
+                         hash_state=None):
             self.secret = secret
             self.value = value
             self.remote_addr = remote_addr
+            self.hash_state = hash_state
             if self.parse_raise:
                 raise self.BadTicket()
             return self.timestamp, self.userid, self.tokens, self.user_data
         self.parse_ticket = parse_ticket
 
         class AuthTicket(object):
-            def __init__(self, secret, userid, remote_addr, **kw):
+            def __init__(self, secret, userid, remote_addr, hash_state=None,
+                         **kw):
                 self.secret = secret
                 self.userid = userid
                 self.remote_addr = remote_addr
+                self.hash_state = hash_state
                 self.kw = kw
 
             def cookie_value(self):
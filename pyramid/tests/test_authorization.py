@@ -229,6 +229,75 @@ class TestACLAuthorizationPolicy(unittest.TestCase):
             policy.principals_allowed_by_permission(context, 'read'))
         self.assertEqual(result, [])
 
+    def _makeTree(self):
+        from pyramid.security import Deny
+        from pyramid.security import Allow
+        from pyramid.security import Everyone
+        from pyramid.security import DENY_ALL
+        root = DummyContainer()
+        community = DummyContainer(__name__='community', __parent__=root)
+        blog = DummyContainer(__name__='blog', __parent__=community)
+        entry = DummyContext(__name__='entry', __parent__=blog)
+        private = DummyContext(__name__='private', __parent__=community)
+        root['community'] = community
+        community['blog'] = blog
+        community['private'] = private
+        blog['entry'] = entry
+        root.__acl__ = [(Allow, Everyone, 'read'),
+                        (Allow, 'chrism', 'read')]
+        community.__acl__ = [(Deny, 'chrism', 'read'),
+                             (Allow, 'fred', 'read')]
+        entry.__acl__ = [(Allow, 'bob', 'read')]
+        private.__acl__ = [(Allow, 'jim', 'read'), DENY_ALL]
+        return root
+
+    def test_walk_principals_allowed_by_permission(self):
+        root = self._makeTree()
+        policy = self._makeOne()
+        result = list(
+            policy.walk_principals_allowed_by_permission(root, 'read'))
+        self.assertEqual(
+            [r.__name__ for r, allowed in result],
+            [None, 'community', 'blog', 'entry', 'private'])
+        for resource, allowed in result:
+            self.assertEqual(
+                allowed,
+                policy.principals_allowed_by_permission(resource, 'read'))
+            self.assertTrue(isinstance(allowed, frozenset))
+
+    def test_walk_principals_allowed_by_permission_shares_inherited(self):
+        root = self._makeTree()
+        policy = self._makeOne()
+        result = dict(
+            (r.__name__, allowed) for r, allowed in
+            policy.walk_principals_allowed_by_permission(root, 'read'))
+        self.assertTrue(result['blog'] is result['community'])
+
+    def test_walk_principals_allowed_by_permission_subtree(self):
+        root = self._makeTree()
+        community = root['community']
+        policy = self._makeOne()
+        result = list(
+            policy.walk_principals_allowed_by_permission(community, 'read'))
+        self.assertEqual(result[0][0], community)
+        self.assertEqual(sorted(result[0][1]), ['fred', 'system.Everyone'])
+
+    def test_walk_principals_allowed_by_permission_inherited(self):
+        root = self._makeTree()
+        entry = root['community']['blog']['entry']
+        policy = self._makeOne()
+        result = list(policy.walk_principals_allowed_by_permission(
+            entry, 'read', inherited=['alice']))
+        self.assertEqual(result, [(entry, frozenset(['alice', 'bob']))])
+
+    def test_walk_principals_allowed_by_permission_children(self):
+        root = self._makeTree()
+        community = root['community']
+        policy = self._makeOne()
+        result = list(policy.walk_principals_allowed_by_permission(
+            root, 'read', children=lambda r: [community] if r is root else []))
+        self.assertEqual([r for r, allowed in result], [root, community])
+
     def test_callable_acl(self):
         from pyramid.security import Allow
         context = DummyContext()
@@ -243,6 +312,12 @@ class DummyContext:
     def __init__(self, *arg, **kw):
         self.__dict__.update(kw)
 
+class DummyContainer(dict):
+    def __init__(self, **kw):
+        dict.__init__(self)
+        self.__dict__.update(kw)
+        self.__dict__.setdefault('__name__', None)
+
 
 VIEW = 'view'
 EDIT = 'edit'
@@ -253,6 +253,17 @@ class TestAssetsConfiguratorMixin(unittest.TestCase):
         self.assertEqual(overrides.inserted, [('path', source)])
         self.assertEqual(overrides.package, package)
 
+    def test__override_reload_assets(self):
+        from pyramid.interfaces import IPackageOverrides
+        package = DummyPackage('package')
+        config = self._makeOne()
+        config.registry.settings = {'pyramid.reload_assets': 'true'}
+        config._override(package, 'path', DummyAssetSource(),
+                         PackageOverrides=DummyPackageOverrides)
+        overrides = config.registry.queryUtility(IPackageOverrides,
+                                                 name='package')
+        self.assertTrue(overrides.reload)
+
     def test__override_already_registered(self):
         from pyramid.interfaces import IPackageOverrides
         package = DummyPackage('package')
@@ -443,13 +454,13 @@ class TestPackageOverrides(unittest.TestCase):
         from pyramid.config.assets import PackageOverrides
         return PackageOverrides
 
-    def _makeOne(self, package=None, pkg_resources=None):
+    def _makeOne(self, package=None, pkg_resources=None, reload=False):
         if package is None:
             package = DummyPackage('package')
         klass = self._getTargetClass()
         if pkg_resources is None:
             pkg_resources = DummyPkgResources()
-        return klass(package, pkg_resources=pkg_resources)
+        return klass(package, pkg_resources=pkg_resources, reload=reload)
 
     def test_class_conforms_to_IPackageOverrides(self):
         from zope.interface.verify import verifyClass
@@ -660,6 +671,113 @@ class TestPackageOverrides(unittest.TestCase):
         self.assertEqual(po.listdir('whatever'), None)
         self.assertEqual(source.resource_name, 'wont_exist')
 
+    def test_lookup_cached(self):
+        source = CountingAssetSource(filename='foo.pt')
+        overrides = [DummyOverride(None), DummyOverride((source, 'foo.pt'))]
+        po = self._makeOne()
+        po.overrides = overrides
+        self.assertEqual(po.get_filename('whatever'), 'foo.pt')
+        self.assertEqual(po.get_filename('whatever'), 'foo.pt')
+        self.assertEqual(source.calls, ['foo.pt'])
+        self.assertEqual(overrides[0].calls, 1)
+
+    def test_lookup_caches_negative_result(self):
+        source = CountingAssetSource(filename=None)
+        overrides = [DummyOverride((source, 'wont_exist'))]
+        po = self._makeOne()
+        po.overrides = overrides
+        self.assertEqual(po.get_filename('whatever'), None)
+        self.assertEqual(po.get_filename('whatever'), None)
+        self.assertEqual(source.calls, ['wont_exist'])
+
+    def test_lookup_cache_is_per_method(self):
+        source = DummyAssetSource(filename='foo.pt', isdir=None)
+        po = self._makeOne()
+        po.overrides = [DummyOverride((source, 'foo.pt'))]
+        self.assertEqual(po.get_filename('whatever'), 'foo.pt')
+        self.assertEqual(po.isdir('whatever'), None)
+        self.assertEqual(po.get_filename('whatever'), 'foo.pt')
+
+    def test_lookup_stream_refetched(self):
+        source = DummyAssetSource(stream='a stream?')
+        po = self._makeOne()
+        po.overrides = [DummyOverride((source, 'foo.pt'))]
+        self.assertEqual(po.get_stream('whatever'), 'a stream?')
+        source.kw['stream'] = 'another stream'
+        self.assertEqual(po.get_stream('whatever'), 'another stream')
+
+    def test_lookup_cached_source_disappears(self):
+        first = DummyAssetSource(stream='first')
+        second = DummyAssetSource(stream='second')
+        po = self._makeOne()
+        po.overrides = [DummyOverride((first, '')), DummyOverride((second, ''))]
+        self.assertEqual(po.get_stream('whatever'), 'first')
+        first.kw['stream'] = None
+        self.assertEqual(po.get_stream('whatever'), 'second')
+
+    def test_reload_revalidates_positive_result(self):
+        import os
+        import shutil
+        import tempfile
+        from pyramid.config.assets import FSAssetSource
+        tmpdir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(tmpdir, 'foo.txt')
+            with open(path, 'w') as f:
+                f.write('foo')
+            po = self._makeOne(reload=True)
+            po.insert('', FSAssetSource(tmpdir + os.sep))
+            self.assertEqual(po.get_filename('foo.txt'), path)
+            os.remove(path)
+            os.utime(tmpdir, (0, 0))
+            self.assertEqual(po.get_filename('foo.txt'), None)
+        finally:
+            shutil.rmtree(tmpdir)
+
+    def test_insert_clears_cache(self):
+        import os
+        here = os.path.dirname(os.path.abspath(__file__))
+        from pyramid.config.assets import FSAssetSource
+        po = self._makeOne()
+        self.assertEqual(po.get_filename('test_assets.py'), None)
+        po.insert('', FSAssetSource(here + os.sep))
+        self.assertEqual(po.get_filename('test_assets.py'),
+                         os.path.join(here, 'test_assets.py'))
+
+    def test_reload_revalidates_negative_result(self):
+        import os
+        import shutil
+        import tempfile
+        from pyramid.config.assets import FSAssetSource
+        tmpdir = tempfile.mkdtemp()
+        try:
+            po = self._makeOne(reload=True)
+            po.insert('', FSAssetSource(tmpdir + os.sep))
+            self.assertEqual(po.get_filename('foo.txt'), None)
+            path = os.path.join(tmpdir, 'foo.txt')
+            with open(path, 'w') as f:
+                f.write('foo')
+            os.utime(tmpdir, (0, 0))
+            self.assertEqual(po.get_filename('foo.txt'), path)
+        finally:
+            shutil.rmtree(tmpdir)
+
+    def test_no_reload_keeps_negative_result(self):
+        import os
+        import shutil
+        import tempfile
+        from pyramid.config.assets import FSAssetSource
+        tmpdir = tempfile.mkdtemp()
+        try:
+            po = self._makeOne()
+            po.insert('', FSAssetSource(tmpdir + os.sep))
+            self.assertEqual(po.get_filename('foo.txt'), None)
+            with open(os.path.join(tmpdir, 'foo.txt'), 'w') as f:
+                f.write('foo')
+            self.assertEqual(po.get_filename('foo.txt'), None)
+        finally:
+            shutil.rmtree(tmpdir)
+
     # PEP 302 __loader__ extensions:  use the "real" __loader__, if present.
     def test_get_data_pkg_has_no___loader__(self):
         package = DummyPackage('package')
@@ -785,6 +903,15 @@ class AssetSourceIntegrationTests(object):
         source = self._makeOne('')
         self.assertEqual(source.listdir('wont_exist'), None)
 
+    def test_get_stamp(self):
+        source = self._makeOne('')
+        self.assertEqual(source.get_stamp('test_assets.py'),
+                         os.stat(here).st_mtime)
+
+    def test_get_stamp_dir_doesnt_exist(self):
+        source = self._makeOne('')
+        self.assertEqual(source.get_stamp('wont_exist/foo.txt'), None)
+
 class TestPackageAssetSource(AssetSourceIntegrationTests, unittest.TestCase):
 
     def _getTargetClass(self):
@@ -795,6 +922,10 @@ class TestPackageAssetSource(AssetSourceIntegrationTests, unittest.TestCase):
         klass = self._getTargetClass()
         return klass(package, prefix)
 
+    def test_get_stamp_package_not_imported(self):
+        source = self._makeOne('', package='wont.exist')
+        self.assertEqual(source.get_stamp('test_assets.py'), None)
+
 class TestFSAssetSource(AssetSourceIntegrationTests, unittest.TestCase):
     def _getTargetClass(self):
         from pyramid.config.assets import FSAssetSource
@@ -847,10 +978,12 @@ class TestFileOverride(unittest.TestCase):
         self.assertEqual(result, None)
 
 class DummyOverride:
+    calls = 0
     def __init__(self, result):
         self.result = result
 
     def __call__(self, resource_name):
+        self.calls += 1
         return self.result
 
 class DummyOverrides:
@@ -909,6 +1042,15 @@ class DummyAssetSource:
         self.resource_name = resource_name
         return self.kw['listdir']
  
+class CountingAssetSource:
+    def __init__(self, filename):
+        self.filename = filename
+        self.calls = []
+
+    def get_filename(self, resource_name):
+        self.calls.append(resource_name)
+        return self.filename
+
 class DummyLoader:
     _got_data = _is_package = None
     def get_data(self, path):
@@ -87,3 +87,51 @@ class TestI18NConfiguratorMixin(unittest.TestCase):
         self.assertEqual(config.registry.getUtility(ITranslationDirectories),
                          [locale])
 
+
+    def test_preload_translations(self):
+        from pyramid.interfaces import ILocalizer
+        config = self._makeOne()
+        # order doesn't matter: translation dirs are registered first
+        config.preload_translations(['de', 'fr'])
+        config.add_translation_dirs(locale)
+        config.commit()
+        localizer = config.registry.getUtility(ILocalizer, name='de')
+        self.assertEqual(localizer.translate('Approve', 'deformsite'),
+                         'Genehmigen')
+        self.assertTrue(
+            config.registry.queryUtility(ILocalizer, name='fr') is not None)
+        self.assertEqual(
+            config.registry.queryUtility(ILocalizer, name='en'), None)
+
+    def test_preload_translations_all_locales_threaded(self):
+        from pyramid.interfaces import ILocalizer
+        config = self._makeOne(autocommit=True)
+        config.add_translation_dirs(locale)
+        config.preload_translations(threads=2)
+        for locale_name in ('de', 'de_DE', 'en'):
+            self.assertTrue(config.registry.queryUtility(
+                ILocalizer, name=locale_name) is not None)
+
+    def test_preload_translations_reports_timings(self):
+        logger = DummyLogger()
+        config = self._makeOne(autocommit=True, debug_logger=logger)
+        config.add_translation_dirs(locale)
+        config.preload_translations(['de', 'fr'])
+        self.assertEqual(len(logger.messages), 2)
+        self.assertTrue(logger.messages[0].startswith(
+            "preloaded translations for locale 'de': deformsite ("))
+        self.assertEqual(
+            logger.messages[1],
+            "preloaded translations for locale 'fr': nothing to load")
+        intr = config.registry.introspector.get(
+            'translation preloads', ('de', 'fr'))
+        self.assertEqual(sorted(intr['timings']), ['de', 'fr'])
+        self.assertEqual(list(intr['timings']['de']), ['deformsite'])
+        self.assertEqual(intr['timings']['fr'], {})
+
+class DummyLogger(object):
+    def __init__(self):
+        self.messages = []
+
+    def info(self, msg):
+        self.messages.append(msg)
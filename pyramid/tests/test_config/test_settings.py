@@ -556,6 +556,31 @@ class TestSettings(unittest.TestCase):
         self.assertEqual(result['pyramid.csrf_trusted_origins'], [
             'example.com', 'foo.example.com', 'asdf.example.com'])
 
+    def test_mmap_translations(self):
+        result = self._makeOne({})
+        self.assertEqual(result['mmap_translations'], False)
+        self.assertEqual(result['pyramid.mmap_translations'], False)
+        result = self._makeOne({'mmap_translations':'true'})
+        self.assertEqual(result['mmap_translations'], True)
+        self.assertEqual(result['pyramid.mmap_translations'], True)
+        result = self._makeOne({'pyramid.mmap_translations':'1'})
+        self.assertEqual(result['mmap_translations'], True)
+        self.assertEqual(result['pyramid.mmap_translations'], True)
+        result = self._makeOne({}, {'PYRAMID_MMAP_TRANSLATIONS':'1'})
+        self.assertEqual(result['mmap_translations'], True)
+        self.assertEqual(result['pyramid.mmap_translations'], True)
+
+    def test_localizer_cache_size(self):
+        result = self._makeOne({})
+        self.assertEqual(result['localizer_cache_size'], 0)
+        self.assertEqual(result['pyramid.localizer_cache_size'], 0)
+        result = self._makeOne({'localizer_cache_size':'500'})
+        self.assertEqual(result['localizer_cache_size'], 500)
+        self.assertEqual(result['pyramid.localizer_cache_size'], 500)
+        result = self._makeOne({}, {'PYRAMID_LOCALIZER_CACHE_SIZE':'100'})
+        self.assertEqual(result['localizer_cache_size'], 100)
+        self.assertEqual(result['pyramid.localizer_cache_size'], 100)
+
     def test_originals_kept(self):
         result = self._makeOne({'a':'i am so a'})
         self.assertEqual(result['a'], 'i am so a')
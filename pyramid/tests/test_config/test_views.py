@@ -3136,6 +3136,111 @@ class TestStaticURLInfo(unittest.TestCase):
         self.assertEqual(result,
                          'http://example.com/abc%20def#La%20Pe%C3%B1a')
 
+    def test_generate_first_registration_wins(self):
+        inst = self._makeOne()
+        inst.registrations = [
+            ('http://example.com/foo/', 'package:path/', None),
+            ('http://example.com/bar/', 'package:path/sub/', None),
+            ('http://example.com/baz/', 'package:path/', None),
+            ]
+        request = self._makeRequest()
+        result = inst.generate('package:path/sub/abc', request)
+        self.assertEqual(result, 'http://example.com/foo/sub/abc')
+        inst.registrations = [
+            ('http://example.com/bar/', 'package:path/sub/', None),
+            ('http://example.com/foo/', 'package:path/', None),
+            ]
+        result = inst.generate('package:path/sub/abc', request)
+        self.assertEqual(result, 'http://example.com/bar/abc')
+        result = inst.generate('package:path/abc', request)
+        self.assertEqual(result, 'http://example.com/foo/abc')
+
+    def test_generate_url_cached(self):
+        inst = self._makeOne()
+        inst.registrations = [('http://example.com/', 'package:path/', None)]
+        request = self._makeRequest()
+        result = inst.generate('package:path/abc', request, _query={'a': 1})
+        self.assertEqual(result, 'http://example.com/abc?a=1')
+        self.assertEqual(len(inst._url_cache.data), 1)
+        result = inst.generate('package:path/abc', request, _query={'a': 1})
+        self.assertEqual(result, 'http://example.com/abc?a=1')
+        self.assertEqual(len(inst._url_cache.data), 1)
+        result = inst.generate('package:path/abc', request, _query={'a': 2})
+        self.assertEqual(result, 'http://example.com/abc?a=2')
+        self.assertEqual(len(inst._url_cache.data), 2)
+
+    def test_generate_url_cache_reset_by_registrations(self):
+        inst = self._makeOne()
+        inst.registrations = [('http://example.com/', 'package:path/', None)]
+        request = self._makeRequest()
+        inst.generate('package:path/abc', request)
+        inst.registrations = [('http://example.org/', 'package:path/', None)]
+        result = inst.generate('package:path/abc', request)
+        self.assertEqual(result, 'http://example.org/abc')
+
+    def test_generate_url_unhashable_kw_not_cached(self):
+        inst = self._makeOne()
+        inst.registrations = [('http://example.com/', 'package:path/', None)]
+        request = self._makeRequest()
+        result = inst.generate('package:path/abc', request,
+                               _query={'a': [1, 2]})
+        self.assertEqual(result, 'http://example.com/abc?a=1&a=2')
+        self.assertEqual(len(inst._url_cache.data), 0)
+
+    def test_generate_url_scheme_relative_cached_per_scheme(self):
+        inst = self._makeOne()
+        inst.registrations = [('//example.com/', 'package:path/', None)]
+        request = self._makeRequest()
+        request.environ['wsgi.url_scheme'] = 'http'
+        result = inst.generate('package:path/abc', request)
+        self.assertEqual(result, 'http://example.com/abc')
+        request.environ['wsgi.url_scheme'] = 'https'
+        result = inst.generate('package:path/abc', request)
+        self.assertEqual(result, 'https://example.com/abc')
+
+    def test_generate_route_url_cached(self):
+        from pyramid.interfaces import IStaticURLInfo
+        config = testing.setUp()
+        try:
+            config.add_static_view('static', path='mypkg:static')
+            inst = config.registry.getUtility(IStaticURLInfo)
+            request = testing.DummyRequest()
+            request.registry = config.registry
+            result = inst.generate('mypkg:static/foo.css', request)
+            self.assertEqual(result, 'http://example.com/static/foo.css')
+            self.assertEqual(len(inst._url_cache.data), 1)
+            request.route_url = None
+            result = inst.generate('mypkg:static/foo.css', request)
+            self.assertEqual(result, 'http://example.com/static/foo.css')
+            request = testing.DummyRequest(
+                application_url='https://example.org/app')
+            request.registry = config.registry
+            result = inst.generate('mypkg:static/foo.css', request)
+            self.assertEqual(result, 'https://example.org/app/static/foo.css')
+            self.assertEqual(len(inst._url_cache.data), 2)
+        finally:
+            testing.tearDown()
+
+    def test_generate_route_url_with_pregenerator_not_cached(self):
+        from pyramid.interfaces import IStaticURLInfo
+        config = testing.setUp()
+        try:
+            def pregenerator(request, elements, kw):
+                kw['_app_url'] = request.app_url
+                return elements, kw
+            config.add_static_view('static', path='mypkg:static',
+                                   pregenerator=pregenerator)
+            inst = config.registry.getUtility(IStaticURLInfo)
+            for app_url in ('http://a.example.com', 'http://b.example.com'):
+                request = testing.DummyRequest()
+                request.registry = config.registry
+                request.app_url = app_url
+                result = inst.generate('mypkg:static/foo.css', request)
+                self.assertEqual(result, app_url + '/static/foo.css')
+            self.assertEqual(len(inst._url_cache.data), 0)
+        finally:
+            testing.tearDown()
+
     def test_generate_url_cachebust(self):
         def cachebust(request, subpath, kw):
             kw['foo'] = 'bar'
@@ -3262,6 +3367,39 @@ class TestStaticURLInfo(unittest.TestCase):
         self.assertEqual(config.view_kw['permission'], NO_PERMISSION_REQUIRED)
         self.assertEqual(config.view_kw['view'].__class__, static_view)
 
+    def test_add_viewname_with_file_cache(self):
+        config = DummyConfig()
+        inst = self._makeOne()
+        inst.add(config, 'view', 'anotherpackage:path', cache_files=True,
+                 cache_max_files=10, cache_max_file_size=100,
+                 stat_interval=None)
+        view = config.view_kw['view']
+        self.assertEqual(view.file_cache.size, 10)
+        self.assertEqual(view.cache_max_file_size, 100)
+        self.assertEqual(view.stat_interval, None)
+        self.assertEqual(config.route_args, ('__view/', 'view/*subpath'))
+        self.assertEqual(config.route_kw, {})
+
+    def test_add_viewname_with_precompressed(self):
+        config = DummyConfig()
+        inst = self._makeOne()
+        inst.add(config, 'view', 'anotherpackage:path', precompressed=True)
+        view = config.view_kw['view']
+        self.assertEqual(view.precompressed, ('br', 'gzip'))
+        self.assertEqual(config.route_kw, {})
+
+    def test_add_viewname_with_content_etag(self):
+        from pyramid.response import _content_hashes
+        config = DummyConfig()
+        inst = self._makeOne()
+        inst.add(config, 'view', 'pyramid.tests:fixtures/static',
+                 content_etag=True, precompute_etags=True)
+        view = config.view_kw['view']
+        self.assertEqual(view.content_etag, True)
+        self.assertEqual(config.route_kw, {})
+        self.assertTrue(len(_content_hashes.data) > 0)
+        _content_hashes.clear()
+
     def test_add_viewname_with_route_prefix(self):
         config = DummyConfig()
         config.route_prefix = '/abc'
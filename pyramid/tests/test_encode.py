@@ -53,6 +53,132 @@ class UrlEncodeTests(unittest.TestCase):
         result = self._callFUT([('a', '1'), ('b', None), ('c', None)])
         self.assertEqual(result, 'a=1&b=&c=')
 
+    def test_QueryFragment_as_query(self):
+        from pyramid.encode import QueryFragment
+        fragment = QueryFragment([('a', 'b c'), ('d', None)])
+        self.assertEqual(self._callFUT(fragment), 'a=b+c&d=')
+
+    def test_QueryFragment_in_sequence(self):
+        from pyramid.encode import QueryFragment
+        fragment = QueryFragment({'sort': 'name'})
+        result = self._callFUT([('page', 2), fragment, ('x', '1')])
+        self.assertEqual(result, 'page=2&sort=name&x=1')
+
+    def test_QueryFragment_first(self):
+        from pyramid.encode import QueryFragment
+        fragment = QueryFragment({'sort': 'name'})
+        result = self._callFUT([fragment, ('page', 2)])
+        self.assertEqual(result, 'sort=name&page=2')
+
+    def test_QueryFragment_empty(self):
+        from pyramid.encode import QueryFragment
+        fragment = QueryFragment([])
+        result = self._callFUT([fragment, ('page', 2)])
+        self.assertEqual(result, 'page=2')
+
+    def test_key_cache_distinguishes_equal_keys_of_other_types(self):
+        result = self._callFUT([(1, 'a'), (True, 'b'), (1.0, 'c')])
+        self.assertEqual(result, '1=a&True=b&1.0=c')
+
+    def test_unhashable_key(self):
+        result = self._callFUT([(['a b'], 'c')])
+        self.assertEqual(result, '%5B%27a+b%27%5D=c')
+
+    def test_empty_sequence_value(self):
+        # the prefix is emitted even though the first value produced nothing
+        result = self._callFUT([('a', []), ('b', 1)])
+        self.assertEqual(result, '&b=1')
+
+    def test_same_as_reference_implementation(self):
+        import random
+        rnd = random.Random(1234)
+        for i in range(2000):
+            query = _random_query(rnd)
+            self.assertEqual(self._callFUT(query), _reference_urlencode(query),
+                             query)
+
+class QueryFragmentTests(unittest.TestCase):
+    def _makeOne(self, query):
+        from pyramid.encode import QueryFragment
+        return QueryFragment(query)
+
+    def test_str(self):
+        fragment = self._makeOne([('a', 1), ('b', 'x y')])
+        self.assertEqual(str(fragment), 'a=1&b=x+y')
+
+    def test_bool(self):
+        self.assertTrue(self._makeOne([('a', 1)]))
+        self.assertFalse(self._makeOne([]))
+
+    def test_repr(self):
+        fragment = self._makeOne([('a', 1)])
+        self.assertEqual(repr(fragment), "<QueryFragment 'a=1'>")
+
+def _reference_urlencode(query):
+    # the implementation of urlencode before it was optimized
+    from pyramid.compat import is_nonstr_iter
+    from pyramid.encode import quote_plus
+    try:
+        query = query.items()
+    except AttributeError:
+        pass
+    result = ''
+    prefix = ''
+    for (k, v) in query:
+        k = quote_plus(k)
+        if is_nonstr_iter(v):
+            for x in v:
+                x = quote_plus(x)
+                result += '%s%s=%s' % (prefix, k, x)
+                prefix = '&'
+        elif v is None:
+            result += '%s%s=' % (prefix, k)
+        else:
+            v = quote_plus(v)
+            result += '%s%s=%s' % (prefix, k, v)
+        prefix = '&'
+    return result
+
+_random_chars = 'abcXYZ019-._~ +&=?/%#' + native_(
+    text_(b'\xc3\xb1\xe2\x82\xac', 'utf-8'))
+
+def _random_scalar(rnd):
+    kind = rnd.randrange(7)
+    if kind == 0:
+        return rnd.randint(-1000, 1000)
+    if kind == 1:
+        return rnd.choice([True, False, 1.5])
+    if kind == 2:
+        return text_(''.join(rnd.choice('abcXYZ019-._~')
+                             for i in range(rnd.randrange(6))))
+    if kind == 3:
+        return ''.join(rnd.choice('abcXYZ019-._~')
+                       for i in range(rnd.randrange(6)))
+    if kind == 4:
+        return text_(b'caf\xc3\xa9 ' + str(rnd.randrange(9)).encode('ascii'),
+                     'utf-8')
+    if kind == 5:
+        return ''.join(rnd.choice(_random_chars)
+                       for i in range(rnd.randrange(8)))
+    return ('bytes %d' % rnd.randrange(9)).encode('ascii')
+
+def _random_value(rnd):
+    kind = rnd.randrange(6)
+    if kind == 0:
+        return None
+    if kind == 1:
+        return [_random_scalar(rnd) for i in range(rnd.randrange(4))]
+    if kind == 2:
+        return tuple(_random_scalar(rnd) for i in range(rnd.randrange(3)))
+    return _random_scalar(rnd)
+
+def _random_query(rnd):
+    pairs = [(_random_scalar(rnd), _random_value(rnd))
+             for i in range(rnd.randrange(6))]
+    if rnd.randrange(3) == 0:
+        return dict((k, v) for k, v in pairs)
+    return pairs
+
 class URLQuoteTests(unittest.TestCase):
     def _callFUT(self, val, safe=''):
         from pyramid.encode import url_quote
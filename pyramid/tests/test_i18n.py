@@ -82,6 +82,130 @@ class TestLocalizer(unittest.TestCase):
                                      mapping={})
         self.assertEqual(result, 'plural')
 
+    def test_cache_info_no_cache(self):
+        localizer = self._makeOne('en', DummyTranslations())
+        self.assertEqual(localizer.cache_info(), None)
+
+    def _makeCaching(self, cache_size=10):
+        localizer = self._makeOne('en', DummyTranslations(),
+                                  cache_size=cache_size)
+        calls = []
+        def translator(tstring, domain=None, mapping=None):
+            calls.append((tstring, domain, mapping))
+            return tstring.replace('${x}', str((mapping or {}).get('x')))
+        localizer.translator = translator
+        def pluralizer(singular, plural, n, domain=None, mapping=None):
+            calls.append((singular, plural, n, domain, mapping))
+            return singular if n == 1 else plural
+        localizer.pluralizer = pluralizer
+        return localizer, calls
+
+    def test_translate_cached(self):
+        localizer, calls = self._makeCaching()
+        for i in range(3):
+            result = localizer.translate('a ${x}', domain='d',
+                                         mapping={'x': 'b'})
+            self.assertEqual(result, 'a b')
+        self.assertEqual(len(calls), 1)
+        info = localizer.cache_info()
+        self.assertEqual(info['size'], 10)
+        self.assertEqual(info['entries'], 1)
+        self.assertEqual(info['lookups'], 3)
+        self.assertEqual(info['hits'], 2)
+        self.assertEqual(info['misses'], 1)
+        self.assertEqual(info['evictions'], 0)
+
+    def test_translate_cache_key(self):
+        from pyramid.i18n import TranslationString
+        localizer, calls = self._makeCaching()
+        localizer.translate('a ${x}', mapping={'x': 1})
+        localizer.translate('a ${x}', mapping={'x': True})
+        localizer.translate('a ${x}', mapping={'x': '1'})
+        localizer.translate('a ${x}', mapping={'x': 2})
+        localizer.translate('a ${x}', domain='d', mapping={'x': 2})
+        localizer.translate(TranslationString('a ${x}', default='b'),
+                            mapping={'x': 2})
+        localizer.translate(TranslationString('a ${x}', mapping={'x': 3}),
+                            mapping={'x': 2})
+        self.assertEqual(len(calls), 7)
+        localizer.translate('a ${x}', mapping={'x': True})
+        localizer.translate(TranslationString('a ${x}', mapping={'x': 3}),
+                            mapping={'x': 2})
+        self.assertEqual(len(calls), 7)
+
+    def test_translate_no_mapping_cached(self):
+        localizer, calls = self._makeCaching()
+        localizer.translate('a')
+        localizer.translate('a', mapping={})
+        self.assertEqual(len(calls), 1)
+
+    def test_translate_unhashable_mapping_not_cached(self):
+        localizer, calls = self._makeCaching()
+        for i in range(2):
+            localizer.translate('a ${x}', mapping={'x': ['b']})
+            localizer.translate('a ${x}', mapping={'x': {'b': 1}})
+        self.assertEqual(len(calls), 4)
+        self.assertEqual(localizer.cache_info()['lookups'], 0)
+
+    def test_translate_other_values_not_cached(self):
+        # equal values of these types may be rendered differently
+        from decimal import Decimal
+        localizer, calls = self._makeCaching()
+        self.assertEqual(
+            localizer.translate('a ${x}', mapping={'x': Decimal('1.0')}),
+            'a 1.0')
+        self.assertEqual(
+            localizer.translate('a ${x}', mapping={'x': Decimal('1.00')}),
+            'a 1.00')
+        localizer.translate('a ${x}', mapping={'x': (1,)})
+        localizer.translate('a ${x}', mapping={'x': (True,)})
+        self.assertEqual(len(calls), 4)
+
+    def test_translate_tstring_unhashable_mapping_not_cached(self):
+        from pyramid.i18n import TranslationString
+        localizer, calls = self._makeCaching()
+        tstring = TranslationString('a ${x}', mapping={'x': ['b']})
+        localizer.translate(tstring)
+        localizer.translate(tstring)
+        self.assertEqual(len(calls), 2)
+
+    def test_translate_cache_bounded(self):
+        localizer, calls = self._makeCaching(cache_size=2)
+        for msgid in ('a', 'b', 'c', 'd'):
+            localizer.translate(msgid)
+        info = localizer.cache_info()
+        self.assertEqual(info['entries'], 2)
+        self.assertEqual(info['evictions'], 2)
+
+    def test_pluralize_cached(self):
+        localizer, calls = self._makeCaching()
+        for i in range(3):
+            self.assertEqual(
+                localizer.pluralize('one', 'many', 2, domain='d',
+                                    mapping={'x': 2}),
+                'many')
+        self.assertEqual(localizer.pluralize('one', 'many', 1), 'one')
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(localizer.cache_info()['hits'], 2)
+
+    def test_pluralize_not_cached(self):
+        localizer, calls = self._makeCaching()
+        for i in range(2):
+            localizer.pluralize('one', 'many', 2, mapping={'x': [2]})
+            localizer.pluralize('one', 'many', 2.0)
+        self.assertEqual(len(calls), 4)
+
+    def test_cached_translate_real_translations(self):
+        from pyramid.i18n import make_localizer
+        localizer = make_localizer('de', [localedir], cache_size=10)
+        for i in range(2):
+            self.assertEqual(localizer.translate('Approve', 'deformsite'),
+                             'Genehmigen')
+            self.assertEqual(
+                localizer.translate('Add ${x}', mapping={'x': 'Item'}),
+                'Add Item')
+        self.assertEqual(localizer.cache_info()['hits'], 2)
+
 class Test_negotiate_locale_name(unittest.TestCase):
     def setUp(self):
         testing.setUp()
@@ -206,6 +330,76 @@ class Test_make_localizer(unittest.TestCase):
         self.assertEqual(result.translate('Approve', 'deformsite'),
                          'Genehmigen') # missing from de_DE locale, but in de
 
+class Test_find_translation_locales(unittest.TestCase):
+    def _callFUT(self, tdirs):
+        from pyramid.i18n import find_translation_locales
+        return find_translation_locales(tdirs)
+
+    def test_it(self):
+        # "be/LC_MESSAGES" is a file, not a directory
+        self.assertEqual(self._callFUT([localedir]), ['de', 'de_DE', 'en'])
+
+    def test_no_directories(self):
+        self.assertEqual(self._callFUT([]), [])
+
+class Test_preload_localizers(unittest.TestCase):
+    def setUp(self):
+        self.config = testing.setUp()
+
+    def tearDown(self):
+        testing.tearDown()
+
+    def _callFUT(self, *arg, **kw):
+        from pyramid.i18n import preload_localizers
+        return preload_localizers(self.config.registry, *arg, **kw)
+
+    def _registerTranslationDirs(self):
+        from pyramid.interfaces import ITranslationDirectories
+        self.config.registry.registerUtility(
+            [localedir], ITranslationDirectories)
+
+    def test_explicit_locales(self):
+        from pyramid.interfaces import ILocalizer
+        self._registerTranslationDirs()
+        result = self._callFUT(['de'])
+        self.assertEqual(list(result), ['de'])
+        self.assertEqual(list(result['de']), ['deformsite'])
+        self.assertTrue(result['de']['deformsite'] >= 0)
+        localizer = self.config.registry.getUtility(ILocalizer, name='de')
+        self.assertEqual(localizer.translate('Approve', 'deformsite'),
+                         'Genehmigen')
+        self.assertEqual(
+            self.config.registry.queryUtility(ILocalizer, name='en'), None)
+
+    def test_all_locales(self):
+        from pyramid.interfaces import ILocalizer
+        self._registerTranslationDirs()
+        result = self._callFUT()
+        self.assertEqual(sorted(result), ['de', 'de_DE', 'en'])
+        for locale_name in result:
+            self.assertTrue(self.config.registry.queryUtility(
+                ILocalizer, name=locale_name) is not None)
+
+    def test_threaded(self):
+        from pyramid.interfaces import ILocalizer
+        self._registerTranslationDirs()
+        result = self._callFUT(['de', 'de_DE', 'en', 'fr'], threads=3)
+        self.assertEqual(sorted(result), ['de', 'de_DE', 'en', 'fr'])
+        self.assertEqual(result['fr'], {})
+        localizer = self.config.registry.getUtility(ILocalizer, name='de_DE')
+        self.assertEqual(localizer.translate('Approve', 'deformsite'),
+                         'Genehmigen')
+
+    def test_already_loaded(self):
+        from pyramid.interfaces import ILocalizer
+        self._registerTranslationDirs()
+        dummy = object()
+        self.config.registry.registerUtility(dummy, ILocalizer, name='de')
+        result = self._callFUT(['de'])
+        self.assertEqual(result, {'de': {}})
+        self.assertTrue(
+            self.config.registry.getUtility(ILocalizer, name='de') is dummy)
+
 class Test_get_localizer(unittest.TestCase):
     def setUp(self):
         testing.setUp()
@@ -256,6 +450,119 @@ class Test_default_locale_negotiator(unittest.TestCase):
         result = self._callFUT(request)
         self.assertEqual(result, 'foo')
 
+class TestAcceptLanguageLocaleNegotiator(unittest.TestCase):
+    def _makeOne(self, *arg, **kw):
+        from pyramid.i18n import AcceptLanguageLocaleNegotiator
+        return AcceptLanguageLocaleNegotiator(*arg, **kw)
+
+    def _makeRequest(self, accept_language=None):
+        request = DummyBodylessRequest()
+        if accept_language is not None:
+            request.headers['Accept-Language'] = accept_language
+        return request
+
+    def test_from_none(self):
+        negotiator = self._makeOne(['en', 'de'])
+        self.assertEqual(negotiator(self._makeRequest()), None)
+
+    def test_from_request_attr(self):
+        negotiator = self._makeOne(['en', 'de'])
+        request = self._makeRequest('de')
+        request._LOCALE_ = 'foo'
+        self.assertEqual(negotiator(request), 'foo')
+
+    def test_from_query_string(self):
+        negotiator = self._makeOne(['en', 'de'])
+        request = self._makeRequest('de')
+        request.GET['_LOCALE_'] = 'foo'
+        request.cookies['_LOCALE_'] = 'bar'
+        self.assertEqual(negotiator(request), 'foo')
+
+    def test_from_cookies(self):
+        negotiator = self._makeOne(['en', 'de'])
+        request = self._makeRequest('de')
+        request.cookies['_LOCALE_'] = 'foo'
+        self.assertEqual(negotiator(request), 'foo')
+
+    def test_never_parses_body(self):
+        negotiator = self._makeOne(['en'])
+        request = self._makeRequest()
+        self.assertEqual(negotiator(request), None)
+        # DummyBodylessRequest.params raises when accessed
+        self.assertRaises(AssertionError, getattr, request, 'params')
+
+    def test_accept_language_exact(self):
+        negotiator = self._makeOne(['en', 'de'])
+        self.assertEqual(negotiator(self._makeRequest('de')), 'de')
+
+    def test_accept_language_quality_order(self):
+        negotiator = self._makeOne(['en', 'de', 'fr'])
+        request = self._makeRequest('en;q=0.5, fr;q=0.7, de;q=0.6')
+        self.assertEqual(negotiator(request), 'fr')
+
+    def test_accept_language_equal_quality_keeps_header_order(self):
+        negotiator = self._makeOne(['en', 'de'])
+        self.assertEqual(negotiator(self._makeRequest('de, en')), 'de')
+        self.assertEqual(negotiator(self._makeRequest('en, de')), 'en')
+
+    def test_accept_language_prefix_fallback(self):
+        negotiator = self._makeOne(['en', 'de'])
+        self.assertEqual(negotiator(self._makeRequest('de-CH, en;q=0.8')),
+                         'de')
+
+    def test_accept_language_territory(self):
+        negotiator = self._makeOne(['pt', 'pt_BR'])
+        self.assertEqual(negotiator(self._makeRequest('pt-br')), 'pt_BR')
+        self.assertEqual(negotiator(self._makeRequest('pt-PT')), 'pt')
+
+    def test_accept_language_ignores_zero_quality_and_wildcard(self):
+        negotiator = self._makeOne(['en', 'de'])
+        request = self._makeRequest('*, de;q=0, fr')
+        self.assertEqual(negotiator(request), None)
+
+    def test_accept_language_bad_quality(self):
+        negotiator = self._makeOne(['en', 'de'])
+        request = self._makeRequest('de;q=bogus, en;q=0.1')
+        self.assertEqual(negotiator(request), 'en')
+
+    def test_accept_language_no_available_locales(self):
+        negotiator = self._makeOne()
+        self.assertEqual(negotiator(self._makeRequest('de')), None)
+
+    def test_match_is_memoized(self):
+        negotiator = self._makeOne(['en', 'de'])
+        calls = []
+        original = negotiator._match
+        def _match(header):
+            calls.append(header)
+            return original(header)
+        negotiator._match = _match
+        self.assertEqual(negotiator.match('fr, de'), 'de')
+        self.assertEqual(negotiator.match('fr, de'), 'de')
+        self.assertEqual(negotiator.match('fr'), None)
+        self.assertEqual(negotiator.match('fr'), None)
+        self.assertEqual(calls, ['fr, de', 'fr'])
+
+    def test_match_cache_is_bounded(self):
+        negotiator = self._makeOne(['en'], cache_size=2)
+        for header in ('en', 'de', 'fr', 'it'):
+            negotiator.match(header)
+        self.assertEqual(len(negotiator._cache.data), 2)
+
+    def test_as_configured_negotiator(self):
+        from pyramid.i18n import negotiate_locale_name
+        from pyramid.interfaces import ILocaleNegotiator
+        config = testing.setUp()
+        try:
+            registry = config.registry
+            registry.registerUtility(self._makeOne(['en', 'de']),
+                                     ILocaleNegotiator)
+            request = self._makeRequest('de-AT')
+            request.registry = registry
+            self.assertEqual(negotiate_locale_name(request), 'de')
+        finally:
+            testing.tearDown()
+
 class TestTranslations(unittest.TestCase):
     def _getTargetClass(self):
         from pyramid.i18n import Translations
@@ -393,6 +700,302 @@ class TestTranslations(unittest.TestCase):
         result = t.dungettext('messages', 'foo1', 'foos1', 2)
         self.assertEqual(result, 'foos1')
 
+class TestMappedTranslations(unittest.TestCase):
+    def setUp(self):
+        import tempfile
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.tmpdir)
+
+    def _makeOne(self, messages, domain='messages', **kw):
+        from pyramid.i18n import MappedTranslations
+        path = self._writeMo(messages, **kw)
+        with open(path, 'rb') as fp:
+            return MappedTranslations(fp, domain)
+
+    def _writeMo(self, messages, name='messages.mo', **kw):
+        path = os.path.join(self.tmpdir, name)
+        with open(path, 'wb') as fp:
+            fp.write(_make_mo(messages, **kw))
+        return path
+
+    def _makeGNU(self, messages, **kw):
+        import gettext
+        path = self._writeMo(messages, name='gnu.mo', **kw)
+        with open(path, 'rb') as fp:
+            return gettext.GNUTranslations(fp)
+
+    def test_gettext_hash_table(self):
+        translations = self._makeOne(DUMMY_MESSAGES, hash_table=True)
+        self.assertEqual(translations.gettext('Approve'), 'Genehmigen')
+        self.assertEqual(translations.gettext('Delete'), u'L\xf6schen')
+        self.assertEqual(translations.gettext('missing'), 'missing')
+
+    def test_gettext_sorted_table(self):
+        translations = self._makeOne(DUMMY_MESSAGES, hash_table=False)
+        self.assertEqual(translations.gettext('Approve'), 'Genehmigen')
+        self.assertEqual(translations.gettext('Delete'), u'L\xf6schen')
+        self.assertEqual(translations.gettext('missing'), 'missing')
+        self.assertEqual(translations.gettext('A'), 'A')
+        self.assertEqual(translations.gettext('zzz'), 'zzz')
+
+    def test_gettext_big_endian(self):
+        translations = self._makeOne(DUMMY_MESSAGES, big_endian=True)
+        self.assertEqual(translations.gettext('Approve'), 'Genehmigen')
+
+    def test_gettext_context(self):
+        translations = self._makeOne(DUMMY_MESSAGES)
+        self.assertEqual(translations.gettext('verb\x04Open'), u'\xd6ffnen')
+        self.assertEqual(translations.gettext('Open'), 'Offen')
+
+    def test_gettext_plural_message(self):
+        translations = self._makeOne(DUMMY_MESSAGES)
+        self.assertEqual(translations.gettext('apple'), 'Apfel')
+
+    def test_ngettext(self):
+        translations = self._makeOne(DUMMY_MESSAGES)
+        self.assertEqual(translations.ngettext('apple', 'apples', 1), 'Apfel')
+        self.assertEqual(translations.ngettext('apple', 'apples', 2),
+                         u'\xc4pfel')
+        self.assertEqual(translations.ngettext('pear', 'pears', 1), 'pear')
+        self.assertEqual(translations.ngettext('pear', 'pears', 2), 'pears')
+        self.assertEqual(translations.ngettext('Approve', 'Approves', 2),
+                         'Approves')
+
+    def test_pgettext(self):
+        translations = self._makeOne(DUMMY_MESSAGES)
+        self.assertEqual(translations.pgettext('verb', 'Open'), u'\xd6ffnen')
+        self.assertEqual(translations.pgettext('noun', 'Open'), 'Open')
+
+    def test_npgettext(self):
+        messages = DUMMY_MESSAGES + [
+            (('fruit\x04apple', 'apples'), ('Frucht', u'Fr\xfcchte'))]
+        translations = self._makeOne(messages)
+        self.assertEqual(
+            translations.npgettext('fruit', 'apple', 'apples', 1), 'Frucht')
+        self.assertEqual(
+            translations.npgettext('fruit', 'apple', 'apples', 2),
+            u'Fr\xfcchte')
+        self.assertEqual(
+            translations.npgettext('verb', 'Open', 'Opens', 1), 'Open')
+        self.assertEqual(
+            translations.npgettext('noun', 'Open', 'Opens', 2), 'Opens')
+
+    def test_pgettext_fallback(self):
+        from pyramid.i18n import MappedTranslations
+        translations = MappedTranslations()
+        translations.add_fallback(self._makeOne(DUMMY_MESSAGES))
+        self.assertEqual(translations.pgettext('verb', 'Open'), u'\xd6ffnen')
+        self.assertEqual(
+            translations.npgettext('noun', 'Open', 'Opens', 2), 'Opens')
+
+    def test_no_file_descriptors_kept_open(self):
+        fddir = '/proc/self/fd'
+        if not os.path.isdir(fddir): # pragma: no cover
+            return
+        path = self._writeMo(DUMMY_MESSAGES)
+        from pyramid.i18n import MappedTranslations
+        before = len(os.listdir(fddir))
+        catalogs = []
+        for i in range(20):
+            with open(path, 'rb') as fp:
+                catalogs.append(MappedTranslations(fp))
+        self.assertEqual(len(os.listdir(fddir)), before)
+        self.assertEqual(catalogs[-1].gettext('Approve'), 'Genehmigen')
+
+    def test_metadata(self):
+        translations = self._makeOne(DUMMY_MESSAGES)
+        self.assertEqual(translations._charset, 'utf-8')
+        self.assertEqual(translations._info['language'], 'de')
+        self.assertEqual(translations.plural(1), 0)
+        self.assertEqual(translations.plural(5), 1)
+        self.assertEqual(repr(translations),
+                         '<MappedTranslations: "dummy 1.0">')
+
+    def test_matches_GNUTranslations(self):
+        import random
+        rand = random.Random(42)
+        words = ['w%d' % i for i in range(300)] + [u'\xfc%d' % i
+                                                   for i in range(20)]
+        messages = [('', DUMMY_MESSAGES[0][1])]
+        plurals = set()
+        for word in rand.sample(words, 200):
+            if rand.random() < 0.2:
+                plurals.add(word)
+                messages.append(((word, word + 's'),
+                                 (word.upper(), word.upper() + 'S')))
+            else:
+                messages.append((word, word.upper()))
+        for hash_table in (True, False):
+            mapped = self._makeOne(messages, hash_table=hash_table)
+            gnu = self._makeGNU(messages, hash_table=hash_table)
+            for word in words:
+                # GNUTranslations.gettext only finds the singular form of
+                # plural messages on newer Pythons
+                if word not in plurals:
+                    self.assertEqual(mapped.gettext(word), gnu.gettext(word))
+                for n in (0, 1, 2):
+                    self.assertEqual(
+                        mapped.ngettext(word, word + 's', n),
+                        gnu.ngettext(word, word + 's', n))
+
+    def test_lookups_are_cached(self):
+        translations = self._makeOne(DUMMY_MESSAGES)
+        catalog = translations._catalogs[0]
+        calls = []
+        find = catalog.find
+        def dummy_find(message):
+            calls.append(message)
+            return find(message)
+        catalog.find = dummy_find
+        translations.gettext('Approve')
+        translations.gettext('Approve')
+        translations.gettext('missing')
+        translations.gettext('missing')
+        self.assertEqual(calls, ['Approve', 'missing'])
+
+    def test_merge(self):
+        from pyramid.i18n import MappedTranslations
+        translations = self._makeOne(DUMMY_MESSAGES)
+        path = self._writeMo([('', DUMMY_MESSAGES[0][1]),
+                              ('Approve', 'Freigeben')], name='other.mo')
+        translations.gettext('Approve') # populate the cache
+        with open(path, 'rb') as fp:
+            other = MappedTranslations(fp)
+        self.assertTrue(translations.merge(other) is translations)
+        self.assertEqual(translations.gettext('Approve'), 'Freigeben')
+        self.assertEqual(translations.gettext('Open'), 'Offen')
+        self.assertEqual(translations.files[-1], path)
+
+    def test_add_domain(self):
+        from pyramid.i18n import MappedTranslations
+        translations = MappedTranslations()
+        domain = self._makeOne(DUMMY_MESSAGES, domain='deformsite')
+        translations.add(domain)
+        self.assertEqual(translations.dugettext('deformsite', 'Approve'),
+                         'Genehmigen')
+        self.assertEqual(translations.dugettext('other', 'Approve'),
+                         'Approve')
+        self.assertEqual(
+            translations.dungettext('deformsite', 'apple', 'apples', 2),
+            u'\xc4pfel')
+
+    def test_not_a_file_object(self):
+        from io import BytesIO
+        from pyramid.i18n import MappedTranslations
+        fp = BytesIO(_make_mo(DUMMY_MESSAGES))
+        translations = MappedTranslations(fp)
+        self.assertEqual(translations.gettext('Approve'), 'Genehmigen')
+
+    def test_bad_magic(self):
+        from io import BytesIO
+        from pyramid.i18n import MappedTranslations
+        self.assertRaises(IOError, MappedTranslations, BytesIO(b''))
+        self.assertRaises(IOError, MappedTranslations, BytesIO(b'x' * 28))
+
+    def test_corrupt(self):
+        from io import BytesIO
+        from pyramid.i18n import MappedTranslations
+        data = _make_mo(DUMMY_MESSAGES)
+        self.assertRaises(IOError, MappedTranslations,
+                          BytesIO(data[:40]))
+
+    def test_localizer(self):
+        from pyramid.i18n import make_localizer
+        from pyramid.i18n import MappedTranslations
+        localizer = make_localizer('de_DE', [localedir], mapped=True)
+        self.assertTrue(isinstance(localizer.translations,
+                                   MappedTranslations))
+        self.assertEqual(localizer.translate('Approve', 'deformsite'),
+                         'Genehmigen')
+        self.assertEqual(localizer.translate('Approve'), 'Approve')
+        self.assertEqual(
+            localizer.pluralize('Approve', 'Approves', 2, 'deformsite'),
+            'Approves')
+
+    def test_localizer_from_settings(self):
+        from pyramid.interfaces import ITranslationDirectories
+        from pyramid.i18n import LocalizerRequestMixin
+        from pyramid.i18n import MappedTranslations
+        config = testing.setUp(settings={'pyramid.mmap_translations': True})
+        try:
+            config.registry.registerUtility(
+                [localedir], ITranslationDirectories)
+            request = LocalizerRequestMixin()
+            request.registry = config.registry
+            request._LOCALE_ = 'de'
+            localizer = request.localizer
+            self.assertTrue(isinstance(localizer.translations,
+                                       MappedTranslations))
+            self.assertEqual(localizer.translate('Approve', 'deformsite'),
+                             'Genehmigen')
+        finally:
+            testing.tearDown()
+
+DUMMY_MESSAGES = [
+    ('', 'Project-Id-Version: dummy 1.0\n'
+         'Language: de\n'
+         'Content-Type: text/plain; charset=utf-8\n'
+         'Plural-Forms: nplurals=2; plural=(n != 1);\n'),
+    ('Approve', 'Genehmigen'),
+    ('Delete', u'L\xf6schen'),
+    ('Open', 'Offen'),
+    ('verb\x04Open', u'\xd6ffnen'),
+    (('apple', 'apples'), ('Apfel', u'\xc4pfel')),
+    ]
+
+def _make_mo(messages, hash_table=True, big_endian=False):
+    # Write a .mo file; like GNU msgfmt (and unlike Babel or msgfmt.py)
+    # include a hash table if ``hash_table`` is true
+    import struct
+    from pyramid.i18n import _hashpjw
+    entries = []
+    for msgid, msgstr in messages:
+        if isinstance(msgid, tuple):
+            msgid = u'\0'.join(msgid)
+            msgstr = u'\0'.join(msgstr)
+        entries.append((msgid.encode('utf-8'), msgstr.encode('utf-8')))
+    entries.sort()
+    count = len(entries)
+    order = '>' if big_endian else '<'
+    hash_size = 0
+    if hash_table:
+        hash_size = max(3, count * 4 // 3 + 1)
+        while any(hash_size % i == 0 for i in range(2, hash_size)):
+            hash_size += 1
+    originals_offset = 28
+    translations_offset = originals_offset + count * 8
+    hash_offset = translations_offset + count * 8
+    data_offset = hash_offset + hash_size * 4
+    table = [0] * hash_size
+    for index, (msgid, msgstr) in enumerate(entries):
+        if not hash_size:
+            break
+        hval = _hashpjw(msgid.split(b'\0')[0])
+        idx = hval % hash_size
+        incr = 1 + (hval % (hash_size - 2))
+        while table[idx]:
+            idx = (idx + incr) % hash_size
+        table[idx] = index + 1
+    originals = []
+    translations = []
+    data = b''
+    for msgid, msgstr in entries:
+        originals.append((len(msgid), data_offset + len(data)))
+        data += msgid + b'\0'
+    for msgid, msgstr in entries:
+        translations.append((len(msgstr), data_offset + len(data)))
+        data += msgstr + b'\0'
+    out = struct.pack(order + '7I', 0x950412de, 0, count, originals_offset,
+                      translations_offset, hash_size, hash_offset)
+    for length, offset in originals + translations:
+        out += struct.pack(order + 'II', length, offset)
+    for slot in table:
+        out += struct.pack(order + 'I', slot)
+    return out + data
+
 class TestLocalizerRequestMixin(unittest.TestCase):
     def setUp(self):
         self.config = testing.setUp()
@@ -445,6 +1048,48 @@ class TestLocalizerRequestMixin(unittest.TestCase):
         self.assertEqual(result.translate('Approve'), 'Approve')
         self.assertTrue(hasattr(result, 'pluralize'))
 
+    def test_localizer_built_once_when_concurrent(self):
+        import threading
+        from pyramid import i18n
+        from pyramid.interfaces import ITranslationDirectories
+        self.config.registry.registerUtility(
+            [localedir], ITranslationDirectories)
+        calls = []
+        started = threading.Event()
+        release = threading.Event()
+        original = i18n._make_localizer
+        def _make_localizer(*arg, **kw):
+            calls.append(arg[0])
+            started.set()
+            release.wait(5)
+            return original(*arg, **kw)
+        i18n._make_localizer = _make_localizer
+        try:
+            results = []
+            def run():
+                request = self._makeOne()
+                request._LOCALE_ = 'de'
+                results.append(request.localizer)
+            threads = [threading.Thread(target=run) for i in range(4)]
+            threads[0].start()
+            started.wait(5)
+            for thread in threads[1:]:
+                thread.start()
+            release.set()
+            for thread in threads:
+                thread.join(5)
+        finally:
+            i18n._make_localizer = original
+        self.assertEqual(calls, ['de'])
+        self.assertEqual(len(results), 4)
+        self.assertTrue(all(result is results[0] for result in results))
+        self.assertEqual(i18n._localizer_locks, {})
+
+    def test_localizer_cache_size_from_settings(self):
+        self.config.registry.settings = {'pyramid.localizer_cache_size': 50}
+        request = self._makeOne()
+        self.assertEqual(request.localizer.cache_info()['size'], 50)
+
     def test_localizer_from_mo_bad_mo(self):
         from pyramid.interfaces import ITranslationDirectories
         from pyramid.i18n import Localizer
@@ -463,6 +1108,16 @@ class DummyRequest(object):
         self.params = {}
         self.cookies = {}
 
+class DummyBodylessRequest(object):
+    def __init__(self):
+        self.GET = {}
+        self.cookies = {}
+        self.headers = {}
+
+    @property
+    def params(self):
+        raise AssertionError('request.params should not be accessed')
+
 def dummy_negotiator(request):
     return 'bogus'
 
@@ -293,6 +293,34 @@ class TestRequest(unittest.TestCase):
         request.registry.registerAdapter(adapter, (Foo,), IResponse)
         self.assertEqual(request.is_response(foo), True)
 
+    def test_application_url_memoized(self):
+        environ = {
+            'wsgi.url_scheme':'http',
+            'SERVER_NAME':'example.com',
+            'SERVER_PORT':'80',
+            'SCRIPT_NAME':'/app',
+            }
+        inst = self._makeOne(environ)
+        self.assertEqual(inst.application_url, 'http://example.com/app')
+        inst._app_url_memo()[None] = 'http://cached'
+        self.assertEqual(inst.application_url, 'http://cached')
+
+    def test_application_url_memo_reset_on_environ_change(self):
+        environ = {
+            'wsgi.url_scheme':'http',
+            'SERVER_NAME':'example.com',
+            'SERVER_PORT':'80',
+            }
+        inst = self._makeOne(environ)
+        self.assertEqual(inst.application_url, 'http://example.com')
+        inst.script_name = '/app'
+        self.assertEqual(inst.application_url, 'http://example.com/app')
+        inst.host = 'other.com:8080'
+        self.assertEqual(inst.application_url, 'http://other.com:8080/app')
+        inst.scheme = 'https'
+        self.assertEqual(inst.application_url,
+                         'https://other.com:8080/app')
+
     def test_json_body_invalid_json(self):
         request = self._makeOne({'REQUEST_METHOD':'POST'})
         request.body = b'{'
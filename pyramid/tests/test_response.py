@@ -80,6 +80,159 @@ class TestFileResponse(unittest.TestCase):
         finally:
             response.mimetypes = old_mimetypes
 
+    def test_without_file_wrapper(self):
+        from pyramid.request import Request
+        from pyramid.response import FileIter
+        from pyramid.response import ZeroCopyFileIter
+        path = self._getPath('pdf')
+        r = self._makeOne(path, request=Request.blank('/'))
+        self.assertTrue(isinstance(r.app_iter, FileIter))
+        self.assertFalse(isinstance(r.app_iter, ZeroCopyFileIter))
+        with open(path, 'rb') as f:
+            self.assertEqual(r.body, f.read())
+
+    def test_zero_copy(self):
+        from pyramid.request import Request
+        from pyramid.response import ZeroCopyFileIter
+        path = self._getPath('pdf')
+        r = self._makeOne(path, request=Request.blank('/'), zero_copy=True)
+        self.assertTrue(isinstance(r.app_iter, ZeroCopyFileIter))
+        self.assertEqual(r.app_iter.offset, 0)
+        self.assertEqual(r.app_iter.count, os.path.getsize(path))
+        with open(path, 'rb') as f:
+            self.assertEqual(r.body, f.read())
+
+    def test_with_file_wrapper(self):
+        from pyramid.request import Request
+        path = self._getPath('pdf')
+        request = Request.blank(
+            '/', environ={'wsgi.file_wrapper': DummyFileWrapper})
+        r = self._makeOne(path, request=request)
+        self.assertTrue(isinstance(r.app_iter, DummyFileWrapper))
+        r.app_iter.file.close()
+
+    def test_content_etag(self):
+        import hashlib
+        path = self._getPath('pdf')
+        r = self._makeOne(path, content_etag=True)
+        with open(path, 'rb') as f:
+            self.assertEqual(r.etag, hashlib.sha1(f.read()).hexdigest())
+        r.app_iter.close()
+
+    def test_content_etag_not_modified(self):
+        from pyramid.request import Request
+        path = self._getPath('pdf')
+        r = self._makeOne(path, content_etag=True)
+        r.app_iter.close()
+        request = Request.blank('/', if_none_match=r.etag)
+        r = self._makeOne(path, request=request, content_etag=True)
+        self.assertEqual(r.status, '304 Not Modified')
+        self.assertEqual(r._file, None)
+        self.assertTrue(r.last_modified)
+        start_response = DummyStartResponse()
+        app_iter = r(request.environ, start_response)
+        self.assertEqual(start_response.status, '304 Not Modified')
+        self.assertEqual(list(app_iter), [])
+
+    def test_content_etag_modified(self):
+        from pyramid.request import Request
+        path = self._getPath('pdf')
+        request = Request.blank('/', if_none_match='"abc"')
+        r = self._makeOne(path, request=request, content_etag=True)
+        self.assertEqual(r.status, '200 OK')
+        r.app_iter.close()
+
+    def test_content_etag_not_modified_post(self):
+        from pyramid.request import Request
+        path = self._getPath('pdf')
+        r = self._makeOne(path, content_etag=True)
+        r.app_iter.close()
+        request = Request.blank('/', if_none_match=r.etag, method='POST')
+        r = self._makeOne(path, request=request, content_etag=True)
+        self.assertEqual(r.status, '200 OK')
+        r.app_iter.close()
+
+    def _getRangeResponse(self, range, zero_copy=False, **environ):
+        from pyramid.request import Request
+        path = self._getPath('pdf')
+        with open(path, 'rb') as f:
+            data = f.read()
+        request = Request.blank('/', environ=environ)
+        if range is not None:
+            request.range = range
+        r = self._makeOne(path, request=request, zero_copy=zero_copy)
+        start_response = DummyStartResponse()
+        app_iter = r(request.environ, start_response)
+        return data, start_response, app_iter
+
+    def test_range(self):
+        data, start_response, app_iter = self._getRangeResponse((10, 20))
+        try:
+            self.assertEqual(start_response.status, '206 Partial Content')
+            self.assertEqual(b''.join(app_iter), data[10:20])
+            self.assertEqual(dict(start_response.headers)['Content-Range'],
+                             'bytes 10-19/%d' % len(data))
+        finally:
+            app_iter.close()
+        self.assertTrue(app_iter.file.file.closed)
+
+    def test_range_zero_copy(self):
+        from pyramid.response import ZeroCopyFileIter
+        data, start_response, app_iter = self._getRangeResponse(
+            (10, 20), zero_copy=True)
+        try:
+            self.assertEqual(start_response.status, '206 Partial Content')
+            self.assertTrue(isinstance(app_iter, ZeroCopyFileIter))
+            self.assertEqual(app_iter.offset, 10)
+            self.assertEqual(app_iter.count, 10)
+            self.assertEqual(b''.join(app_iter), data[10:20])
+            self.assertEqual(dict(start_response.headers)['Content-Range'],
+                             'bytes 10-19/%d' % len(data))
+        finally:
+            app_iter.close()
+        self.assertTrue(app_iter.file.closed)
+
+    def test_range_suffix(self):
+        data, start_response, app_iter = self._getRangeResponse((-5, None))
+        try:
+            self.assertEqual(b''.join(app_iter), data[-5:])
+        finally:
+            app_iter.close()
+
+    def test_range_multiple_serves_first(self):
+        data, start_response, app_iter = self._getRangeResponse(
+            None, HTTP_RANGE='bytes=3-5, 10-20')
+        try:
+            self.assertEqual(start_response.status, '206 Partial Content')
+            self.assertEqual(b''.join(app_iter), data[3:6])
+        finally:
+            app_iter.close()
+
+    def test_range_file_wrapper(self):
+        data, start_response, app_iter = self._getRangeResponse(
+            (10, 20), **{'wsgi.file_wrapper': DummyFileWrapper})
+        try:
+            self.assertTrue(isinstance(app_iter, DummyFileWrapper))
+            self.assertEqual(app_iter.block_size, 4096 * 64)
+            # a server sending from the file descriptor starts at the range
+            self.assertEqual(
+                os.lseek(app_iter.file.fileno(), 0, os.SEEK_CUR), 10)
+            # a server reading the file stops at the end of the range
+            self.assertEqual(app_iter.file.read(), data[10:20])
+        finally:
+            app_iter.file.close()
+
+    def test_range_body_replaced(self):
+        from pyramid.request import Request
+        request = Request.blank('/', range=(1, 3))
+        r = self._makeOne(self._getPath('pdf'), request=request)
+        r.app_iter.close()
+        r.body = b'abcdef'
+        start_response = DummyStartResponse()
+        app_iter = r(request.environ, start_response)
+        self.assertEqual(start_response.status, '206 Partial Content')
+        self.assertEqual(b''.join(app_iter), b'bc')
+
 class TestFileIter(unittest.TestCase):
     def _makeOne(self, file, block_size):
         from pyramid.response import FileIter
@@ -106,6 +259,247 @@ class TestFileIter(unittest.TestCase):
         inst.close()
         self.assertTrue(f.closed)
 
+    def test_app_iter_range(self):
+        f = io.BytesIO(b'abcdefghij')
+        inst = self._makeOne(f, 2)
+        result = inst.app_iter_range(3, 8)
+        self.assertEqual(list(result), [b'de', b'fg', b'h'])
+        result.close()
+        self.assertTrue(f.closed)
+
+    def test_app_iter_range_to_end(self):
+        f = io.BytesIO(b'abcdefghij')
+        inst = self._makeOne(f, 4)
+        result = inst.app_iter_range(7, None)
+        self.assertEqual(list(result), [b'hij'])
+
+    def test_app_iter_range_not_seekable(self):
+        class Unseekable(object):
+            def __init__(self, data):
+                self.f = io.BytesIO(data)
+                self.read = self.f.read
+            def close(self):
+                self.f.close()
+        f = Unseekable(b'abcdefghij')
+        inst = self._makeOne(f, 4)
+        result = inst.app_iter_range(3, 8)
+        self.assertEqual(b''.join(result), b'defgh')
+        result.close()
+        self.assertTrue(f.f.closed)
+
+class TestZeroCopyFileIter(unittest.TestCase):
+    def setUp(self):
+        import tempfile
+        self.tempdir = tempfile.mkdtemp()
+        self.data = os.urandom(100000)
+        self.path = os.path.join(self.tempdir, 'data.bin')
+        with open(self.path, 'wb') as f:
+            f.write(self.data)
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.tempdir)
+
+    def _getTargetClass(self):
+        from pyramid.response import ZeroCopyFileIter
+        return ZeroCopyFileIter
+
+    def _makeOne(self, block_size=4096, start=0, stop=None, mmap=True,
+                 window=None, path=None):
+        klass = self._getTargetClass()
+        class ZeroCopyFileIter(klass):
+            mmap_threshold = 0 if mmap else 1 << 62
+            mmap_window = window or klass.mmap_window
+        self.file = open(path or self.path, 'rb')
+        return ZeroCopyFileIter(self.file, block_size, start, stop)
+
+    def test_ctor_defaults(self):
+        klass = self._getTargetClass()
+        with open(self.path, 'rb') as f:
+            inst = klass(f)
+            self.assertEqual(inst.block_size, 4096 * 64)
+            self.assertEqual(inst.offset, 0)
+            self.assertEqual(inst.count, 100000)
+            self.assertEqual(inst.fileno(), f.fileno())
+            self.assertEqual(b''.join(inst), self.data)
+            # smaller than mmap_threshold
+            self.assertEqual(inst._mmap, None)
+
+    def test_iteration_mmap(self):
+        inst = self._makeOne()
+        try:
+            chunks = list(inst)
+        finally:
+            inst.close()
+        self.assertEqual(len(chunks), 25)
+        self.assertEqual(len(chunks[0]), 4096)
+        self.assertEqual(b''.join(chunks), self.data)
+        self.assertTrue(self.file.closed)
+
+    def test_iteration_mmap_windows(self):
+        import mmap
+        window = mmap.ALLOCATIONGRANULARITY
+        inst = self._makeOne(block_size=3000, window=window)
+        try:
+            self.assertEqual(b''.join(inst), self.data)
+            self.assertTrue(len(inst._mmap) <= window)
+        finally:
+            inst.close()
+        self.assertEqual(inst._mmap, None)
+
+    def test_iteration_mmap_range(self):
+        inst = self._makeOne(start=5000, stop=70001)
+        try:
+            self.assertEqual(b''.join(inst), self.data[5000:70001])
+        finally:
+            inst.close()
+
+    def test_iteration_read(self):
+        inst = self._makeOne(mmap=False, start=5000, stop=70001)
+        try:
+            self.assertEqual(b''.join(inst), self.data[5000:70001])
+            self.assertEqual(inst._mmap, None)
+        finally:
+            inst.close()
+
+    def test_iteration_mmap_fails(self):
+        path = os.path.join(self.tempdir, 'empty.bin')
+        open(path, 'wb').close()
+        inst = self._makeOne(path=path, stop=10)
+        try:
+            self.assertEqual(list(inst), [])
+            self.assertFalse(inst._use_mmap)
+        finally:
+            inst.close()
+
+    def test_truncated_before_iteration(self):
+        inst = self._makeOne(mmap=False)
+        try:
+            with open(self.path, 'wb') as f:
+                f.write(b'abc')
+            self.assertEqual(list(inst), [b'abc'])
+        finally:
+            inst.close()
+
+    def test_app_iter_range(self):
+        inst = self._makeOne(start=1000, stop=9000)
+        result = inst.app_iter_range(10, 20)
+        try:
+            self.assertTrue(isinstance(result, self._getTargetClass()))
+            self.assertEqual(result.offset, 1010)
+            self.assertEqual(result.count, 10)
+            self.assertEqual(b''.join(result), self.data[1010:1020])
+        finally:
+            result.close()
+
+    def test_app_iter_range_to_end(self):
+        inst = self._makeOne(start=1000, stop=9000)
+        result = inst.app_iter_range(7990, None)
+        try:
+            self.assertEqual(b''.join(result), self.data[8990:9000])
+        finally:
+            result.close()
+
+    def test_app_iter_range_past_stop(self):
+        inst = self._makeOne(start=1000, stop=9000)
+        result = inst.app_iter_range(7990, 9000)
+        try:
+            self.assertEqual(result.count, 10)
+        finally:
+            result.close()
+
+class Test_content_hash(unittest.TestCase):
+    def setUp(self):
+        import tempfile
+        self.tempdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tempdir, 'data.txt')
+        self._write(b'abc')
+
+    def tearDown(self):
+        import shutil
+        from pyramid.response import _content_hashes
+        _content_hashes.clear()
+        shutil.rmtree(self.tempdir)
+
+    def _write(self, data, mtime=1000000000):
+        with open(self.path, 'wb') as f:
+            f.write(data)
+        os.utime(self.path, (mtime, mtime))
+
+    def _callFUT(self, path, st=None):
+        from pyramid.response import _content_hash
+        return _content_hash(path, st)
+
+    def test_it(self):
+        import hashlib
+        result = self._callFUT(self.path)
+        self.assertEqual(result, hashlib.sha1(b'abc').hexdigest())
+
+    def test_with_stat(self):
+        import hashlib
+        result = self._callFUT(self.path, os.stat(self.path))
+        self.assertEqual(result, hashlib.sha1(b'abc').hexdigest())
+
+    def test_cached_per_size_and_mtime(self):
+        import hashlib
+        self._callFUT(self.path)
+        self._write(b'def')
+        result = self._callFUT(self.path)
+        self.assertEqual(result, hashlib.sha1(b'abc').hexdigest())
+        self._write(b'def', 1000000001)
+        result = self._callFUT(self.path)
+        self.assertEqual(result, hashlib.sha1(b'def').hexdigest())
+        self._write(b'defg', 1000000001)
+        result = self._callFUT(self.path)
+        self.assertEqual(result, hashlib.sha1(b'defg').hexdigest())
+
+class Test_FileRange(unittest.TestCase):
+    def _makeOne(self, file, start, stop):
+        from pyramid.response import _FileRange
+        return _FileRange(file, start, stop)
+
+    def test_read(self):
+        inst = self._makeOne(io.BytesIO(b'abcdefghij'), 2, 6)
+        self.assertEqual(inst.tell(), 2)
+        self.assertEqual(inst.read(3), b'cde')
+        self.assertEqual(inst.read(3), b'f')
+        self.assertEqual(inst.read(3), b'')
+
+    def test_read_all(self):
+        inst = self._makeOne(io.BytesIO(b'abcdefghij'), 2, 6)
+        self.assertEqual(inst.read(), b'cdef')
+        inst.seek(3)
+        self.assertEqual(inst.read(None), b'def')
+
+    def test_read_no_stop(self):
+        inst = self._makeOne(io.BytesIO(b'abcdefghij'), 2, None)
+        self.assertEqual(inst.read(3), b'cde')
+        self.assertEqual(inst.read(), b'fghij')
+
+    def test_seek_end(self):
+        inst = self._makeOne(io.BytesIO(b'abcdefghij'), 2, 6)
+        inst.seek(0, 2)
+        self.assertEqual(inst.tell(), 10)
+        self.assertEqual(inst.read(), b'')
+
+    def test_fileno(self):
+        class NoFileno(object):
+            def seek(self, offset):
+                pass
+        inst = self._makeOne(NoFileno(), 0, 1)
+        self.assertFalse(hasattr(inst, 'fileno'))
+        path = os.path.join(os.path.dirname(__file__), 'fixtures',
+                            'minimal.txt')
+        with open(path, 'rb') as f:
+            inst = self._makeOne(f, 0, 1)
+            self.assertEqual(inst.fileno(), f.fileno())
+
+    def test_close(self):
+        f = io.BytesIO(b'abc')
+        inst = self._makeOne(f, 0, 1)
+        inst.close()
+        self.assertTrue(f.closed)
+
 class Test_patch_mimetypes(unittest.TestCase):
     def _callFUT(self, module):
         from pyramid.response import init_mimetypes
@@ -195,6 +589,18 @@ class DummyConfigurator(object):
     def add_response_adapter(self, wrapped, type_or_iface):
         self.adapters.append((wrapped, type_or_iface))
 
+class DummyStartResponse(object):
+    status = ()
+    headers = ()
+    def __call__(self, status, headers):
+        self.status = status
+        self.headers = headers
+
+class DummyFileWrapper(object):
+    def __init__(self, file, block_size):
+        self.file = file
+        self.block_size = block_size
+
 class DummyVenusian(object):
     def __init__(self):
         self.attached = []
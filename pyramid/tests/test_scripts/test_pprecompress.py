@@ -0,0 +1,190 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+class TestPPrecompressCommand(unittest.TestCase):
+    def setUp(self):
+        self.docroot = tempfile.mkdtemp()
+        os.mkdir(os.path.join(self.docroot, 'css'))
+        self.js = b'function foo() { return "bar"; }\n' * 100
+        self._write('app.js', self.js)
+        self._write('css/site.css', b'body { color: red; }\n' * 100)
+        self._write('tiny.js', b'x=1;')
+        self._write('image.png', b'\x89PNG' * 100)
+        self._write('archive.tar.gz', b'x' * 1000)
+
+    def tearDown(self):
+        shutil.rmtree(self.docroot)
+
+    def _write(self, name, content):
+        with open(os.path.join(self.docroot, name), 'wb') as f:
+            f.write(content)
+
+    def _exists(self, name):
+        return os.path.exists(os.path.join(self.docroot, name))
+
+    def _getTargetClass(self):
+        from pyramid.scripts.pprecompress import PPrecompressCommand
+        return PPrecompressCommand
+
+    def _makeOne(self, *args):
+        cmd = self._getTargetClass()(['pprecompress'] + list(args))
+        self.out = []
+        cmd.out = self.out.append
+        return cmd
+
+    def test_no_args(self):
+        command = self._makeOne()
+        result = command.run()
+        self.assertEqual(result, 2)
+        self.assertEqual(self.out, ['Requires at least one directory argument'])
+
+    def test_not_a_directory(self):
+        path = os.path.join(self.docroot, 'app.js')
+        command = self._makeOne(path)
+        result = command.run()
+        self.assertEqual(result, 2)
+        self.assertEqual(self.out, ['%s is not a directory' % path])
+
+    def test_brotli_not_installed(self):
+        from pyramid.scripts import pprecompress
+        command = self._makeOne('-e', 'br', self.docroot)
+        old_brotli = pprecompress.brotli
+        pprecompress.brotli = None
+        try:
+            result = command.run()
+        finally:
+            pprecompress.brotli = old_brotli
+        self.assertEqual(result, 2)
+        self.assertFalse(self._exists('app.js.br'))
+
+    def test_gzip(self):
+        import gzip
+        command = self._makeOne('-e', 'gzip', '-j', '1', self.docroot)
+        result = command.run()
+        self.assertEqual(result, 0)
+        self.assertTrue(self._exists('app.js.gz'))
+        self.assertTrue(self._exists('css/site.css.gz'))
+        self.assertFalse(self._exists('tiny.js.gz'))
+        self.assertFalse(self._exists('image.png.gz'))
+        self.assertFalse(self._exists('archive.tar.gz.gz'))
+        self.assertFalse(self._exists('app.js.br'))
+        f = gzip.open(os.path.join(self.docroot, 'app.js.gz'))
+        try:
+            self.assertEqual(f.read(), self.js)
+        finally:
+            f.close()
+        self.assertTrue(self.out[-1].startswith('Wrote 2 precompressed files'))
+
+    def test_brotli(self):
+        from pyramid.scripts import pprecompress
+        command = self._makeOne('-e', 'br', '-j', '1', self.docroot)
+        old_brotli = pprecompress.brotli
+        pprecompress.brotli = DummyBrotli()
+        try:
+            result = command.run()
+        finally:
+            pprecompress.brotli = old_brotli
+        self.assertEqual(result, 0)
+        self.assertFalse(self._exists('app.js.gz'))
+        with open(os.path.join(self.docroot, 'app.js.br'), 'rb') as f:
+            self.assertEqual(f.read(), b'brotli')
+
+    def test_default_encodings(self):
+        from pyramid.scripts import pprecompress
+        command = self._makeOne('-j', '1', self.docroot)
+        old_brotli = pprecompress.brotli
+        pprecompress.brotli = DummyBrotli()
+        try:
+            result = command.run()
+        finally:
+            pprecompress.brotli = old_brotli
+        self.assertEqual(result, 0)
+        self.assertTrue(self._exists('app.js.gz'))
+        self.assertTrue(self._exists('app.js.br'))
+
+    def test_default_encodings_without_brotli(self):
+        from pyramid.scripts import pprecompress
+        command = self._makeOne('-j', '1', self.docroot)
+        old_brotli = pprecompress.brotli
+        pprecompress.brotli = None
+        try:
+            result = command.run()
+        finally:
+            pprecompress.brotli = old_brotli
+        self.assertEqual(result, 0)
+        self.assertTrue(self._exists('app.js.gz'))
+        self.assertFalse(self._exists('app.js.br'))
+
+    def test_min_size(self):
+        command = self._makeOne('-e', 'gzip', '-j', '1', '-m', '1',
+                                self.docroot)
+        command.run()
+        # compressing 4 bytes makes them larger, so no variant is kept
+        self.assertFalse(self._exists('tiny.js.gz'))
+        self.assertTrue(self._exists('app.js.gz'))
+
+    def test_larger_variant_removed(self):
+        self._write('tiny.js.gz', b'stale')
+        command = self._makeOne('-e', 'gzip', '-j', '1', '-m', '1', '-f',
+                                self.docroot)
+        command.run()
+        self.assertFalse(self._exists('tiny.js.gz'))
+
+    def test_up_to_date_skipped(self):
+        self._write('app.js.gz', b'current')
+        command = self._makeOne('-e', 'gzip', '-j', '1', self.docroot)
+        command.run()
+        with open(os.path.join(self.docroot, 'app.js.gz'), 'rb') as f:
+            self.assertEqual(f.read(), b'current')
+        self.assertTrue(self.out[-1].startswith('Wrote 1 precompressed files'))
+
+    def test_out_of_date_recompressed(self):
+        self._write('app.js.gz', b'stale')
+        path = os.path.join(self.docroot, 'app.js.gz')
+        mtime = os.path.getmtime(path) - 10
+        os.utime(path, (mtime, mtime))
+        command = self._makeOne('-e', 'gzip', '-j', '1', self.docroot)
+        command.run()
+        with open(path, 'rb') as f:
+            self.assertNotEqual(f.read(), b'stale')
+
+    def test_force(self):
+        self._write('app.js.gz', b'current')
+        command = self._makeOne('-e', 'gzip', '-j', '1', '-f', self.docroot)
+        command.run()
+        with open(os.path.join(self.docroot, 'app.js.gz'), 'rb') as f:
+            self.assertNotEqual(f.read(), b'current')
+
+    def test_parallel(self):
+        command = self._makeOne('-e', 'gzip', '-j', '2', self.docroot)
+        result = command.run()
+        self.assertEqual(result, 0)
+        self.assertTrue(self._exists('app.js.gz'))
+        self.assertTrue(self._exists('css/site.css.gz'))
+
+class Test_gzip_compress(unittest.TestCase):
+    def _callFUT(self, data):
+        from pyramid.scripts.pprecompress import gzip_compress
+        return gzip_compress(data)
+
+    def test_reproducible(self):
+        import zlib
+        data = b'abc' * 100
+        result = self._callFUT(data)
+        self.assertEqual(result, self._callFUT(data))
+        self.assertEqual(zlib.decompress(result, 16 + zlib.MAX_WBITS), data)
+
+class Test_main(unittest.TestCase):
+    def _callFUT(self, argv):
+        from pyramid.scripts.pprecompress import main
+        return main(argv, quiet=True)
+
+    def test_it(self):
+        result = self._callFUT(['pprecompress'])
+        self.assertEqual(result, 2)
+
+class DummyBrotli(object):
+    def compress(self, data):
+        return b'brotli'
@@ -322,10 +322,128 @@ class TestBaseCookieSession(SharedCookieSessionTests, unittest.TestCase):
         request = testing.DummyRequest()
         self.assertRaises(ValueError, self._makeOne, request, reissue_time='invalid value')
 
+    def _respond(self, request):
+        import webob
+        response = webob.Response()
+        for callback in request.response_callbacks:
+            callback(request, response)
+        return response
+
+    def test_skip_unchanged_not_written(self):
+        import time
+        request = testing.DummyRequest()
+        cookieval = self._serialize((int(time.time()), 0, {'state': [1]}))
+        request.cookies['session'] = cookieval
+        session = self._makeOne(request, reissue_time=60, skip_unchanged=True)
+        session['state'] = [1]
+        self.assertTrue(session._dirty)
+        response = self._respond(request)
+        self.assertFalse('Set-Cookie' in response.headers)
+        self.assertEqual(session.skipped_writes, 1)
+
+    def test_skip_unchanged_changed_in_place(self):
+        import time
+        request = testing.DummyRequest()
+        cookieval = self._serialize((int(time.time()), 0, {'_f_': ['a']}))
+        request.cookies['session'] = cookieval
+        session = self._makeOne(request, reissue_time=60, skip_unchanged=True)
+        session.flash('b')
+        response = self._respond(request)
+        self.assertTrue('Set-Cookie' in response.headers)
+        self.assertEqual(session.skipped_writes, 0)
+
+    def test_skip_unchanged_reissue_due(self):
+        import time
+        request = testing.DummyRequest()
+        cookieval = self._serialize((time.time() - 120, 0, {'state': 1}))
+        request.cookies['session'] = cookieval
+        session = self._makeOne(request, reissue_time=60, skip_unchanged=True)
+        self.assertEqual(session['state'], 1)
+        self.assertTrue(session._dirty)
+        response = self._respond(request)
+        self.assertTrue('Set-Cookie' in response.headers)
+        self.assertEqual(session.skipped_writes, 0)
+
+    def test_skip_unchanged_reissue_never(self):
+        request = testing.DummyRequest()
+        cookieval = self._serialize((0, 0, {'state': 1}))
+        request.cookies['session'] = cookieval
+        session = self._makeOne(request, reissue_time=None, timeout=None,
+                                skip_unchanged=True)
+        session['state'] = 1
+        response = self._respond(request)
+        self.assertFalse('Set-Cookie' in response.headers)
+
+    def test_skip_unchanged_reissue_never_with_timeout(self):
+        import time
+        request = testing.DummyRequest()
+        cookieval = self._serialize((int(time.time()), 0, {'state': 1}))
+        request.cookies['session'] = cookieval
+        session = self._makeOne(request, reissue_time=None, timeout=1200,
+                                skip_unchanged=True)
+        session['state'] = 1
+        session.accessed += 10
+        response = self._respond(request)
+        self.assertTrue('Set-Cookie' in response.headers)
+        self.assertEqual(session.skipped_writes, 0)
+
+    def test_skip_unchanged_new_session(self):
+        request = testing.DummyRequest()
+        session = self._makeOne(request, skip_unchanged=True)
+        session['state'] = 1
+        response = self._respond(request)
+        self.assertTrue('Set-Cookie' in response.headers)
+
+    def test_skip_unchanged_expired(self):
+        request = testing.DummyRequest()
+        cookieval = self._serialize((0, 0, {'state': 1}))
+        request.cookies['session'] = cookieval
+        session = self._makeOne(request, timeout=60, reissue_time=60,
+                                skip_unchanged=True)
+        session['state'] = 2
+        response = self._respond(request)
+        cookieval = response.headers['Set-Cookie'].split(';')[0][8:]
+        renewed, created, state = DummySerializer().loads(cookieval)
+        self.assertNotEqual(renewed, 0)
+        self.assertEqual(state, {'state': 2})
+
+    def test_skip_unchanged_disabled(self):
+        import time
+        request = testing.DummyRequest()
+        cookieval = self._serialize((int(time.time()), 0, {'state': 1}))
+        request.cookies['session'] = cookieval
+        session = self._makeOne(request, reissue_time=60)
+        session['state'] = 1
+        response = self._respond(request)
+        self.assertTrue('Set-Cookie' in response.headers)
+
     def test_cookie_max_age_invalid(self):
         request = testing.DummyRequest()
         self.assertRaises(ValueError, self._makeOne, request, max_age='invalid value')
 
+    def test_skip_unchanged_serializes_once(self):
+        import time
+        from pyramid.session import BaseCookieSessionFactory
+        request = testing.DummyRequest()
+        renewed = int(time.time()) - 5
+        cookieval = self._serialize((renewed, 1, {'state': 1}))
+        request.cookies['session'] = cookieval
+        serializer = DummySerializer()
+        dumped = []
+        dumps = serializer.dumps
+        def dummy_dumps(value):
+            dumped.append(value)
+            return dumps(value)
+        serializer.dumps = dummy_dumps
+        session = BaseCookieSessionFactory(
+            serializer, reissue_time=60, skip_unchanged=True)(request)
+        session['state'] = 2
+        response = self._respond(request)
+        self.assertEqual(len(dumped), 1)
+        # no reissue was due, so the timestamps are those of the cookie
+        self.assertEqual(dumped[0], (renewed, 1, {'state': 2}))
+        self.assertTrue('Set-Cookie' in response.headers)
+
 class TestSignedCookieSession(SharedCookieSessionTests, unittest.TestCase):
     def _makeOne(self, request, **kw):
         from pyramid.session import SignedCookieSessionFactory
@@ -443,6 +561,20 @@ class TestSignedCookieSession(SharedCookieSessionTests, unittest.TestCase):
         session = self._makeOne(request)
         self.assertEqual(session, {})
 
+    def test_skip_unchanged_not_written(self):
+        import time
+        import webob
+        request = testing.DummyRequest()
+        cookieval = self._serialize((int(time.time()), 0, {'state': 1}))
+        request.cookies['session'] = cookieval
+        session = self._makeOne(request, reissue_time=60, skip_unchanged=True)
+        session['state'] = 1
+        response = webob.Response()
+        self.assertEqual(session._set_cookie(response), False)
+        self.assertEqual(session.skipped_writes, 1)
+        session['state'] = 2
+        self.assertEqual(session._set_cookie(response), True)
+
     def test_very_long_key(self):
         verylongkey = b'a' * 1024
         import webob
@@ -461,6 +593,99 @@ class TestSignedCookieSession(SharedCookieSessionTests, unittest.TestCase):
         self.assertEqual(result, None)
         self.assertTrue('Set-Cookie' in dict(response.headerlist))
 
+class TestSignedCookieSessionCompressed(TestSignedCookieSession):
+    def _makeOne(self, request, **kw):
+        kw.setdefault('compress', True)
+        return TestSignedCookieSession._makeOne(self, request, **kw)
+
+    def _serialize(self, value, salt=b'pyramid.session.', hashalg='sha512'):
+        import base64
+        import hashlib
+        import hmac
+        import pickle
+
+        digestmod = lambda: hashlib.new(hashalg)
+        cstruct = b'\x00' + pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        sig = hmac.new(salt + b'secret', cstruct, digestmod).digest()
+        return base64.urlsafe_b64encode(sig + cstruct).rstrip(b'=')
+
+    def test_custom_serializer(self):
+        import base64
+        from hashlib import sha512
+        import hmac
+        import time
+        request = testing.DummyRequest()
+        serializer = DummySerializer()
+        cstruct = b'\x00' + serializer.dumps((time.time(), 0, {'state': 1}))
+        sig = hmac.new(b'pyramid.session.secret', cstruct, sha512).digest()
+        cookieval = base64.urlsafe_b64encode(sig + cstruct).rstrip(b'=')
+        request.cookies['session'] = cookieval
+        session = self._makeOne(request, serializer=serializer)
+        self.assertEqual(session['state'], 1)
+
+    def test__set_cookie_cookieval_too_long(self):
+        import os
+        request = testing.DummyRequest()
+        session = self._makeOne(request)
+        session['abc'] = os.urandom(10000)
+        response = DummyResponse()
+        self.assertRaises(ValueError, session._set_cookie, response)
+
+    def test_large_session_fits_in_cookie(self):
+        import webob
+        request = testing.DummyRequest()
+        session = self._makeOne(request)
+        session['cart'] = ['item-%d' % (i % 10) for i in range(2000)]
+        response = webob.Response()
+        self.assertEqual(session._set_cookie(response), True)
+        cookieval = response.headers['Set-Cookie'].split(';')[0][8:]
+        request = testing.DummyRequest()
+        request.cookies['session'] = cookieval
+        session = self._makeOne(request)
+        self.assertEqual(len(session['cart']), 2000)
+
+class TestCompressedSerializer(unittest.TestCase):
+    def _makeOne(self, **kw):
+        from pyramid.session import CompressedSerializer
+        return CompressedSerializer(**kw)
+
+    def test_small_not_compressed(self):
+        import pickle
+        serializer = self._makeOne()
+        result = serializer.dumps({'a': 1})
+        self.assertEqual(result[:1], b'\x00')
+        self.assertEqual(pickle.loads(result[1:]), {'a': 1})
+        self.assertEqual(serializer.loads(result), {'a': 1})
+
+    def test_large_compressed(self):
+        serializer = self._makeOne()
+        value = {'a': 'x' * 1000}
+        result = serializer.dumps(value)
+        self.assertEqual(result[:1], b'\x01')
+        self.assertTrue(len(result) < 100)
+        self.assertEqual(serializer.loads(result), value)
+
+    def test_incompressible_not_compressed(self):
+        import os
+        serializer = self._makeOne(threshold=0)
+        value = os.urandom(500)
+        result = serializer.dumps(value)
+        self.assertEqual(result[:1], b'\x00')
+        self.assertEqual(serializer.loads(result), value)
+
+    def test_wrapped_serializer(self):
+        serializer = self._makeOne(serializer=DummySerializer())
+        self.assertEqual(serializer.loads(serializer.dumps([1, 2])), [1, 2])
+
+    def test_loads_unknown_format(self):
+        serializer = self._makeOne()
+        self.assertRaises(ValueError, serializer.loads, b'\x02abc')
+        self.assertRaises(ValueError, serializer.loads, b'')
+
+    def test_loads_bad_compressed_data(self):
+        serializer = self._makeOne()
+        self.assertRaises(ValueError, serializer.loads, b'\x01abc')
+
 class TestUnencryptedCookieSession(SharedCookieSessionTests, unittest.TestCase):
     def setUp(self):
         super(TestUnencryptedCookieSession, self).setUp()
@@ -532,6 +757,402 @@ def dummy_signed_deserialize(serialized, secret):
         serialized[len(base64.b64encode(bytes_(secret))):])
     return pickle.loads(serialized_data)
 
+class Test_HMACSignedSerializer(unittest.TestCase):
+    def _makeOne(self, secret='secret', salt='salt', hashalg='sha512'):
+        from pyramid.session import _HMACSignedSerializer
+        from pyramid.session import PickleSerializer
+        return _HMACSignedSerializer(
+            secret, salt, hashalg, serializer=PickleSerializer())
+
+    def _makeWebOb(self, secret='secret', salt='salt', hashalg='sha512'):
+        from webob.cookies import SignedSerializer
+        from pyramid.session import PickleSerializer
+        return SignedSerializer(
+            secret, salt, hashalg, serializer=PickleSerializer())
+
+    def test_dumps_matches_webob(self):
+        for hashalg in ('sha512', 'sha1', 'SHA256'):
+            inst = self._makeOne(hashalg=hashalg)
+            webob = self._makeWebOb(hashalg=hashalg)
+            self.assertEqual(inst.dumps({'a': 1}), webob.dumps({'a': 1}))
+
+    def test_loads_roundtrip(self):
+        inst = self._makeOne()
+        self.assertEqual(inst.loads(inst.dumps({'a': 1})), {'a': 1})
+        self.assertEqual(inst.loads(inst.dumps({'b': 2})), {'b': 2})
+
+    def test_loads_webob_cookie(self):
+        inst = self._makeOne()
+        webob = self._makeWebOb()
+        self.assertEqual(inst.loads(webob.dumps({'a': 1})), {'a': 1})
+
+    def test_loads_bad_signature(self):
+        inst = self._makeOne()
+        other = self._makeOne(secret='other')
+        self.assertRaises(ValueError, inst.loads, other.dumps({'a': 1}))
+
+    def test_loads_bad_base64(self):
+        inst = self._makeOne()
+        self.assertRaises(ValueError, inst.loads, b'a')
+
+    def test_digestmod(self):
+        import hashlib
+        self.assertTrue(self._makeOne().digestmod is hashlib.sha512)
+        webob = self._makeWebOb(hashalg='SHA256')
+        self.assertEqual(self._makeOne(hashalg='SHA256').digest_size,
+                         webob.digest_size)
+
+class TestServerSideSession(unittest.TestCase):
+    def _makeStorage(self):
+        from pyramid.session import MemorySessionStorage
+        return MemorySessionStorage()
+
+    def _makeOne(self, request, storage=None, **kw):
+        from pyramid.session import ServerSideSessionFactory
+        if storage is None:
+            storage = self._makeStorage()
+        return ServerSideSessionFactory(storage, **kw)(request)
+
+    def _store(self, storage, value, session_id='a' * 64):
+        from pyramid.session import PickleSerializer
+        storage.save(session_id, PickleSerializer().dumps(value), None)
+        return session_id
+
+    def _respond(self, request):
+        import webob
+        response = webob.Response()
+        for callback in request.response_callbacks:
+            callback(request, response)
+        return response
+
+    def test_instance_conforms(self):
+        from zope.interface.verify import verifyObject
+        from pyramid.interfaces import ISession
+        request = testing.DummyRequest()
+        session = self._makeOne(request)
+        verifyObject(ISession, session)
+
+    def test_ctor_no_cookie(self):
+        request = testing.DummyRequest()
+        session = self._makeOne(request)
+        self.assertEqual(dict(session), {})
+        self.assertTrue(session.new)
+
+    def test_ctor_does_not_load(self):
+        import time
+        storage = DummyStorage()
+        request = testing.DummyRequest()
+        request.cookies['session'] = self._store(
+            storage, (time.time(), 0, {'state': 1}))
+        session = self._makeOne(request, storage=storage)
+        self.assertEqual(storage.loads, [])
+        self.assertEqual(session['state'], 1)
+        self.assertEqual(session.get('state'), 1)
+        self.assertEqual(storage.loads, ['a' * 64])
+        self.assertFalse(session.new)
+        self.assertEqual(session.created, 0)
+
+    def test_ctor_with_cookie_expired(self):
+        storage = self._makeStorage()
+        request = testing.DummyRequest()
+        request.cookies['session'] = self._store(storage, (0, 0, {'state': 1}))
+        session = self._makeOne(request, storage=storage)
+        self.assertEqual(dict(session), {})
+        self.assertTrue(session.new)
+        self.assertEqual(session.session_id, None)
+
+    def test_ctor_with_timeout_never(self):
+        storage = self._makeStorage()
+        request = testing.DummyRequest()
+        request.cookies['session'] = self._store(storage, (0, 0, {'state': 1}))
+        session = self._makeOne(request, storage=storage, timeout=None,
+                                reissue_time=None)
+        self.assertEqual(dict(session), {'state': 1})
+
+    def test_ctor_with_unknown_session_id(self):
+        request = testing.DummyRequest()
+        request.cookies['session'] = 'b' * 64
+        session = self._makeOne(request)
+        self.assertEqual(dict(session), {})
+        self.assertEqual(session.session_id, None)
+
+    def test_ctor_with_malformed_session_id(self):
+        storage = DummyStorage()
+        request = testing.DummyRequest()
+        request.cookies['session'] = 'abc'
+        session = self._makeOne(request, storage=storage)
+        self.assertEqual(dict(session), {})
+        self.assertEqual(storage.loads, [])
+
+    def test_ctor_with_bad_data(self):
+        storage = self._makeStorage()
+        request = testing.DummyRequest()
+        storage.save('a' * 64, b'garbage', None)
+        request.cookies['session'] = 'a' * 64
+        session = self._makeOne(request, storage=storage,
+                                serializer=DummySerializer())
+        self.assertEqual(dict(session), {})
+
+    def test_ctor_with_bad_data_not_tuple(self):
+        storage = self._makeStorage()
+        request = testing.DummyRequest()
+        request.cookies['session'] = self._store(storage, 'abc')
+        session = self._makeOne(request, storage=storage)
+        self.assertEqual(dict(session), {})
+
+    def test_new_session_saved_and_cookie_set(self):
+        storage = self._makeStorage()
+        request = testing.DummyRequest()
+        session = self._makeOne(request, storage=storage)
+        session['a'] = 1
+        response = self._respond(request)
+        session_id = session.session_id
+        self.assertEqual(len(session_id), 64)
+        self.assertTrue(response.headers['Set-Cookie'].startswith(
+            'session=%s;' % session_id))
+        request = testing.DummyRequest()
+        request.cookies['session'] = session_id
+        session = self._makeOne(request, storage=storage)
+        self.assertEqual(dict(session), {'a': 1})
+
+    def test_existing_session_saved_without_cookie(self):
+        import time
+        storage = DummyStorage()
+        request = testing.DummyRequest()
+        request.cookies['session'] = self._store(
+            storage, (time.time(), 0, {'state': 1}))
+        session = self._makeOne(request, storage=storage)
+        session['state'] = 2
+        response = self._respond(request)
+        self.assertFalse('Set-Cookie' in response.headers)
+        self.assertEqual(len(storage.saves), 2)
+        self.assertEqual(storage.saves[-1][2], 1200)
+
+    def test_existing_session_saved_with_cookie_max_age(self):
+        import time
+        storage = self._makeStorage()
+        request = testing.DummyRequest()
+        request.cookies['session'] = self._store(
+            storage, (time.time(), 0, {'state': 1}))
+        session = self._makeOne(request, storage=storage, max_age=100)
+        session['state'] = 2
+        response = self._respond(request)
+        self.assertTrue('Max-Age=100' in response.headers['Set-Cookie'])
+
+    def test_read_only_access_not_saved(self):
+        import time
+        storage = DummyStorage()
+        request = testing.DummyRequest()
+        request.cookies['session'] = self._store(
+            storage, (time.time(), 0, {'state': 1}))
+        session = self._makeOne(request, storage=storage)
+        self.assertEqual(session['state'], 1)
+        self.assertFalse(session._dirty)
+        self.assertEqual(len(request.response_callbacks), 0)
+
+    def test_reissue_triggered(self):
+        import time
+        storage = self._makeStorage()
+        request = testing.DummyRequest()
+        request.cookies['session'] = self._store(
+            storage, (time.time() - 200, 0, {'state': 1}))
+        session = self._makeOne(request, storage=storage)
+        self.assertEqual(session['state'], 1)
+        self.assertTrue(session._dirty)
+
+    def test_no_access_not_saved(self):
+        request = testing.DummyRequest()
+        self._makeOne(request)
+        self.assertEqual(len(request.response_callbacks), 0)
+
+    def test_empty_new_session_not_saved(self):
+        storage = DummyStorage()
+        request = testing.DummyRequest()
+        session = self._makeOne(request, storage=storage)
+        session.changed()
+        response = self._respond(request)
+        self.assertEqual(storage.saves, [])
+        self.assertFalse('Set-Cookie' in response.headers)
+
+    def test_invalidate(self):
+        import time
+        storage = self._makeStorage()
+        request = testing.DummyRequest()
+        request.cookies['session'] = self._store(
+            storage, (time.time(), 0, {'state': 1}))
+        session = self._makeOne(request, storage=storage)
+        self.assertEqual(session.invalidate(), None)
+        self.assertFalse('state' in session)
+        self.assertTrue(session.new)
+        self.assertEqual(storage.load('a' * 64), None)
+        response = self._respond(request)
+        self.assertTrue('Max-Age=0' in response.headers['Set-Cookie'])
+
+    def test_invalidate_resets_created(self):
+        import time
+        storage = self._makeStorage()
+        request = testing.DummyRequest()
+        request.cookies['session'] = self._store(
+            storage, (time.time(), 0, {'state': 1}))
+        session = self._makeOne(request, storage=storage)
+        self.assertEqual(session.created, 0)
+        before = time.time()
+        session.invalidate()
+        self.assertTrue(session.created >= before)
+        session['user'] = 'fred'
+        self._respond(request)
+        from pyramid.session import PickleSerializer
+        accessed, created, state = PickleSerializer().loads(
+            storage.load(session.session_id))
+        self.assertTrue(created >= before)
+        self.assertEqual(state, {'user': 'fred'})
+
+    def test_invalidate_then_set_issues_new_id(self):
+        import time
+        storage = self._makeStorage()
+        request = testing.DummyRequest()
+        request.cookies['session'] = self._store(
+            storage, (time.time(), 0, {'state': 1}))
+        session = self._makeOne(request, storage=storage)
+        session.invalidate()
+        session['user'] = 'fred'
+        response = self._respond(request)
+        self.assertNotEqual(session.session_id, 'a' * 64)
+        self.assertTrue(response.headers['Set-Cookie'].startswith(
+            'session=%s;' % session.session_id))
+
+    def test_no_save_with_exception(self):
+        storage = DummyStorage()
+        request = testing.DummyRequest()
+        request.exception = True
+        session = self._makeOne(request, storage=storage,
+                                set_on_exception=False)
+        session['a'] = 1
+        response = self._respond(request)
+        self.assertEqual(storage.saves, [])
+        self.assertFalse('Set-Cookie' in response.headers)
+
+    def test_cookie_options(self):
+        request = testing.DummyRequest()
+        session = self._makeOne(request, cookie_name='abc', path='/foo',
+                                domain='localhost', secure=True,
+                                httponly=True)
+        session['a'] = 1
+        response = self._respond(request)
+        cookieval = response.headers['Set-Cookie']
+        val, domain, path, secure, httponly = [x.strip() for x in
+                                               cookieval.split(';')]
+        self.assertTrue(val.startswith('abc='))
+        self.assertEqual(domain, 'Domain=localhost')
+        self.assertEqual(path, 'Path=/foo')
+        self.assertEqual(secure, 'secure')
+        self.assertEqual(httponly, 'HttpOnly')
+
+    def test_flash(self):
+        request = testing.DummyRequest()
+        session = self._makeOne(request)
+        session.flash('msg1')
+        session.flash('msg1', allow_duplicate=False)
+        session.flash('err1', 'error')
+        self.assertEqual(session.peek_flash(), ['msg1'])
+        self.assertEqual(session.pop_flash('error'), ['err1'])
+        self.assertEqual(session.get('_f_error'), None)
+
+    def test_csrf_token(self):
+        request = testing.DummyRequest()
+        session = self._makeOne(request)
+        token = session.get_csrf_token()
+        self.assertEqual(token, session['_csrft_'])
+        self.assertEqual(session.get_csrf_token(), token)
+        self.assertNotEqual(session.new_csrf_token(), token)
+
+class SessionStorageTests(object):
+    def test_load_missing(self):
+        storage = self._makeOne()
+        self.assertEqual(storage.load('a'), None)
+
+    def test_save_load(self):
+        storage = self._makeOne()
+        storage.save('a', b'data', None)
+        self.assertEqual(storage.load('a'), b'data')
+        storage.save('a', b'other', 100)
+        self.assertEqual(storage.load('a'), b'other')
+
+    def test_expired(self):
+        storage = self._makeOne()
+        storage.save('a', b'data', -10)
+        self.assertEqual(storage.load('a'), None)
+
+    def test_delete(self):
+        storage = self._makeOne()
+        storage.save('a', b'data', None)
+        storage.delete('a')
+        storage.delete('b')
+        self.assertEqual(storage.load('a'), None)
+
+class TestMemorySessionStorage(SessionStorageTests, unittest.TestCase):
+    def _makeOne(self, **kw):
+        from pyramid.session import MemorySessionStorage
+        return MemorySessionStorage(**kw)
+
+    def test_max_size(self):
+        storage = self._makeOne(max_size=2)
+        storage.save('a', b'a', None)
+        storage.save('b', b'b', None)
+        storage.load('a')
+        storage.save('c', b'c', None)
+        self.assertEqual(storage.load('b'), None)
+        self.assertEqual(storage.load('a'), b'a')
+        self.assertEqual(storage.load('c'), b'c')
+
+class FileSessionStorageTests(SessionStorageTests):
+    def setUp(self):
+        import tempfile
+        self.tempdir = tempfile.mkdtemp()
+        self.storages = []
+
+    def tearDown(self):
+        import shutil
+        for storage in self.storages:
+            storage.close()
+        shutil.rmtree(self.tempdir)
+
+    def test_purge(self):
+        storage = self._makeOne()
+        storage.save('a', b'a', -10)
+        storage.save('b', b'b', 100)
+        storage.save('c', b'c', None)
+        storage.purge()
+        self.assertEqual(storage.load('b'), b'b')
+        self.assertEqual(storage.load('c'), b'c')
+
+    def test_persistent(self):
+        storage = self._makeOne()
+        storage.save('a', b'data', None)
+        storage.close()
+        self.storages.remove(storage)
+        self.assertEqual(self._makeOne().load('a'), b'data')
+
+class TestDBMSessionStorage(FileSessionStorageTests, unittest.TestCase):
+    def _makeOne(self):
+        import os
+        from pyramid.session import DBMSessionStorage
+        storage = DBMSessionStorage(os.path.join(self.tempdir, 'sessions'))
+        self.storages.append(storage)
+        return storage
+
+class TestSQLiteSessionStorage(FileSessionStorageTests, unittest.TestCase):
+    def _makeOne(self, table='pyramid_sessions'):
+        import os
+        from pyramid.session import SQLiteSessionStorage
+        storage = SQLiteSessionStorage(
+            os.path.join(self.tempdir, 'sessions.db'), table=table)
+        self.storages.append(storage)
+        return storage
+
+    def test_invalid_table(self):
+        self.assertRaises(ValueError, self._makeOne, table='x; DROP TABLE y')
+
 class Test_manage_accessed(unittest.TestCase):
     def _makeOne(self, wrapped):
         from pyramid.session import manage_accessed
@@ -811,6 +1432,24 @@ class DummySerializer(object):
         except TypeError:
             raise ValueError
 
+class DummyStorage(object):
+    def __init__(self):
+        from pyramid.session import MemorySessionStorage
+        self.storage = MemorySessionStorage()
+        self.loads = []
+        self.saves = []
+
+    def load(self, session_id):
+        self.loads.append(session_id)
+        return self.storage.load(session_id)
+
+    def save(self, session_id, bstruct, timeout):
+        self.saves.append((session_id, bstruct, timeout))
+        self.storage.save(session_id, bstruct, timeout)
+
+    def delete(self, session_id):
+        self.storage.delete(session_id)
+
 class DummySessionFactory(dict):
     _dirty = False
     _cookie_name = 'session'
@@ -363,6 +363,510 @@ class Test_static_view_use_subpath_True(unittest.TestCase):
         from pyramid.httpexceptions import HTTPNotFound
         self.assertRaises(HTTPNotFound, inst, context, request)
 
+class Test_static_view_cache_files(unittest.TestCase):
+    def setUp(self):
+        import tempfile
+        self.docroot = tempfile.mkdtemp()
+        os.mkdir(os.path.join(self.docroot, 'subdir'))
+        self._write('index.html', b'<html>static</html>')
+        self._write('subdir/index.html', b'<html>subdir</html>')
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.docroot)
+
+    def _write(self, name, content):
+        with open(os.path.join(self.docroot, name), 'wb') as f:
+            f.write(content)
+
+    def _makeOne(self, **kw):
+        from pyramid.static import static_view
+        kw.setdefault('cache_files', True)
+        inst = static_view(self.docroot, use_subpath=True, **kw)
+        resolved = self.resolved = []
+        resolve = inst._resolve
+        def _resolve(path):
+            resolved.append(path)
+            return resolve(path)
+        inst._resolve = _resolve
+        return inst
+
+    def _makeRequest(self, subpath, path_info='/', **kw):
+        from pyramid.request import Request
+        environ = {
+            'wsgi.url_scheme':'http',
+            'wsgi.version':(1,0),
+            'SERVER_NAME':'example.com',
+            'SERVER_PORT':'6543',
+            'PATH_INFO':path_info,
+            'SCRIPT_NAME':'',
+            'REQUEST_METHOD':'GET',
+            }
+        environ.update(kw)
+        request = Request(environ=environ)
+        request.subpath = subpath
+        return request
+
+    def _call(self, inst, subpath, **kw):
+        request = self._makeRequest(subpath, **kw)
+        return inst(DummyContext(), request)
+
+    def test_ctor_defaultargs(self):
+        from pyramid.static import static_view
+        inst = static_view(self.docroot)
+        self.assertEqual(inst.file_cache, None)
+
+    def test_small_file_cached_in_memory(self):
+        inst = self._makeOne()
+        response = self._call(inst, ('index.html',))
+        self.assertEqual(response.body, b'<html>static</html>')
+        self.assertEqual(response.content_length, 19)
+        self.assertEqual(response.content_type, 'text/html')
+        self.assertTrue(response.etag)
+        self.assertTrue(response.last_modified)
+        os.remove(os.path.join(self.docroot, 'index.html'))
+        response = self._call(inst, ('index.html',))
+        self.assertEqual(response.body, b'<html>static</html>')
+        self.assertEqual(self.resolved, ['index.html'])
+
+    def test_large_file_served_from_disk(self):
+        inst = self._makeOne(cache_max_file_size=4, stat_interval=None)
+        response = self._call(inst, ('index.html',))
+        self.assertEqual(response.content_length, 19)
+        self.assertEqual(response.body, b'<html>static</html>')
+        self._write('index.html', b'<html>STATIC</html>')
+        response = self._call(inst, ('index.html',))
+        self.assertEqual(response.body, b'<html>STATIC</html>')
+        self.assertEqual(self.resolved, ['index.html'])
+
+    def test_large_file_range(self):
+        inst = self._makeOne(cache_max_file_size=4)
+        request = self._makeRequest(('index.html',))
+        request.range = (6, 12)
+        response = inst(DummyContext(), request)
+        start_response = DummyStartResponse()
+        app_iter = response(request.environ, start_response)
+        try:
+            self.assertEqual(start_response.status, '206 Partial Content')
+            self.assertEqual(b''.join(app_iter), b'static')
+        finally:
+            app_iter.close()
+
+    def test_large_file_uses_file_wrapper(self):
+        inst = self._makeOne(cache_max_file_size=4)
+        class Wrapper(object):
+            def __init__(self, file, block_size):
+                self.file = file
+                self.block_size = block_size
+        response = self._call(inst, ('index.html',),
+                              **{'wsgi.file_wrapper': Wrapper})
+        self.assertTrue(isinstance(response.app_iter, Wrapper))
+        response.app_iter.file.close()
+
+    def test_revalidated_when_changed(self):
+        inst = self._makeOne(stat_interval=0)
+        self._call(inst, ('index.html',))
+        self._write('index.html', b'<html>changed</html>')
+        response = self._call(inst, ('index.html',))
+        self.assertEqual(response.body, b'<html>changed</html>')
+        self.assertEqual(self.resolved, ['index.html', 'index.html'])
+
+    def test_revalidated_unchanged(self):
+        inst = self._makeOne(stat_interval=0)
+        self._call(inst, ('index.html',))
+        response = self._call(inst, ('index.html',))
+        self.assertEqual(response.body, b'<html>static</html>')
+        self.assertEqual(self.resolved, ['index.html'])
+
+    def test_revalidated_removed(self):
+        from pyramid.httpexceptions import HTTPNotFound
+        inst = self._makeOne(stat_interval=0)
+        self._call(inst, ('index.html',))
+        os.remove(os.path.join(self.docroot, 'index.html'))
+        self.assertRaises(HTTPNotFound, self._call, inst, ('index.html',))
+
+    def test_not_revalidated_within_interval(self):
+        inst = self._makeOne(stat_interval=3600)
+        self._call(inst, ('index.html',))
+        self._write('index.html', b'<html>changed</html>')
+        response = self._call(inst, ('index.html',))
+        self.assertEqual(response.body, b'<html>static</html>')
+
+    def test_not_found_not_cached(self):
+        from pyramid.httpexceptions import HTTPNotFound
+        inst = self._makeOne()
+        self.assertRaises(HTTPNotFound, self._call, inst, ('new.html',))
+        self._write('new.html', b'new')
+        response = self._call(inst, ('new.html',))
+        self.assertEqual(response.body, b'new')
+
+    def test_directory_index(self):
+        inst = self._makeOne()
+        response = self._call(inst, ('subdir',), PATH_INFO='/subdir/')
+        self.assertEqual(response.body, b'<html>subdir</html>')
+
+    def test_directory_redirect(self):
+        from pyramid.httpexceptions import HTTPMovedPermanently
+        inst = self._makeOne()
+        self._call(inst, ('subdir',), PATH_INFO='/subdir/')
+        self.assertRaises(HTTPMovedPermanently, self._call, inst, ('subdir',),
+                          PATH_INFO='/subdir')
+        self.assertEqual(self.resolved, ['subdir'])
+
+    def test_cache_max_files(self):
+        inst = self._makeOne(cache_max_files=1)
+        self._call(inst, ('index.html',))
+        self._call(inst, ('subdir', 'index.html'))
+        self._call(inst, ('index.html',))
+        self.assertEqual(len(self.resolved), 3)
+
+    def test_cache_max_age(self):
+        inst = self._makeOne(cache_max_age=600)
+        response = self._call(inst, ('index.html',))
+        header_names = sorted([x[0] for x in response.headerlist])
+        self.assertEqual(header_names,
+                         ['Cache-Control', 'Content-Length', 'Content-Type',
+                          'ETag', 'Expires', 'Last-Modified'])
+
+    def test_if_none_match(self):
+        inst = self._makeOne()
+        response = self._call(inst, ('index.html',))
+        etag = response.etag
+        request = self._makeRequest(('index.html',))
+        request.if_none_match = etag
+        response = inst(DummyContext(), request)
+        start_response = DummyStartResponse()
+        app_iter = response(request.environ, start_response)
+        self.assertEqual(start_response.status, '304 Not Modified')
+        self.assertEqual(list(app_iter), [])
+
+    def test_content_etag(self):
+        import hashlib
+        inst = self._makeOne(content_etag=True)
+        response = self._call(inst, ('index.html',))
+        self.assertEqual(response.etag,
+                         hashlib.sha1(b'<html>static</html>').hexdigest())
+
+    def test_content_etag_large_file(self):
+        import hashlib
+        inst = self._makeOne(content_etag=True, cache_max_file_size=4)
+        response = self._call(inst, ('index.html',))
+        response.app_iter.close()
+        etag = hashlib.sha1(b'<html>static</html>').hexdigest()
+        self.assertEqual(response.etag, etag)
+        request = self._makeRequest(('index.html',))
+        request.if_none_match = etag
+        response = inst(DummyContext(), request)
+        self.assertEqual(response.status, '304 Not Modified')
+        self.assertEqual(response.etag, etag)
+
+    def test_package_resource(self):
+        from pyramid.static import static_view
+        inst = static_view('pyramid.tests:fixtures/static', use_subpath=True,
+                           cache_files=True)
+        response = self._call(inst, ('index.html',))
+        self.assertTrue(b'<html>static</html>' in response.body)
+        response = self._call(inst, ('index.html',))
+        self.assertTrue(b'<html>static</html>' in response.body)
+
+class Test_static_view_precompressed(unittest.TestCase):
+    def setUp(self):
+        import tempfile
+        self.docroot = tempfile.mkdtemp()
+        self._write('app.js', b'uncompressed')
+        self._write('app.js.gz', b'gzipped')
+        self._write('app.js.br', b'brotlied')
+        self._write('style.css', b'plain')
+        self._write('style.css.gz', b'gzipped style')
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.docroot)
+
+    def _write(self, name, content):
+        with open(os.path.join(self.docroot, name), 'wb') as f:
+            f.write(content)
+
+    def _makeOne(self, **kw):
+        from pyramid.static import static_view
+        kw.setdefault('precompressed', True)
+        return static_view(self.docroot, use_subpath=True, **kw)
+
+    def _call(self, inst, subpath, accept_encoding=None):
+        from pyramid.request import Request
+        request = Request.blank('/')
+        if accept_encoding is not None:
+            request.headers['Accept-Encoding'] = accept_encoding
+        request.subpath = subpath
+        return inst(DummyContext(), request)
+
+    def test_ctor_unknown_encoding(self):
+        self.assertRaises(ValueError, self._makeOne, precompressed=('zstd',))
+
+    def test_ctor_defaultargs(self):
+        inst = self._makeOne(precompressed=False)
+        self.assertEqual(inst.precompressed, ())
+        self.assertEqual(inst.sidecar_cache, None)
+        response = self._call(inst, ('app.js',), 'gzip, br')
+        self.assertEqual(response.body, b'uncompressed')
+        self.assertEqual(response.content_encoding, None)
+        self.assertEqual(response.vary, None)
+
+    def test_no_accept_encoding(self):
+        inst = self._makeOne()
+        response = self._call(inst, ('app.js',))
+        self.assertEqual(response.body, b'uncompressed')
+        self.assertEqual(response.content_encoding, None)
+        self.assertEqual(response.vary, ('Accept-Encoding',))
+
+    def test_br_preferred(self):
+        from pyramid.response import _guess_type
+        inst = self._makeOne()
+        response = self._call(inst, ('app.js',), 'gzip, deflate, br')
+        self.assertEqual(response.body, b'brotlied')
+        self.assertEqual(response.content_encoding, 'br')
+        self.assertEqual(response.content_type, _guess_type('app.js')[0])
+        self.assertEqual(response.content_length, 8)
+        self.assertEqual(response.vary, ('Accept-Encoding',))
+
+    def test_gzip(self):
+        inst = self._makeOne()
+        response = self._call(inst, ('app.js',), 'gzip')
+        self.assertEqual(response.body, b'gzipped')
+        self.assertEqual(response.content_encoding, 'gzip')
+
+    def test_quality(self):
+        inst = self._makeOne()
+        response = self._call(inst, ('app.js',), 'br;q=0.5, gzip')
+        self.assertEqual(response.content_encoding, 'gzip')
+        response.app_iter.close()
+
+    def test_quality_zero(self):
+        inst = self._makeOne()
+        response = self._call(inst, ('app.js',), 'br;q=0, gzip;q=0')
+        self.assertEqual(response.body, b'uncompressed')
+        self.assertEqual(response.content_encoding, None)
+
+    def test_wildcard(self):
+        inst = self._makeOne()
+        response = self._call(inst, ('app.js',), '*, br;q=0')
+        self.assertEqual(response.content_encoding, 'gzip')
+        response.app_iter.close()
+
+    def test_bad_quality(self):
+        inst = self._makeOne()
+        response = self._call(inst, ('app.js',), 'br;q=x, gzip;level=1')
+        self.assertEqual(response.content_encoding, 'gzip')
+        response.app_iter.close()
+
+    def test_encodings_limited(self):
+        inst = self._makeOne(precompressed=('gzip',))
+        response = self._call(inst, ('app.js',), 'br, gzip')
+        self.assertEqual(response.content_encoding, 'gzip')
+        response.app_iter.close()
+
+    def test_only_some_variants(self):
+        inst = self._makeOne()
+        response = self._call(inst, ('style.css',), 'br')
+        self.assertEqual(response.body, b'plain')
+        self.assertEqual(response.vary, ('Accept-Encoding',))
+        response = self._call(inst, ('style.css',), 'br, gzip')
+        self.assertEqual(response.body, b'gzipped style')
+
+    def test_no_variants(self):
+        self._write('index.html', b'index')
+        inst = self._makeOne()
+        response = self._call(inst, ('index.html',), 'br, gzip')
+        self.assertEqual(response.body, b'index')
+        self.assertEqual(response.content_encoding, None)
+        self.assertEqual(response.vary, None)
+
+    def test_compressed_file_with_variants(self):
+        from pyramid.response import _guess_type
+        self._write('archive.tar.gz', b'archive')
+        self._write('archive.tar.gz.br', b'brotlied archive')
+        inst = self._makeOne()
+        response = self._call(inst, ('archive.tar.gz',))
+        self.assertEqual(response.body, b'archive')
+        self.assertEqual(response.content_encoding, None)
+        self.assertEqual(response.content_type,
+                         _guess_type('archive.tar.gz')[0])
+        self.assertEqual(response.vary, ('Accept-Encoding',))
+        response = self._call(inst, ('archive.tar.gz',), 'br')
+        self.assertEqual(response.body, b'brotlied archive')
+        self.assertEqual(response.content_encoding, 'br')
+
+    def test_variants_remembered(self):
+        inst = self._makeOne()
+        self._call(inst, ('app.js',), 'gzip').app_iter.close()
+        os.remove(os.path.join(self.docroot, 'app.js.br'))
+        self.assertEqual(
+            inst.sidecar_cache.get(os.path.join(self.docroot, 'app.js')),
+            (('br', os.path.join(self.docroot, 'app.js.br')),
+             ('gzip', os.path.join(self.docroot, 'app.js.gz'))))
+
+    def test_variant_removed(self):
+        inst = self._makeOne(precompressed=('gzip',))
+        filepath = os.path.join(self.docroot, 'app.js')
+        self.assertEqual(self._call(inst, ('app.js',), 'gzip').body,
+                         b'gzipped')
+        os.remove(filepath + '.gz')
+        response = self._call(inst, ('app.js',), 'gzip')
+        self.assertEqual(response.body, b'uncompressed')
+        self.assertEqual(response.content_encoding, None)
+        self.assertEqual(response.vary, ('Accept-Encoding',))
+        self.assertEqual(inst.sidecar_cache.get(filepath), None)
+        response = self._call(inst, ('app.js',), 'gzip')
+        self.assertEqual(response.body, b'uncompressed')
+        self.assertEqual(response.vary, None)
+
+    def test_cache_files_large_variant_removed(self):
+        inst = self._makeOne(cache_files=True, stat_interval=None,
+                             cache_max_file_size=0)
+        self.assertEqual(self._call(inst, ('app.js',), 'br').body,
+                         b'brotlied')
+        os.remove(os.path.join(self.docroot, 'app.js.br'))
+        response = self._call(inst, ('app.js',), 'br')
+        self.assertEqual(response.body, b'uncompressed')
+        self.assertEqual(response.content_encoding, None)
+        self.assertEqual(inst.file_cache.get('app.js'), None)
+        response = self._call(inst, ('app.js',), 'br')
+        self.assertEqual(response.body, b'uncompressed')
+
+    def test_cache_files(self):
+        inst = self._makeOne(cache_files=True, stat_interval=None)
+        self.assertEqual(inst.sidecar_cache, None)
+        response = self._call(inst, ('app.js',), 'br')
+        self.assertEqual(response.body, b'brotlied')
+        self.assertEqual(response.content_encoding, 'br')
+        self.assertEqual(response.vary, ('Accept-Encoding',))
+        br_etag = response.etag
+        response = self._call(inst, ('app.js',), 'gzip')
+        self.assertEqual(response.body, b'gzipped')
+        self.assertEqual(response.content_encoding, 'gzip')
+        self.assertNotEqual(response.etag, br_etag)
+        response = self._call(inst, ('app.js',))
+        self.assertEqual(response.body, b'uncompressed')
+        self.assertEqual(response.content_encoding, None)
+        self.assertEqual(response.vary, ('Accept-Encoding',))
+
+    def test_cache_files_variant_changed(self):
+        inst = self._makeOne(cache_files=True, stat_interval=0)
+        self._call(inst, ('app.js',), 'gzip')
+        self._write('app.js.gz', b'gzipped again')
+        response = self._call(inst, ('app.js',), 'gzip')
+        self.assertEqual(response.body, b'gzipped again')
+
+    def test_cache_files_variant_removed(self):
+        inst = self._makeOne(cache_files=True, stat_interval=0)
+        self._call(inst, ('app.js',), 'br')
+        os.remove(os.path.join(self.docroot, 'app.js.br'))
+        response = self._call(inst, ('app.js',), 'br')
+        self.assertEqual(response.body, b'uncompressed')
+        self.assertEqual(response.content_encoding, None)
+
+class Test_static_view_content_etag(unittest.TestCase):
+    def setUp(self):
+        import tempfile
+        self.docroot = tempfile.mkdtemp()
+        os.mkdir(os.path.join(self.docroot, 'subdir'))
+        self._write('index.html', b'<html>static</html>')
+        self._write('subdir/index.html', b'<html>subdir</html>')
+
+    def tearDown(self):
+        import shutil
+        from pyramid.response import _content_hashes
+        _content_hashes.clear()
+        shutil.rmtree(self.docroot)
+
+    def _write(self, name, content):
+        with open(os.path.join(self.docroot, name), 'wb') as f:
+            f.write(content)
+
+    def _makeOne(self, root_dir=None, **kw):
+        from pyramid.static import static_view
+        kw.setdefault('content_etag', True)
+        return static_view(root_dir or self.docroot, use_subpath=True, **kw)
+
+    def _makeRequest(self, subpath, **kw):
+        from pyramid.request import Request
+        request = Request.blank('/', **kw)
+        request.subpath = subpath
+        return request
+
+    def test_ctor_defaultargs(self):
+        inst = self._makeOne(content_etag=False)
+        request = self._makeRequest(('index.html',))
+        response = inst(DummyContext(), request)
+        response.app_iter.close()
+        self.assertEqual(response.etag, None)
+
+    def test_it(self):
+        import hashlib
+        inst = self._makeOne()
+        request = self._makeRequest(('index.html',))
+        response = inst(DummyContext(), request)
+        response.app_iter.close()
+        etag = hashlib.sha1(b'<html>static</html>').hexdigest()
+        self.assertEqual(response.etag, etag)
+        request = self._makeRequest(('index.html',), if_none_match=etag)
+        response = inst(DummyContext(), request)
+        self.assertEqual(response.status, '304 Not Modified')
+
+    def test_precompressed(self):
+        import hashlib
+        self._write('index.html.gz', b'gzipped')
+        inst = self._makeOne(precompressed=True)
+        request = self._makeRequest(('index.html',),
+                                    headers={'Accept-Encoding': 'gzip'})
+        response = inst(DummyContext(), request)
+        response.app_iter.close()
+        self.assertEqual(response.etag, hashlib.sha1(b'gzipped').hexdigest())
+
+    def test_precompute_etags(self):
+        from pyramid.response import _content_hashes
+        inst = self._makeOne()
+        result = inst.precompute_etags(threads=2)
+        self.assertEqual(result, 2)
+        path = os.path.join(self.docroot, 'subdir', 'index.html')
+        self.assertTrue(_content_hashes.get(path) is not None)
+
+    def test_precompute_etags_grows_cache(self):
+        from repoze.lru import LRUCache
+        from pyramid import response
+        old_cache = response._content_hashes
+        response._content_hashes = LRUCache(2)
+        try:
+            response._content_hashes.put('other', ((0, 0), 'abc'))
+            inst = self._makeOne()
+            self.assertEqual(inst.precompute_etags(threads=2), 2)
+            cache = response._content_hashes
+            self.assertEqual(cache.size, 3)
+            self.assertEqual(cache.get('other'), ((0, 0), 'abc'))
+            for name in ('index.html', 'subdir/index.html'):
+                path = os.path.join(self.docroot, *name.split('/'))
+                self.assertTrue(cache.get(path) is not None)
+            self.assertEqual(cache.evictions, 0)
+            # hashing the same files again needs no more room
+            inst.precompute_etags(threads=2)
+            self.assertTrue(response._content_hashes is cache)
+        finally:
+            response._content_hashes = old_cache
+
+    def test_precompute_etags_package(self):
+        from pyramid.response import _content_hashes
+        from pyramid.static import resource_filename
+        inst = self._makeOne('pyramid.tests:fixtures/static')
+        result = inst.precompute_etags()
+        self.assertTrue(result > 1)
+        path = resource_filename('pyramid.tests',
+                                 'fixtures/static/subdir/index.html')
+        cached = _content_hashes.get(path)
+        request = self._makeRequest(('subdir', 'index.html'))
+        response = inst(DummyContext(), request)
+        response.app_iter.close()
+        self.assertEqual(response.etag, cached[1])
+
 class TestQueryStringConstantCacheBuster(unittest.TestCase):
 
     def _makeOne(self, param=None):
@@ -401,6 +905,158 @@ class TestQueryStringConstantCacheBuster(unittest.TestCase):
             fut('foo', 'bar', {'_query': (('a', 'b'),)}),
             ('bar', {'_query': (('a', 'b'), ('x', 'foo'))}))
 
+class TestContentHashCacheBuster(unittest.TestCase):
+    def setUp(self):
+        import tempfile
+        self.docroot = tempfile.mkdtemp()
+        os.mkdir(os.path.join(self.docroot, 'css'))
+        self._write('css/main.css', b'body {}', 1000000000)
+        self._write('index.html', b'<html></html>', 1000000000)
+
+    def tearDown(self):
+        import shutil
+        from pyramid.response import _content_hashes
+        _content_hashes.clear()
+        shutil.rmtree(self.docroot)
+
+    def _write(self, name, content, mtime):
+        path = os.path.join(self.docroot, name)
+        with open(path, 'wb') as f:
+            f.write(content)
+        os.utime(path, (mtime, mtime))
+
+    def _makeOne(self, spec=None, **kw):
+        from pyramid.static import ContentHashCacheBuster as cls
+        return cls(spec or self.docroot, **kw)
+
+    def _token(self, content):
+        import hashlib
+        return hashlib.sha1(content).hexdigest()[:16]
+
+    def _rawspec(self, subpath):
+        return os.path.join(self.docroot, subpath)
+
+    def test_index(self):
+        inst = self._makeOne(threads=2)
+        self.assertEqual(inst.prefix, self.docroot + os.sep)
+        self.assertEqual(
+            sorted(inst._tokens),
+            [self._rawspec('css/main.css'), self._rawspec('index.html')])
+        self.assertEqual(
+            inst._tokens[self._rawspec('index.html')][0],
+            self._token(b'<html></html>'))
+
+    def test_it(self):
+        inst = self._makeOne()
+        kw = {'rawspec': self._rawspec('css/main.css')}
+        self.assertEqual(
+            inst('request', 'css/main.css', kw),
+            ('css/main.css', {'rawspec': self._rawspec('css/main.css'),
+                              '_query': {'x': self._token(b'body {}')}}))
+
+    def test_without_rawspec(self):
+        inst = self._makeOne()
+        self.assertEqual(
+            inst('request', 'css/main.css', {}),
+            ('css/main.css', {'_query': {'x': self._token(b'body {}')}}))
+
+    def test_query_is_already_tuple(self):
+        inst = self._makeOne(param='v')
+        self.assertEqual(
+            inst('request', 'index.html', {'_query': [('a', 'b')]}),
+            ('index.html',
+             {'_query': (('a', 'b'), ('v', self._token(b'<html></html>')))}))
+
+    def test_missing_asset(self):
+        inst = self._makeOne()
+        self.assertEqual(
+            inst('request', 'missing.css', {}), ('missing.css', {}))
+        self.assertEqual(inst._tokens[self._rawspec('missing.css')][0], None)
+
+    def test_directory(self):
+        inst = self._makeOne()
+        self.assertEqual(inst('request', 'css', {}), ('css', {}))
+
+    def test_asset_not_in_index(self):
+        inst = self._makeOne()
+        self._write('new.js', b'var x;', 1000000000)
+        self.assertEqual(
+            inst('request', 'new.js', {}),
+            ('new.js', {'_query': {'x': self._token(b'var x;')}}))
+        self.assertTrue(self._rawspec('new.js') in inst._tokens)
+
+    def test_no_reload(self):
+        inst = self._makeOne()
+        self._write('index.html', b'<html>new</html>', 1000000001)
+        self.assertEqual(
+            inst.tokenize('request', 'index.html', {}),
+            self._token(b'<html></html>'))
+
+    def test_reload(self):
+        inst = self._makeOne(reload=True, check_interval=0)
+        self._write('index.html', b'<html>new</html>', 1000000001)
+        self.assertEqual(
+            inst.tokenize('request', 'index.html', {}),
+            self._token(b'<html>new</html>'))
+        # an unchanged file is not hashed again
+        inst._hash = None
+        self.assertEqual(
+            inst.tokenize('request', 'index.html', {}),
+            self._token(b'<html>new</html>'))
+
+    def test_reload_check_interval(self):
+        inst = self._makeOne(reload=True, check_interval=3600)
+        self._write('index.html', b'<html>new</html>', 1000000001)
+        self.assertEqual(
+            inst.tokenize('request', 'index.html', {}),
+            self._token(b'<html></html>'))
+
+    def test_reload_removed(self):
+        inst = self._makeOne(reload=True, check_interval=0)
+        os.remove(os.path.join(self.docroot, 'index.html'))
+        self.assertEqual(inst.tokenize('request', 'index.html', {}), None)
+
+    def test_with_absspec(self):
+        inst = self._makeOne('pyramid.tests:fixtures/static')
+        self.assertEqual(inst.prefix, 'pyramid.tests:fixtures/static/')
+        self.assertTrue(
+            'pyramid.tests:fixtures/static/subdir/index.html' in inst._tokens)
+
+    def test_with_relspec(self):
+        inst = self._makeOne('fixtures/static/')
+        self.assertEqual(inst.prefix, 'pyramid.tests:fixtures/static/')
+        with open(os.path.join(here, 'fixtures', 'static', 'index.html'),
+                  'rb') as f:
+            token = self._token(f.read())
+        kw = {'rawspec': 'pyramid.tests:fixtures/static/index.html'}
+        self.assertEqual(inst.tokenize('request', 'index.html', kw), token)
+
+    def test_with_package_root(self):
+        inst = self._makeOne('pyramid.tests:', threads=1)
+        self.assertEqual(inst.prefix, 'pyramid.tests:')
+        self.assertTrue(
+            'pyramid.tests:fixtures/static/index.html' in inst._tokens)
+
+    def test_static_url(self):
+        from pyramid import testing
+        config = testing.setUp()
+        try:
+            config.add_static_view('static', 'pyramid.tests:fixtures/static')
+            config.add_cache_buster(
+                'pyramid.tests:fixtures/static',
+                self._makeOne('pyramid.tests:fixtures/static'))
+            config.commit()
+            request = testing.DummyRequest()
+            with open(os.path.join(here, 'fixtures', 'static', 'subdir',
+                                   'index.html'), 'rb') as f:
+                token = self._token(f.read())
+            self.assertEqual(
+                request.static_url(
+                    'pyramid.tests:fixtures/static/subdir/index.html'),
+                'http://example.com/static/subdir/index.html?x=' + token)
+        finally:
+            testing.tearDown()
+
 class TestManifestCacheBuster(unittest.TestCase):
 
     def _makeOne(self, path, **kw):
@@ -462,6 +1118,100 @@ class TestManifestCacheBuster(unittest.TestCase):
     def test_invalid_manifest(self):
         self.assertRaises(IOError, lambda: self._makeOne('foo'))
 
+    def test_reload_check_interval(self):
+        manifest_path = os.path.join(here, 'fixtures', 'manifest.json')
+        new_manifest_path = os.path.join(here, 'fixtures', 'manifest2.json')
+        inst = self._makeOne(manifest_path, reload=True, check_interval=10)
+        inst.now = lambda: 100
+        calls = []
+        def getmtime(path):
+            calls.append(path)
+            return len(calls)
+        inst.getmtime = getmtime
+        self.assertEqual(
+            inst('foo', 'css/main.css', {}), ('css/main-test.css', {}))
+        inst.manifest_path = new_manifest_path
+        inst.now = lambda: 109
+        self.assertEqual(
+            inst('foo', 'css/main.css', {}), ('css/main-test.css', {}))
+        self.assertEqual(len(calls), 1)
+        inst.now = lambda: 110
+        self.assertEqual(
+            inst('foo', 'css/main.css', {}), ('css/main-678b7c80.css', {}))
+        self.assertEqual(len(calls), 2)
+
+    def test_reload_unchanged_not_parsed(self):
+        manifest_path = os.path.join(here, 'fixtures', 'manifest.json')
+        inst = self._makeOne(manifest_path, reload=True)
+        inst.getmtime = lambda *args, **kwargs: 0
+        self.assertEqual(
+            inst('foo', 'css/main.css', {}), ('css/main-test.css', {}))
+        inst.get_manifest = None
+        self.assertEqual(
+            inst('foo', 'css/main.css', {}), ('css/main-test.css', {}))
+
+    def test_reload_manifest_disappears(self):
+        from pyramid.static import logger
+        manifest_path = os.path.join(here, 'fixtures', 'manifest.json')
+        inst = self._makeOne(manifest_path, reload=True)
+        inst.getmtime = lambda *args, **kwargs: 0
+        warnings = []
+        def warning(msg, *args):
+            warnings.append(msg % args)
+        old_warning = logger.warning
+        logger.warning = warning
+        try:
+            self.assertEqual(
+                inst('foo', 'css/main.css', {}), ('css/main-test.css', {}))
+            self.assertEqual(warnings, [])
+            inst.exists = lambda path: False
+            self.assertEqual(
+                inst('foo', 'css/main.css', {}), ('css/main.css', {}))
+            self.assertEqual(len(warnings), 1)
+            self.assertTrue(manifest_path in warnings[0])
+            # only warned about once while it is missing
+            self.assertEqual(
+                inst('foo', 'css/main.css', {}), ('css/main.css', {}))
+            self.assertEqual(len(warnings), 1)
+            # and again if it disappears after coming back
+            inst.exists = lambda path: True
+            self.assertEqual(
+                inst('foo', 'css/main.css', {}), ('css/main-test.css', {}))
+            inst.exists = lambda path: False
+            inst('foo', 'css/main.css', {})
+            self.assertEqual(len(warnings), 2)
+        finally:
+            logger.warning = old_warning
+
+    def test_reload_parsed_once_by_concurrent_threads(self):
+        import threading
+        manifest_path = os.path.join(here, 'fixtures', 'manifest.json')
+        inst = self._makeOne(manifest_path, reload=True)
+        inst.getmtime = lambda *args, **kwargs: 0
+        parsing = threading.Event()
+        release = threading.Event()
+        parsed = []
+        get_manifest = inst.get_manifest
+        def slow_get_manifest():
+            parsed.append(1)
+            parsing.set()
+            release.wait(5)
+            return get_manifest()
+        inst.get_manifest = slow_get_manifest
+        results = []
+        def run():
+            results.append(inst('foo', 'css/main.css', {}))
+        t1 = threading.Thread(target=run)
+        t1.start()
+        parsing.wait(5)
+        t2 = threading.Thread(target=run)
+        t2.start()
+        release.set()
+        t1.join()
+        t2.join()
+        self.assertEqual(len(parsed), 1)
+        self.assertEqual(results, [('css/main-test.css', {})] * 2)
+
     def test_invalid_manifest_with_reload(self):
         inst = self._makeOne('foo', reload=True)
         self.assertEqual(inst.manifest, {})
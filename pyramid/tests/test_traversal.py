@@ -473,7 +473,247 @@ class ResourceTreeTraverserTests(unittest.TestCase):
         self.assertEqual(result['root'], resource)
         self.assertEqual(result['virtual_root'], abc)
         self.assertEqual(result['virtual_root_path'], ('abc',))
-        
+
+    def _makeBatchingTree(self):
+        backend = DummyBackend()
+        root = DummyBatchingContext(backend, ())
+        return backend, root
+
+    def test_traverse_many_single_call(self):
+        backend, root = self._makeBatchingTree()
+        policy = self._makeOne(root)
+        request = DummyRequest({}, path_info=text_('/a/b/c'))
+        result = policy(request)
+        self.assertEqual(result['context'].path, ('a', 'b', 'c'))
+        self.assertEqual(result['view_name'], '')
+        self.assertEqual(result['subpath'], ())
+        self.assertEqual(result['traversed'], ('a', 'b', 'c'))
+        self.assertEqual(backend.calls, [('traverse_many', ('a', 'b', 'c'))])
+
+    def test_traverse_many_view_name(self):
+        backend, root = self._makeBatchingTree()
+        backend.known = set([('a',), ('a', 'b')])
+        policy = self._makeOne(root)
+        request = DummyRequest({}, path_info=text_('/a/b/edit/x'))
+        result = policy(request)
+        self.assertEqual(result['context'].path, ('a', 'b'))
+        self.assertEqual(result['view_name'], 'edit')
+        self.assertEqual(result['subpath'], ('x',))
+        self.assertEqual(result['traversed'], ('a', 'b'))
+        self.assertEqual(backend.calls, [
+            ('traverse_many', ('a', 'b', 'edit', 'x')),
+            ('traverse_many', ('edit', 'x')),
+            ('getitem', 'edit'),
+            ])
+
+    def test_traverse_many_stops_at_view_selector(self):
+        backend, root = self._makeBatchingTree()
+        policy = self._makeOne(root)
+        request = DummyRequest({}, path_info=text_('/a/b/@@edit/x'))
+        result = policy(request)
+        self.assertEqual(result['context'].path, ('a', 'b'))
+        self.assertEqual(result['view_name'], 'edit')
+        self.assertEqual(result['subpath'], ('x',))
+        self.assertEqual(result['traversed'], ('a', 'b'))
+        self.assertEqual(backend.calls, [('traverse_many', ('a', 'b'))])
+
+    def test_traverse_many_partial(self):
+        backend, root = self._makeBatchingTree()
+        backend.batch_limit = 2
+        policy = self._makeOne(root)
+        request = DummyRequest({}, path_info=text_('/a/b/c'))
+        result = policy(request)
+        self.assertEqual(result['context'].path, ('a', 'b', 'c'))
+        self.assertEqual(backend.calls, [
+            ('traverse_many', ('a', 'b', 'c')),
+            ('traverse_many', ('c',)),
+            ])
+
+    def test_traverse_many_empty_uses_getitem(self):
+        backend, root = self._makeBatchingTree()
+        backend.batch_limit = 0
+        policy = self._makeOne(root)
+        request = DummyRequest({}, path_info=text_('/a'))
+        result = policy(request)
+        self.assertEqual(result['context'].path, ('a',))
+        self.assertEqual(backend.calls, [
+            ('traverse_many', ('a',)),
+            ('getitem', 'a'),
+            ])
+
+    def test_traverse_many_with_vh_root(self):
+        backend, root = self._makeBatchingTree()
+        environ = self._getEnviron(HTTP_X_VHM_ROOT='/a/b')
+        policy = self._makeOne(root)
+        request = DummyRequest(environ, path_info=text_('/c'))
+        result = policy(request)
+        self.assertEqual(result['context'].path, ('a', 'b', 'c'))
+        self.assertEqual(result['traversed'], ('a', 'b', 'c'))
+        self.assertEqual(result['virtual_root'].path, ('a', 'b'))
+        self.assertEqual(result['virtual_root_path'], ('a', 'b'))
+        self.assertEqual(backend.calls, [('traverse_many', ('a', 'b', 'c'))])
+
+class TraversalCacheTests(unittest.TestCase):
+    def _makeOne(self, **kw):
+        from pyramid.traversal import TraversalCache
+        return TraversalCache(**kw)
+
+    def _makeTree(self):
+        backend = DummyBackend()
+        backend.known = set([('a',), ('a', 'b')])
+        root = DummyBatchingContext(backend, ())
+        # exercise __getitem__ only
+        backend.batch_limit = 0
+        return backend, root
+
+    def _traverse(self, cache, root, path, environ=None, matchdict=None):
+        request = DummyRequest(environ or {}, path_info=text_(path))
+        request.matchdict = matchdict
+        return cache(root)(request)
+
+    def test_conforms_to_ITraverser(self):
+        from zope.interface.verify import verifyObject
+        from pyramid.interfaces import ITraverser
+        cache = self._makeOne()
+        verifyObject(ITraverser, cache(DummyContext()))
+
+    def test_hit(self):
+        backend, root = self._makeTree()
+        cache = self._makeOne()
+        result = self._traverse(cache, root, '/a/b')
+        self.assertEqual(result['context'].path, ('a', 'b'))
+        calls = len(backend.calls)
+        result2 = self._traverse(cache, root, '/a/b')
+        self.assertEqual(result2, result)
+        self.assertFalse(result2 is result)
+        self.assertEqual(len(backend.calls), calls)
+        info = cache.cache_info()
+        self.assertEqual(info['hits'], 1)
+        self.assertEqual(info['misses'], 1)
+        self.assertEqual(info['entries'], 1)
+
+    def test_keyed_on_root(self):
+        backend, root = self._makeTree()
+        other = DummyBatchingContext(backend, ())
+        cache = self._makeOne()
+        self._traverse(cache, root, '/a')
+        result = self._traverse(cache, other, '/a')
+        self.assertEqual(result['root'], other)
+
+    def test_keyed_on_vroot(self):
+        from pyramid.interfaces import VH_ROOT_KEY
+        backend, root = self._makeTree()
+        cache = self._makeOne()
+        self._traverse(cache, root, '/b')
+        result = self._traverse(cache, root, '/b', {VH_ROOT_KEY: '/a'})
+        self.assertEqual(result['context'].path, ('a', 'b'))
+        self.assertEqual(result['virtual_root'].path, ('a',))
+
+    def test_keyed_on_matchdict(self):
+        backend, root = self._makeTree()
+        cache = self._makeOne()
+        result = self._traverse(cache, root, '/x',
+                                matchdict={'traverse': ('a', 'b'),
+                                           'subpath': ('c',)})
+        self.assertEqual(result['context'].path, ('a', 'b'))
+        self.assertEqual(result['subpath'], ('c',))
+        result = self._traverse(cache, root, '/x',
+                                matchdict={'traverse': ('a', 'b'),
+                                           'subpath': ('d',)})
+        self.assertEqual(result['subpath'], ('d',))
+        self.assertEqual(cache.cache_info()['entries'], 2)
+
+    def test_miss_not_cached(self):
+        backend, root = self._makeTree()
+        cache = self._makeOne()
+        result = self._traverse(cache, root, '/a/edit/x')
+        self.assertEqual(result['view_name'], 'edit')
+        self.assertEqual(result['subpath'], ('x',))
+        self.assertEqual(cache.cache_info()['entries'], 0)
+
+    def test_miss_cached_when_configured(self):
+        backend, root = self._makeTree()
+        cache = self._makeOne(cache_misses=True)
+        self._traverse(cache, root, '/a/edit/x')
+        self.assertEqual(cache.cache_info()['entries'], 1)
+
+    def test_miss_with_vroot_not_cached(self):
+        from pyramid.interfaces import VH_ROOT_KEY
+        backend, root = self._makeTree()
+        cache = self._makeOne()
+        result = self._traverse(cache, root, '/edit', {VH_ROOT_KEY: '/a'})
+        self.assertEqual(result['view_name'], 'edit')
+        self.assertEqual(cache.cache_info()['entries'], 0)
+
+    def test_view_selector_cached(self):
+        backend, root = self._makeTree()
+        cache = self._makeOne()
+        result = self._traverse(cache, root, '/a/@@edit/x')
+        self.assertEqual(result['view_name'], 'edit')
+        self.assertEqual(cache.cache_info()['entries'], 1)
+
+    def test_view_selector_in_matchdict_traverse_cached(self):
+        backend, root = self._makeTree()
+        cache = self._makeOne()
+        result = self._traverse(cache, root, '/x',
+                                matchdict={'traverse': ('a', '@@edit')})
+        self.assertEqual(result['view_name'], 'edit')
+        self.assertEqual(cache.cache_info()['entries'], 1)
+
+    def test_leaf_view_name_cached(self):
+        class Leaf(object):
+            pass
+        root = Leaf()
+        cache = self._makeOne()
+        result = self._traverse(cache, root, '/foo/bar')
+        self.assertEqual(result['view_name'], 'foo')
+        self.assertEqual(cache.cache_info()['entries'], 1)
+
+    def test_invalidate_all(self):
+        backend, root = self._makeTree()
+        cache = self._makeOne()
+        self._traverse(cache, root, '/a')
+        self._traverse(cache, root, '/a/b')
+        cache.invalidate()
+        self.assertEqual(cache.cache_info()['entries'], 0)
+
+    def test_invalidate_root(self):
+        backend, root = self._makeTree()
+        other = DummyBatchingContext(backend, ())
+        cache = self._makeOne()
+        self._traverse(cache, root, '/a')
+        self._traverse(cache, other, '/a')
+        cache.invalidate(root)
+        self.assertEqual(cache.cache_info()['entries'], 1)
+        result = self._traverse(cache, other, '/a')
+        self.assertEqual(result['root'], other)
+        self.assertEqual(cache.cache_info()['hits'], 1)
+
+    def test_bounded(self):
+        backend, root = self._makeTree()
+        backend.known = None
+        cache = self._makeOne(max_entries=2)
+        for name in ('a', 'b', 'c', 'd'):
+            self._traverse(cache, root, '/' + name)
+        self.assertEqual(cache.cache_info()['entries'], 2)
+
+    def test_ttl(self):
+        backend, root = self._makeTree()
+        cache = self._makeOne(ttl=-1) # already expired when stored
+        self._traverse(cache, root, '/a')
+        self._traverse(cache, root, '/a')
+        info = cache.cache_info()
+        self.assertEqual(info['hits'], 0)
+        self.assertEqual(info['misses'], 2)
+
+    def test_path_info_undecodable(self):
+        from pyramid.exceptions import URLDecodeError
+        cache = self._makeOne()
+        request = DummyRequest({}, toraise=UnicodeDecodeError(
+            'utf-8', b'\xff', 0, 1, 'bad'))
+        traverser = cache(DummyContext())
+        self.assertRaises(URLDecodeError, traverser, request)
+
 class FindInterfaceTests(unittest.TestCase):
     def _callFUT(self, context, iface):
         from pyramid.traversal import find_interface
@@ -827,6 +1067,58 @@ class ResourcePathTupleTests(unittest.TestCase):
         result = self._callFUT(other2)
         self.assertEqual(result, ('', '', 'other2'))
 
+class ResourcePathCacheMixinTests(unittest.TestCase):
+    def _callFUT(self, resource, *elements):
+        from pyramid.traversal import resource_path_tuple
+        return resource_path_tuple(resource, *elements)
+
+    def _makeTree(self):
+        root = DummyCachingContext(None, None)
+        foo = DummyCachingContext(root, 'foo')
+        bar = DummyCachingContext(foo, 'bar')
+        return root, foo, bar
+
+    def test_it(self):
+        root, foo, bar = self._makeTree()
+        self.assertEqual(self._callFUT(bar), ('', 'foo', 'bar'))
+        self.assertEqual(self._callFUT(bar, 'a', 'b'),
+                         ('', 'foo', 'bar', 'a', 'b'))
+        self.assertEqual(foo._v_pyramid_path[1], ('', 'foo'))
+        self.assertEqual(root._v_pyramid_path[1], ('',))
+
+    def test_cached(self):
+        root, foo, bar = self._makeTree()
+        self._callFUT(bar)
+        foo.__name__ = 'renamed'
+        self.assertEqual(self._callFUT(bar), ('', 'foo', 'bar'))
+
+    def test_sibling_reuses_parent_path(self):
+        root, foo, bar = self._makeTree()
+        self._callFUT(bar)
+        baz = DummyCachingContext(foo, 'baz')
+        foo.__parent__ = None # would change the path if it were walked
+        self.assertEqual(self._callFUT(baz), ('', 'foo', 'baz'))
+
+    def test_invalidate_resource_paths(self):
+        from pyramid.traversal import invalidate_resource_paths
+        root, foo, bar = self._makeTree()
+        self._callFUT(bar)
+        foo.__name__ = 'renamed'
+        invalidate_resource_paths()
+        self.assertEqual(self._callFUT(bar), ('', 'renamed', 'bar'))
+
+    def test_noncaching_ancestor(self):
+        root = DummyContext()
+        root.__name__ = None
+        foo = DummyCachingContext(root, 'foo')
+        self.assertEqual(self._callFUT(foo), ('', 'foo'))
+        self.assertFalse('_v_pyramid_path' in root.__dict__)
+
+    def test_resource_path(self):
+        from pyramid.traversal import resource_path
+        root, foo, bar = self._makeTree()
+        self.assertEqual(resource_path(bar, 'a b'), '/foo/bar/a%20b')
+
 class QuotePathSegmentTests(unittest.TestCase):
     def _callFUT(self, s):
         from pyramid.traversal import quote_path_segment
@@ -863,6 +1155,112 @@ class QuotePathSegmentTests(unittest.TestCase):
         result = self._callFUT(s)
         self.assertEqual(result, 'abc')
 
+class SegmentCacheTests(unittest.TestCase):
+    def setUp(self):
+        from pyramid import traversal
+        self.old_cache = traversal._segment_cache
+
+    def tearDown(self):
+        from pyramid import traversal
+        traversal._segment_cache = self.old_cache
+
+    def _setSize(self, size):
+        from pyramid.traversal import set_segment_cache_size
+        set_segment_cache_size(size)
+
+    def _info(self):
+        from pyramid.traversal import segment_cache_info
+        return segment_cache_info()
+
+    def _quote(self, s):
+        from pyramid.traversal import quote_path_segment
+        return quote_path_segment(s)
+
+    def test_set_size_empties_cache(self):
+        self._quote('abc')
+        self._setSize(5)
+        info = self._info()
+        self.assertEqual(info['size'], 5)
+        self.assertEqual(info['entries'], 0)
+
+    def test_hits_and_misses(self):
+        self._setSize(5)
+        self.assertEqual(self._quote('a b'), 'a%20b')
+        self.assertEqual(self._quote('a b'), 'a%20b')
+        self.assertEqual(self._quote(12345), '12345')
+        self.assertEqual(self._quote(12345), '12345')
+        info = self._info()
+        self.assertEqual(info['lookups'], 4)
+        self.assertEqual(info['hits'], 2)
+        self.assertEqual(info['misses'], 2)
+        self.assertEqual(info['entries'], 2)
+
+    def test_bounded(self):
+        self._setSize(10)
+        for i in range(100):
+            self.assertEqual(self._quote('segment %d' % i),
+                             'segment%%20%d' % i)
+        info = self._info()
+        self.assertEqual(info['entries'], 10)
+        self.assertEqual(info['evictions'], 90)
+
+    def test_keyed_on_safe(self):
+        from pyramid.traversal import quote_path_segment
+        self._setSize(10)
+        self.assertEqual(quote_path_segment('a/b'), 'a%2Fb')
+        self.assertEqual(quote_path_segment('a/b', safe='/'), 'a/b')
+
+    def test_keyed_on_class(self):
+        # 1, 1.0 and True are equal and hash alike, but quote differently
+        self._setSize(10)
+        self.assertEqual(self._quote(1), '1')
+        self.assertEqual(self._quote(True), 'True')
+        self.assertEqual(self._quote(1.0), '1.0')
+        self.assertEqual(self._quote(1), '1')
+        self.assertEqual(self._info()['entries'], 3)
+
+    def test_evicts_unreferenced(self):
+        self._setSize(2)
+        self._quote('a')
+        self._quote('b')
+        self._quote('c')
+        self.assertEqual(self._segments(), ['b', 'c'])
+
+    def test_second_chance(self):
+        self._setSize(3)
+        self._quote('static')
+        self._quote('x')
+        self._quote('y')
+        for i in range(20):
+            # a hot segment used between one-off ones keeps its place
+            self._quote('static')
+            self._quote('slug%d' % i)
+        self.assertTrue('static' in self._segments())
+        self.assertEqual(self._info()['evictions'], 20)
+
+    def test_all_referenced(self):
+        self._setSize(2)
+        for s in ('a', 'b', 'a', 'b'):
+            self._quote(s)
+        self._quote('c')
+        # the hand clears every bit, then evicts the first entry
+        self.assertEqual(self._segments(), ['b', 'c'])
+
+    def test_size_zero(self):
+        self._setSize(0)
+        self.assertEqual(self._quote('a b'), 'a%20b')
+        self.assertEqual(self._quote('a b'), 'a%20b')
+        info = self._info()
+        self.assertEqual(info['entries'], 0)
+        self.assertEqual(info['misses'], 2)
+
+    def _segments(self):
+        return sorted(key[1] for key in self._cache().data)
+
+    def _cache(self):
+        from pyramid import traversal
+        return traversal._segment_cache
+
 class ResourceURLTests(unittest.TestCase):
     def _makeOne(self, context, url):
         return self._getTargetClass()(context, url)
@@ -1333,6 +1731,55 @@ class DummyContext(object):
     def __repr__(self):
         return '<DummyContext with name %s at id %s>'%(self.__name__, id(self))
 
+class DummyBackend(object):
+    known = None # every path exists
+    batch_limit = None
+    def __init__(self):
+        self.calls = []
+        self.resources = {}
+
+    def get(self, path):
+        if self.known is not None and path not in self.known:
+            return None
+        resource = self.resources.get(path)
+        if resource is None:
+            resource = self.resources[path] = DummyBatchingContext(self, path)
+        return resource
+
+class DummyBatchingContext(object):
+    def __init__(self, backend, path):
+        self.backend = backend
+        self.path = path
+
+    def __getitem__(self, name):
+        self.backend.calls.append(('getitem', name))
+        resource = self.backend.get(self.path + (name,))
+        if resource is None:
+            raise KeyError(name)
+        return resource
+
+    def __traverse_many__(self, names):
+        backend = self.backend
+        backend.calls.append(('traverse_many', names))
+        if backend.batch_limit is not None:
+            names = names[:backend.batch_limit]
+        result = []
+        path = self.path
+        for name in names:
+            path = path + (name,)
+            resource = backend.get(path)
+            if resource is None:
+                break
+            result.append(resource)
+        return result
+
+from pyramid.traversal import ResourcePathCacheMixin
+
+class DummyCachingContext(ResourcePathCacheMixin):
+    def __init__(self, parent, name):
+        self.__parent__ = parent
+        self.__name__ = name
+
 class DummyRequest:
 
     application_url = 'http://example.com:5432' # app_url never ends with slash
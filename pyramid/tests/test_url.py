@@ -443,6 +443,19 @@ class TestURLMethodsMixin(unittest.TestCase):
         self.assertEqual(result,
                          'http://example.com:5432/1/2/3?a=1#foo')
 
+    def test_route_url_with_query_fragment(self):
+        from pyramid.interfaces import IRoutesMapper
+        from pyramid.url import QueryFragment
+        request = self._makeOne()
+        mapper = DummyRoutesMapper(route=DummyRoute('/1/2/3'))
+        request.registry.registerUtility(mapper, IRoutesMapper)
+        shared = QueryFragment([('sort', 'name'), ('q', 'a b')])
+        result = request.route_url('flub', _query=[('page', 2), shared])
+        self.assertEqual(result,
+                         'http://example.com:5432/1/2/3?page=2&sort=name&q=a+b')
+        result = request.route_url('flub', _query=QueryFragment({}))
+        self.assertEqual(result, 'http://example.com:5432/1/2/3')
+
     def test_route_url_with_anchor_binary(self):
         from pyramid.interfaces import IRoutesMapper
         request = self._makeOne()
@@ -995,6 +1008,96 @@ class TestURLMethodsMixin(unittest.TestCase):
         request.script_name = '/abc'
         result = request._partial_application_url()
         self.assertEqual(result, 'http://example.com:8000/abc') 
+
+    def test_partial_application_url_memoized(self):
+        environ = {
+            'wsgi.url_scheme':'http',
+            'SERVER_NAME':'example.com',
+            'SERVER_PORT':'8000',
+            }
+        request = self._makeOne(environ)
+        request._make_partial_application_url = None # not called again
+        request._app_url_memo()[('https', None, None)] = 'https://cached'
+        result = request._partial_application_url('https')
+        self.assertEqual(result, 'https://cached')
+
+    def test_partial_application_url_memo_reset_on_environ_change(self):
+        environ = {
+            'wsgi.url_scheme':'http',
+            'SERVER_NAME':'example.com',
+            'SERVER_PORT':'8000',
+            }
+        request = self._makeOne(environ)
+        result = request._partial_application_url(port='8080')
+        self.assertEqual(result, 'http://example.com:8080')
+        environ['HTTP_HOST'] = 'other.com'
+        result = request._partial_application_url(port='8080')
+        self.assertEqual(result, 'http://other.com:8080')
+        request.environ = {
+            'wsgi.url_scheme':'https',
+            'SERVER_NAME':'example.com',
+            'SERVER_PORT':'8000',
+            }
+        result = request._partial_application_url(port='8080')
+        self.assertEqual(result, 'https://example.com:8080')
+
+    def test_route_url_mapper_looked_up_once(self):
+        from pyramid.interfaces import IRoutesMapper
+        request = self._makeOne()
+        mapper = DummyRoutesMapper(route=DummyRoute('/1/2/3'))
+        request.registry.registerUtility(mapper, IRoutesMapper)
+        request.route_url('flub')
+        request.registry.unregisterUtility(mapper, IRoutesMapper)
+        result = request.route_url('flub')
+        self.assertEqual(result, 'http://example.com:5432/1/2/3')
+
+    def test_route_url_mapper_memo_per_registry(self):
+        from pyramid.interfaces import IRoutesMapper
+        from pyramid.registry import Registry
+        request = self._makeOne()
+        mapper = DummyRoutesMapper(route=DummyRoute('/1/2/3'))
+        request.registry.registerUtility(mapper, IRoutesMapper)
+        request.route_url('flub')
+        request.registry = Registry()
+        mapper = DummyRoutesMapper(route=DummyRoute('/4/5/6'))
+        request.registry.registerUtility(mapper, IRoutesMapper)
+        result = request.route_url('flub')
+        self.assertEqual(result, 'http://example.com:5432/4/5/6')
+
+    def test_resource_url_adapter_looked_up_once_per_provided(self):
+        from zope.interface import alsoProvides
+        from zope.interface import Interface
+        from pyramid.interfaces import IResourceURL
+        class IMarker(Interface):
+            pass
+        class MarkerResourceURL(object):
+            physical_path = '/marker/'
+            virtual_path = '/marker/'
+            def __init__(self, context, request): pass
+        request = self._makeOne()
+        reg = request.registry
+        self._registerResourceURL(reg)
+        reg.registerAdapter(MarkerResourceURL, (IMarker, Interface),
+                            IResourceURL)
+        lookups = []
+        lookup = reg.adapters.lookup
+        def counting_lookup(required, provided):
+            lookups.append(required)
+            return lookup(required, provided)
+        reg.adapters.lookup = counting_lookup
+        try:
+            context = DummyContext()
+            marked = DummyContext()
+            alsoProvides(marked, IMarker)
+            self.assertEqual(request.resource_url(context),
+                             'http://example.com:5432/context/')
+            self.assertEqual(request.resource_url(DummyContext()),
+                             'http://example.com:5432/context/')
+            self.assertEqual(request.resource_url(marked),
+                             'http://example.com:5432/marker/')
+        finally:
+            del reg.adapters.lookup
+        self.assertEqual(len(lookups), 2)
         
 class Test_route_url(unittest.TestCase):
     def _callFUT(self, route_name, request, *elements, **kw):
@@ -1,3 +1,4 @@
+import threading
 import warnings
 
 from zope.deprecation import deprecated
@@ -5,7 +6,11 @@ from zope.deprecation import deprecated
 from zope.interface import implementer
 from zope.interface.interfaces import IInterface
 
-from repoze.lru import lru_cache
+from repoze.lru import (
+    ExpiringLRUCache,
+    LRUCache,
+    lru_cache,
+    )
 
 from pyramid.interfaces import (
     IResourceURL,
@@ -388,6 +393,11 @@ def resource_path_tuple(resource, *elements):
        as ``model_path_tuple``, although doing so will cause a deprecation
        warning to be emitted.
     """
+    if isinstance(resource, ResourcePathCacheMixin):
+        path = _cached_path_tuple(resource)
+        if elements:
+            path = path + elements
+        return path
     return tuple(_resource_path_list(resource, *elements))
 
 model_path_tuple = resource_path_tuple  # b/w compat (forever)
@@ -399,6 +409,63 @@ def _resource_path_list(resource, *elements):
     path.extend(elements)
     return path
 
+_path_generation = 0
+
+def invalidate_resource_paths():
+    """ Discard every physical path cached by resources which use
+    :class:`pyramid.traversal.ResourcePathCacheMixin`.  Call this after
+    renaming or moving such a resource (or one of its ancestors) in a
+    resource tree which outlives a single request.
+
+    .. versionadded:: 1.8
+    """
+    global _path_generation
+    _path_generation += 1
+
+class ResourcePathCacheMixin(object):
+    """ A mixin for :term:`location`-aware resource classes which makes
+    :func:`pyramid.traversal.resource_path_tuple`, and therefore
+    :func:`pyramid.traversal.resource_path`, ``request.resource_url``,
+    ``request.resource_path`` and the ``physical_path`` view predicate,
+    remember the physical path of each resource rather than walking its
+    :term:`lineage` every time.
+
+    A resource's path is computed from the cached path of its nearest
+    ancestor which also uses this mixin, so in a tree made up entirely of
+    such resources each lookup costs at most a few attribute accesses.
+    Cached paths are not noticed to be stale when a resource's ``__name__``
+    or ``__parent__`` changes; call
+    :func:`pyramid.traversal.invalidate_resource_paths` after doing so.
+    Trees which are rebuilt for each request never need to do this.
+
+    The path is stored in the ``_v_pyramid_path`` instance attribute, which
+    ZODB treats as volatile, so it is never persisted.
+
+    .. versionadded:: 1.8
+    """
+    _v_pyramid_path = None
+
+def _cached_path_tuple(resource):
+    generation = _path_generation
+    uncached = []
+    path = ()
+    while resource is not None:
+        if isinstance(resource, ResourcePathCacheMixin):
+            cached = resource._v_pyramid_path
+            if cached is not None and cached[0] == generation:
+                path = cached[1]
+                break
+        uncached.append(resource)
+        try:
+            resource = resource.__parent__
+        except AttributeError:
+            resource = None
+    for resource in reversed(uncached):
+        path = path + (resource.__name__ or '',)
+        if isinstance(resource, ResourcePathCacheMixin):
+            resource._v_pyramid_path = (generation, path)
+    return path
+
 _model_path_list = _resource_path_list # b/w compat, not an API
 
 def virtual_root(resource, request):
@@ -547,7 +614,81 @@ def split_path_info(path):
             clean.append(segment)
     return tuple(clean)
 
-_segment_cache = {}
+class _SegmentCache(object):
+    """ The bounded cache used by :func:`quote_path_segment`.  ``data``
+    maps each key to a ``[value, referenced]`` list; a hit is a plain
+    dictionary lookup which sets the reference bit of the entry, and only
+    misses take the lock.  When the cache is full, an entry is evicted
+    with the clock (second chance) algorithm: the hand passes over, and
+    clears the bit of, entries which have been used since it last came
+    by, so segments in steady use survive a burst of one-off ones."""
+    __slots__ = ('size', 'data', 'lookups', 'misses', 'evictions',
+                 '_keys', '_hand', '_lock')
+
+    def __init__(self, size):
+        self.size = size
+        self.data = {}
+        # unlocked, so these may undercount under heavy concurrency
+        self.lookups = 0
+        self.misses = 0
+        self.evictions = 0
+        self._keys = [] # the clock face
+        self._hand = 0
+        self._lock = threading.Lock()
+
+    def put(self, key, value):
+        with self._lock:
+            self.misses += 1
+            data = self.data
+            if key in data or self.size <= 0:
+                return
+            keys = self._keys
+            if len(keys) < self.size:
+                keys.append(key)
+            else:
+                hand = self._hand
+                while True:
+                    entry = data[keys[hand]]
+                    if not entry[1]:
+                        break
+                    entry[1] = False
+                    hand = (hand + 1) % self.size
+                del data[keys[hand]]
+                keys[hand] = key
+                self._hand = (hand + 1) % self.size
+                self.evictions += 1
+            data[key] = [value, False]
+
+_segment_cache = _SegmentCache(10000)
+
+def set_segment_cache_size(size):
+    """ Replace the cache used by :func:`pyramid.traversal.quote_path_segment`
+    with an empty one holding at most ``size`` quoted segments (the default
+    is 10000).  This is best done once, at application startup.
+
+    .. versionadded:: 1.8
+    """
+    global _segment_cache
+    _segment_cache = _SegmentCache(size)
+
+def segment_cache_info():
+    """ Return a dictionary describing the state of the cache used by
+    :func:`pyramid.traversal.quote_path_segment`, with the keys ``size``
+    (the maximum number of entries), ``entries``, ``lookups``, ``hits``,
+    ``misses`` and ``evictions``.
+
+    .. versionadded:: 1.8
+    """
+    cache = _segment_cache
+    lookups = cache.lookups
+    return {
+        'size': cache.size,
+        'entries': len(cache.data),
+        'lookups': lookups,
+        'hits': max(lookups - cache.misses, 0),
+        'misses': cache.misses,
+        'evictions': cache.evictions,
+        }
 
 quote_path_segment_doc = """ \
 Return a quoted representation of a 'path segment' (such as
@@ -567,14 +708,15 @@ the ``safe`` argument to this function.  This corresponds to the
 .. note::
 
    The return value for each segment passed to this
-   function is cached in a module-scope dictionary for
+   function is cached in a bounded module-scope cache for
    speed: the cached version is returned when possible
-   rather than recomputing the quoted version.  No cache
-   emptying is ever done for the lifetime of an
-   application, however.  If you pass arbitrary
-   user-supplied strings to this function (as opposed to
-   some bounded set of values from a 'working set' known to
-   your application), it may become a memory leak.
+   rather than recomputing the quoted version.  The cache
+   holds at most 10000 segments by default; see
+   :func:`pyramid.traversal.set_segment_cache_size` and
+   :func:`pyramid.traversal.segment_cache_info`.
+
+.. versionchanged:: 1.8
+   The cache is bounded; previously it grew without limit.
 """
 
 
@@ -584,38 +726,46 @@ if PY2:
         """ %s """ % quote_path_segment_doc
         # The bit of this code that deals with ``_segment_cache`` is an
         # optimization: we cache all the computation of URL path segments
-        # in this module-scope dictionary with the original string (or
-        # unicode value) as the key, so we can look it up later without
-        # needing to reencode or re-url-quote it
+        # in this module-scope cache with the original string (or unicode
+        # value) and its class as the key (1, 1.0 and True are equal but
+        # quote differently), so we can look it up later without needing
+        # to reencode or re-url-quote it
+        cache = _segment_cache
+        cache.lookups += 1
+        key = (segment.__class__, segment, safe)
         try:
-            return _segment_cache[(segment, safe)]
+            entry = cache.data[key]
         except KeyError:
             if segment.__class__ is text_type: #isinstance slighly slower (~15%)
                 result = url_quote(segment.encode('utf-8'), safe)
             else:
                 result = url_quote(str(segment), safe)
-            # we don't need a lock to mutate _segment_cache, as the below
-            # will generate exactly one Python bytecode (STORE_SUBSCR)
-            _segment_cache[(segment, safe)] = result
+            cache.put(key, result)
             return result
+        entry[1] = True
+        return entry[0]
 else:
     def quote_path_segment(segment, safe=PATH_SEGMENT_SAFE):
         """ %s """ % quote_path_segment_doc
         # The bit of this code that deals with ``_segment_cache`` is an
         # optimization: we cache all the computation of URL path segments
-        # in this module-scope dictionary with the original string (or
-        # unicode value) as the key, so we can look it up later without
-        # needing to reencode or re-url-quote it
+        # in this module-scope cache with the original string (or unicode
+        # value) and its class as the key (1, 1.0 and True are equal but
+        # quote differently), so we can look it up later without needing
+        # to reencode or re-url-quote it
+        cache = _segment_cache
+        cache.lookups += 1
+        key = (segment.__class__, segment, safe)
         try:
-            return _segment_cache[(segment, safe)]
+            entry = cache.data[key]
         except KeyError:
             if segment.__class__ not in (text_type, binary_type):
                 segment = str(segment)
             result = url_quote(native_(segment, 'utf-8'), safe)
-            # we don't need a lock to mutate _segment_cache, as the below
-            # will generate exactly one Python bytecode (STORE_SUBSCR)
-            _segment_cache[(segment, safe)] = result
+            cache.put(key, result)
             return result
+        entry[1] = True
+        return entry[0]
 
 slash = text_('/')
 
@@ -624,7 +774,20 @@ class ResourceTreeTraverser(object):
     """ A resource tree traverser that should be used (for speed) when
     every resource in the tree supplies a ``__name__`` and
     ``__parent__`` attribute (ie. every resource in the tree is
-    :term:`location` aware) ."""
+    :term:`location` aware) .
+
+    A resource may also supply a ``__traverse_many__`` method, which is
+    called with a tuple of the path segment names remaining to be traversed
+    below it (up to, but not including, any ``@@`` view name), before its
+    ``__getitem__`` is used.  It should return a sequence of the resources
+    found for as many of the leading names as it can resolve at once, e.g.
+    with a single database query; the traverser then carries on from the
+    last of them as usual.  Returning an empty sequence makes the traverser
+    use ``__getitem__`` for the next name instead.
+
+    .. versionchanged:: 1.8
+       Support for ``__traverse_many__``.
+    """
 
 
     VIEW_SELECTOR = '@@'
@@ -690,6 +853,9 @@ class ResourceTreeTraverser(object):
             i = 0
             view_selector = self.VIEW_SELECTOR
             vpath_tuple = split_path_info(vpath)
+            # resources for the upcoming segments, deepest first, as returned
+            # by a ``__traverse_many__`` method
+            batched = None
             for segment in vpath_tuple:
                 if segment[:2] == view_selector:
                     return {'context': ob,
@@ -699,27 +865,41 @@ class ResourceTreeTraverser(object):
                             'virtual_root': vroot,
                             'virtual_root_path': vroot_tuple,
                             'root': root}
-                try:
-                    getitem = ob.__getitem__
-                except AttributeError:
-                    return {'context': ob,
-                            'view_name': segment,
-                            'subpath': vpath_tuple[i + 1:],
-                            'traversed': vpath_tuple[:vroot_idx + i + 1],
-                            'virtual_root': vroot,
-                            'virtual_root_path': vroot_tuple,
-                            'root': root}
-
-                try:
-                    next = getitem(segment)
-                except KeyError:
-                    return {'context': ob,
-                            'view_name': segment,
-                            'subpath': vpath_tuple[i + 1:],
-                            'traversed': vpath_tuple[:vroot_idx + i + 1],
-                            'virtual_root': vroot,
-                            'virtual_root_path': vroot_tuple,
-                            'root': root}
+                if not batched:
+                    try:
+                        getitem = ob.__getitem__
+                    except AttributeError:
+                        return {'context': ob,
+                                'view_name': segment,
+                                'subpath': vpath_tuple[i + 1:],
+                                'traversed': vpath_tuple[:vroot_idx + i + 1],
+                                'virtual_root': vroot,
+                                'virtual_root_path': vroot_tuple,
+                                'root': root}
+
+                    traverse_many = getattr(ob, '__traverse_many__', None)
+                    if traverse_many is not None:
+                        names = []
+                        for name in vpath_tuple[i:]:
+                            if name[:2] == view_selector:
+                                break
+                            names.append(name)
+                        batched = list(traverse_many(tuple(names)))
+                        batched.reverse()
+
+                if batched:
+                    next = batched.pop()
+                else:
+                    try:
+                        next = getitem(segment)
+                    except KeyError:
+                        return {'context': ob,
+                                'view_name': segment,
+                                'subpath': vpath_tuple[i + 1:],
+                                'traversed': vpath_tuple[:vroot_idx + i + 1],
+                                'virtual_root': vroot,
+                                'virtual_root_path': vroot_tuple,
+                                'root': root}
                 if i == vroot_idx:
                     vroot = next
                 ob = next
@@ -731,6 +911,116 @@ class ResourceTreeTraverser(object):
 
 ModelGraphTraverser = ResourceTreeTraverser # b/w compat, not API, used in wild
 
+class TraversalCache(object):
+    """ A :term:`traverser` factory which remembers the result of traversing
+    each path from a given root, so a hot path is not traversed again on
+    every request.  Register an instance as the traverser with
+    :meth:`pyramid.config.Configurator.add_traverser`:
+
+    .. code-block:: python
+
+       cache = TraversalCache(max_entries=5000, ttl=300)
+       config.add_traverser(cache)
+
+    Results are keyed on the identity of the root resource, the traversal
+    path and subpath, and any virtual root, so caching is only useful when
+    the :term:`root factory` returns the same root object for every request
+    (e.g. an application-global tree).  At most ``max_entries`` results are
+    kept; when ``ttl`` is not ``None`` each is also discarded after ``ttl``
+    seconds.  The resources in a cached result are shared by every request
+    which traverses the same path.
+
+    Results which end because a resource's ``__getitem__`` raised a
+    :exc:`KeyError` (e.g. the view name in ``/folder/edit``) are not cached
+    unless ``cache_misses`` is true, so arbitrary URLs do not fill the
+    cache.
+
+    Call :meth:`invalidate` whenever the resource tree changes.
+
+    .. versionadded:: 1.8
+    """
+    def __init__(self, max_entries=1000, ttl=None, cache_misses=False):
+        if ttl is None:
+            self._cache = LRUCache(max_entries)
+        else:
+            self._cache = ExpiringLRUCache(max_entries, default_timeout=ttl)
+        self.cache_misses = cache_misses
+
+    def __call__(self, root):
+        return _CachingTraverser(root, self)
+
+    def invalidate(self, root=None):
+        """ Discard the cached results for ``root``, or every cached result
+        if ``root`` is ``None``."""
+        cache = self._cache
+        for key in list(cache.data):
+            if root is None or key[0] == id(root):
+                cache.invalidate(key)
+
+    def cache_info(self):
+        """ Return a dictionary with the keys ``size`` (the maximum number of
+        entries), ``entries``, ``lookups``, ``hits``, ``misses`` and
+        ``evictions``."""
+        cache = self._cache
+        return {
+            'size': cache.size,
+            'entries': len(cache.data),
+            'lookups': cache.lookups,
+            'hits': cache.hits,
+            'misses': cache.misses,
+            'evictions': cache.evictions,
+            }
+
+class _CachingTraverser(ResourceTreeTraverser):
+    def __init__(self, root, cache):
+        self.root = root
+        self.cache = cache
+
+    def __call__(self, request):
+        matchdict = request.matchdict
+        if matchdict is not None:
+            path = matchdict.get('traverse', slash) or slash
+            subpath = matchdict.get('subpath', ())
+        else:
+            try:
+                path = request.path_info
+            except (KeyError, UnicodeDecodeError):
+                # let the traverser deal with it
+                return ResourceTreeTraverser.__call__(self, request)
+            subpath = None
+        if is_nonstr_iter(path):
+            path = tuple(path)
+        if is_nonstr_iter(subpath):
+            subpath = tuple(subpath)
+        key = (id(self.root), path, subpath, request.environ.get(VH_ROOT_KEY))
+
+        cache = self.cache._cache
+        result = cache.get(key)
+        if result is None:
+            result = ResourceTreeTraverser.__call__(self, request)
+            if (self.cache.cache_misses or
+                    not self._is_miss(result, path, key[3])):
+                cache.put(key, result)
+        return dict(result)
+
+    def _is_miss(self, result, path, vroot_path):
+        view_name = result['view_name']
+        if not view_name:
+            return False
+        if getattr(result['context'], '__getitem__', None) is None:
+            # a leaf resource; the view name did not come from a lookup
+            return False
+        # the view name either came from a failed lookup or from an explicit
+        # view selector; find the segment it was taken from, which is the
+        # one just before the subpath
+        if path.__class__ is tuple:
+            path = '/' + slash.join(path)
+        if vroot_path is not None:
+            path = decode_path_info(vroot_path) + path
+        vpath_tuple = split_path_info(path)
+        segment = vpath_tuple[len(vpath_tuple) - len(result['subpath']) - 1]
+        return segment[:2] != self.VIEW_SELECTOR
+
 @implementer(IResourceURL, IContextURL)
 class ResourceURL(object):
     vroot_varname = VH_ROOT_KEY
@@ -4,6 +4,7 @@ import os
 import warnings
 
 from repoze.lru import lru_cache
+from zope.interface import providedBy
 
 from pyramid.interfaces import (
     IResourceURL,
@@ -16,6 +17,7 @@ from pyramid.compat import (
     string_types,
     )
 from pyramid.encode import (
+    QueryFragment, # API
     url_quote,
     urlencode,
 )
@@ -72,10 +74,42 @@ def parse_url_overrides(kw):
 
     return app_url, scheme, host, port, qs, anchor
 
+class _URLRegistryMemo(object):
+    """ The URL generation prerequisites looked up in a registry on behalf of
+    one request."""
+    def __init__(self, registry):
+        self.registry = registry
+        self.mapper = None
+        self.url_adapters = {}
+
 class URLMethodsMixin(object):
     """ Request methods mixin for BaseRequest having to do with URL
     generation """
 
+    # per-request memos of the application URLs and registry lookups which
+    # every generated URL needs; see _app_url_memo and _url_registry_memo
+    _app_urls = None
+    _url_registry = None
+
+    def _app_url_memo(self):
+        # application URLs keyed on the (scheme, host, port) overrides used
+        # to compute them; discarded when any part of the environ they are
+        # computed from changes
+        e = self.environ
+        fingerprint = (e.get('wsgi.url_scheme'), e.get('HTTP_HOST'),
+                       e.get('SERVER_NAME'), e.get('SERVER_PORT'),
+                       e.get('SCRIPT_NAME'))
+        memo = self._app_urls
+        if memo is None or memo[0] is not e or memo[1] != fingerprint:
+            memo = self._app_urls = (e, fingerprint, {})
+        return memo[2]
+
+    def _url_registry_memo(self, registry):
+        memo = self._url_registry
+        if memo is None or memo.registry is not registry:
+            memo = self._url_registry = _URLRegistryMemo(registry)
+        return memo
+
     def _partial_application_url(self, scheme=None, host=None, port=None):
         """
         Construct the URL defined by request.application_url, replacing any
@@ -87,6 +121,15 @@ class URLMethodsMixin(object):
         ``scheme`` is passed as ``http`` and ``port`` is not passed, the
         ``port`` value is assumed to be ``80``.
         """
+        urls = self._app_url_memo()
+        key = (scheme, host, port)
+        url = urls.get(key)
+        if url is None:
+            url = urls[key] = self._make_partial_application_url(
+                scheme, host, port)
+        return url
+
+    def _make_partial_application_url(self, scheme, host, port):
         e = self.environ
         if scheme is None:
             scheme = e['wsgi.url_scheme']
@@ -258,7 +301,10 @@ class URLMethodsMixin(object):
             reg = self.registry
         except AttributeError:
             reg = get_current_registry() # b/c
-        mapper = reg.getUtility(IRoutesMapper)
+        memo = self._url_registry_memo(reg)
+        mapper = memo.mapper
+        if mapper is None:
+            mapper = memo.mapper = reg.getUtility(IRoutesMapper)
         route = mapper.get_route(route_name)
 
         if route is None:
@@ -528,7 +574,18 @@ class URLMethodsMixin(object):
         except AttributeError:
             reg = get_current_registry() # b/c
 
-        url_adapter = reg.queryMultiAdapter((resource, self), IResourceURL)
+        # the adapter factory only depends on what the resource and the
+        # request provide, so look it up once per combination
+        url_adapters = self._url_registry_memo(reg).url_adapters
+        required = (providedBy(resource), providedBy(self))
+        try:
+            factory = url_adapters[required]
+        except KeyError:
+            factory = url_adapters[required] = reg.adapters.lookup(
+                required, IResourceURL)
+        url_adapter = None
+        if factory is not None:
+            url_adapter = factory(resource, self)
         if url_adapter is None:
             url_adapter = ResourceURL(resource, self)
 
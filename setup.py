@@ -124,6 +124,7 @@ setup(name='pyramid',
         ptweens = pyramid.scripts.ptweens:main
         prequest = pyramid.scripts.prequest:main
         pdistreport = pyramid.scripts.pdistreport:main
+        pprecompress = pyramid.scripts.pprecompress:main
         [paste.server_runner]
         wsgiref = pyramid.scripts.pserve:wsgiref_server_runner
         cherrypy = pyramid.scripts.pserve:cherrypy_server_runner